@@ -0,0 +1,103 @@
+"""场景批量编辑微基准
+
+比较BatchEditor借助索引选择场景与逐个场景比较的耗时，并测量生成计划的耗时（不保存项目）。
+
+用法:
+    python benchmarks/bench_batch_edit.py [--scenes N] [--rounds N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.scene.asset_reference_index import AssetReferenceIndex
+from models.scene.scene_search_index import SceneSearchIndex
+from services.project.batch_edit import BatchEditor, SceneSelector, SceneUpdate
+from utils.helpers.perf_stats import LatencyCounter
+
+
+CHARACTERS = "的一是了我不人在他有这个上们来到时大地为子中你说生国年着就那和要她出也得里后自以会家可下而过天去能对小多然于心学么之都好看起发当没成只如事把还用"
+
+
+class _Project:
+    """只提供场景列表的项目（BatchEditor只读取scene_data和current_file）"""
+    
+    def __init__(self, scenes):
+        self.scene_data = {"scenes": scenes}
+        self.current_file = None
+
+
+def make_scenes(count):
+    """生成测试场景：每一万个场景为一章，使用同一首BGM"""
+    rng = random.Random(0)
+    names = [f"角色{i}" for i in range(40)] + ["凛", "Alice"]
+    return [
+        {
+            "background": f"/project/background/bg{index // 5000:02d}.png",
+            "portraits": [{"path": f"/project/portrait/p{rng.randrange(20000):05d}.png", "scale": 1}],
+            "audio": {"bgm": f"/project/background_music/ch{index // 10000}.ogg", "sound": "", "voice": ""},
+            "character_name": rng.choice(names),
+            "text": "".join(rng.choice(CHARACTERS) for _ in range(rng.randint(10, 60))),
+            "font": {"path": "", "size": 24}
+        }
+        for index in range(count)
+    ]
+
+
+def measure(label, func, rounds):
+    """重复执行并打印耗时"""
+    counter = LatencyCounter()
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        counter.record_since(start)
+    print(f"{label:<32} {counter.summary()}")
+    return result
+
+
+def run(scenes, rounds):
+    """建立索引后比较各种选择条件的耗时"""
+    references = AssetReferenceIndex()
+    references.build(scenes)
+    search_index = SceneSearchIndex()
+    search_index.build(scenes)
+    project = _Project(scenes)
+    editor = BatchEditor(project, references, search_index)
+    bgm = "/project/background_music/ch1.ogg"
+    
+    cases = [
+        ("素材", SceneSelector(asset=bgm), lambda scene: scene["audio"]["bgm"] == bgm),
+        ("角色", SceneSelector(character="凛"), lambda scene: scene["character_name"] == "凛"),
+        ("角色+关键字", SceneSelector(character="凛", text="我们"),
+         lambda scene: scene["character_name"] == "凛" and "我们" in scene["text"]),
+        ("范围", SceneSelector(scene_range=(20000, 20200)), None)
+    ]
+    for label, selector, predicate in cases:
+        selected = measure(f"索引选择 {label}", lambda: editor.select(selector), rounds)
+        if predicate is not None:
+            measure(f"逐个比较 {label}", lambda: [i for i, scene in enumerate(scenes) if predicate(scene)], rounds)
+        print(f"{'':<32} 选中 {len(selected)} 个场景")
+    
+    plan = measure("生成计划 替换一章的BGM", lambda: editor.plan(
+        SceneSelector(asset=bgm), SceneUpdate({("audio", "bgm"): "/project/background_music/new.ogg"})), rounds)
+    print(f"{'':<32} {plan.summary()}")
+    plan = measure("生成计划 全部场景字号", lambda: editor.plan(
+        SceneSelector(), SceneUpdate({("font", "size"): 28})), rounds)
+    print(f"{'':<32} {plan.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="场景批量编辑微基准")
+    parser.add_argument('--scenes', type=int, default=100000, help="生成的测试场景数量")
+    parser.add_argument('--rounds', type=int, default=10, help="每项的重复次数")
+    args = parser.parse_args()
+    run(make_scenes(args.scenes), args.rounds)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
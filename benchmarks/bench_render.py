@@ -0,0 +1,125 @@
+"""绘制性能微基准
+
+比较解码得到的原始像素格式与加载时统一转换后的格式在绘制时的耗时，
+用于验证ResourceLoader.normalize_image的收益。
+
+用法:
+    python benchmarks/bench_render.py [立绘图片路径] [背景图片路径] [--rounds N]
+
+未指定图片时使用程序生成的测试图片（非预乘ARGB立绘和索引色背景）。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter, QPixmap, QColor
+from utils.resource_utils import ResourceLoader
+from utils.helpers.perf_stats import LatencyCounter
+
+
+CANVAS_WIDTH = 1280
+CANVAS_HEIGHT = 720
+
+
+def make_portrait():
+    """生成带半透明边缘的非预乘ARGB测试立绘"""
+    image = QImage(600, 900, QImage.Format_ARGB32)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(220, 120, 160, 230))
+    painter.drawEllipse(50, 50, 500, 800)
+    painter.end()
+    return image
+
+
+def make_background():
+    """生成索引色测试背景"""
+    image = QImage(1920, 1080, QImage.Format_RGB32)
+    painter = QPainter(image)
+    for y in range(0, 1080, 60):
+        painter.fillRect(0, y, 1920, 60, QColor((y * 7) % 256, (y * 3) % 256, 128))
+    painter.end()
+    return image.convertToFormat(QImage.Format_Indexed8)
+
+
+def bench(label, draw, rounds):
+    """重复执行绘制函数并打印统计结果"""
+    counter = LatencyCounter()
+    target = QImage(CANVAS_WIDTH, CANVAS_HEIGHT, QImage.Format_ARGB32_Premultiplied)
+    target.fill(Qt.black)
+    for _ in range(rounds):
+        start = time.perf_counter()
+        painter = QPainter(target)
+        draw(painter)
+        painter.end()
+        counter.record_since(start)
+    print(f"{label:<36} {counter.summary()}")
+    return counter.average_ms
+
+
+def run(portrait, background, rounds):
+    """对比原始格式与统一格式的绘制耗时"""
+    normalized_portrait = ResourceLoader.normalize_image(portrait)
+    normalized_background = ResourceLoader.normalize_image(background)
+    print(f"立绘格式: {portrait.format()} -> {normalized_portrait.format()}")
+    print(f"背景格式: {background.format()} -> {normalized_background.format()}")
+    
+    canvas_rect = QRect(0, 0, CANVAS_WIDTH, CANVAS_HEIGHT)
+    portrait_rect = QRect(300, 0, int(portrait.width() * 0.8), int(portrait.height() * 0.8))
+    
+    cases = [
+        ("背景缩放绘制", background, normalized_background, canvas_rect),
+        ("立绘缩放绘制", portrait, normalized_portrait, portrait_rect),
+        ("立绘原尺寸绘制", portrait, normalized_portrait, None),
+    ]
+    for name, raw, normalized, rect in cases:
+        def draw_raw(painter, image=raw, rect=rect):
+            if rect is None:
+                painter.drawImage(0, 0, image)
+            else:
+                painter.drawImage(rect, image)
+        
+        def draw_normalized(painter, image=normalized, rect=rect):
+            if rect is None:
+                painter.drawImage(0, 0, image)
+            else:
+                painter.drawImage(rect, image)
+        
+        raw_ms = bench(f"{name}（原始格式）", draw_raw, rounds)
+        normalized_ms = bench(f"{name}（统一格式）", draw_normalized, rounds)
+        if normalized_ms > 0:
+            print(f"{'':<36} 加速 {raw_ms / normalized_ms:.2f}x")
+    
+    # 显示路径使用QPixmap，比较由两种格式构造的QPixmap的绘制耗时
+    raw_pixmap = QPixmap.fromImage(portrait)
+    normalized_pixmap = QPixmap.fromImage(normalized_portrait)
+    bench("立绘QPixmap绘制（原始格式构造）", lambda painter: painter.drawPixmap(0, 0, raw_pixmap), rounds)
+    bench("立绘QPixmap绘制（统一格式构造）", lambda painter: painter.drawPixmap(0, 0, normalized_pixmap), rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="绘制性能微基准")
+    parser.add_argument('portrait', nargs='?', help="立绘图片路径")
+    parser.add_argument('background', nargs='?', help="背景图片路径")
+    parser.add_argument('--rounds', type=int, default=50, help="每项测试的重复次数")
+    args = parser.parse_args()
+    
+    app = QGuiApplication(sys.argv)
+    portrait = QImage(args.portrait) if args.portrait else make_portrait()
+    background = QImage(args.background) if args.background else make_background()
+    if portrait.isNull() or background.isNull():
+        print("加载测试图片失败")
+        return 1
+    run(portrait, background, args.rounds)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
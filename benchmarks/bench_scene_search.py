@@ -0,0 +1,90 @@
+"""场景全文索引微基准
+
+测量SceneSearchIndex的建立、保存、加载和查询耗时。
+
+用法:
+    python benchmarks/bench_scene_search.py [项目文件路径] [--scenes N] [--rounds N] [--query 文本 ...]
+
+未指定项目文件时生成N个随机台词的测试场景。
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.scene.scene_search_index import SceneSearchIndex
+from utils.helpers.perf_stats import LatencyCounter
+
+
+CHARACTERS = "的一是了我不人在他有这个上们来到时大地为子中你说生国年着就那和要她出也得里后自以会家可下而过天去能对小多然于心学么之都好看起发当没成只如事把还用"
+DEFAULT_QUERIES = ["天", "一起", "我们一起去", "角色7", "角色3 的人", "Alice"]
+
+
+def make_scenes(count):
+    """生成随机台词的测试场景"""
+    rng = random.Random(0)
+    names = [f"角色{i}" for i in range(40)] + ["Alice", "ボブ"]
+    return [
+        {
+            "character_name": rng.choice(names),
+            "text": "".join(rng.choice(CHARACTERS) for _ in range(rng.randint(10, 60)))
+        }
+        for _ in range(count)
+    ]
+
+
+def timed(label, func):
+    """执行一次并打印耗时"""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<24} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def run(scenes, queries, rounds):
+    """建立、保存、加载索引并测量查询耗时"""
+    index = SceneSearchIndex()
+    timed(f"建立索引（{len(scenes)} 个场景）", lambda: index.build(scenes))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "bench.json.search")
+        timed("保存索引", lambda: index.save(path))
+        print(f"{'索引文件大小':<24} {os.path.getsize(path) / 1048576:9.1f} MB")
+        loaded = SceneSearchIndex()
+        timed("加载索引", lambda: loaded.load(path))
+    timed("核对场景（无变化）", lambda: loaded.sync(scenes))
+    
+    for query in queries:
+        counter = LatencyCounter()
+        results = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            results = loaded.search(query, 200)
+            counter.record_since(start)
+        print(f"查询 {query!r:<20} {len(results):4d} 个结果  {counter.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="场景全文索引微基准")
+    parser.add_argument('project', nargs='?', help="项目文件路径（JSON）")
+    parser.add_argument('--scenes', type=int, default=100000, help="生成的测试场景数量")
+    parser.add_argument('--rounds', type=int, default=20, help="每个查询的重复次数")
+    parser.add_argument('--query', nargs='*', help="查询文本")
+    args = parser.parse_args()
+    
+    if args.project:
+        with open(args.project, 'r', encoding='utf-8') as f:
+            scenes = json.load(f).get("scenes", [])
+    else:
+        scenes = make_scenes(args.scenes)
+    run(scenes, args.query or DEFAULT_QUERIES, args.rounds)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
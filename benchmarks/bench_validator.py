@@ -0,0 +1,96 @@
+"""项目检查微基准
+
+测量SceneValidator完整检查全部场景、编辑后重新检查单个场景以及文件变化后重新检查的耗时。
+
+用法:
+    python benchmarks/bench_validator.py [--scenes N] [--rounds N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from models.scene.scene_validator import SceneValidator
+from utils.helpers.perf_stats import LatencyCounter
+
+
+def make_scenes(count, root):
+    """生成测试场景：每一万个场景为一章，使用同一首BGM，约1%的场景存在问题"""
+    rng = random.Random(0)
+    scenes = []
+    for index in range(count):
+        scene = {
+            "background": os.path.join(root, f"background/bg{index // 5000:02d}.png"),
+            "portraits": [{"path": os.path.join(root, f"portrait/p{rng.randrange(2000):04d}.png"), "scale": 1.0}],
+            "audio": {"bgm": os.path.join(root, f"background_music/ch{index // 10000}.ogg"), "sound": "", "voice": ""},
+            "character_name": "凛",
+            "text": "台词",
+            "font": {"path": "", "size": 24}
+        }
+        if rng.random() < 0.01:
+            scene["font"]["size"] = 50
+        scenes.append(scene)
+    return scenes
+
+
+def measure(label, func, rounds):
+    """重复执行并打印耗时"""
+    counter = LatencyCounter()
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        counter.record_since(start)
+    print(f"{label:<32} {counter.summary()}")
+
+
+def run(scenes, root, rounds):
+    """完整检查后测量增量检查的耗时"""
+    validator = SceneValidator(root)
+    measure("完整检查", lambda: validator.build(scenes), 1)
+    print(f"{'':<32} {validator.scene_count} 个场景存在 {validator.issue_count} 个问题")
+    
+    rng = random.Random(1)
+    
+    def edit_one():
+        scene_index = rng.randrange(len(scenes))
+        scenes[scene_index]["font"]["size"] = rng.choice((24, 28, 50))
+        validator.update_scene(scene_index, scenes[scene_index])
+    
+    measure("编辑后重新检查一个场景", edit_one, rounds * 100)
+    measure("未修改的场景", lambda: validator.update_scene(0, scenes[0]), rounds * 100)
+    
+    bgm = os.path.join(root, "background_music/ch1.ogg")
+    
+    def toggle_bgm():
+        if os.path.exists(bgm):
+            os.remove(bgm)
+        else:
+            open(bgm, "wb").close()
+        validator.file_changed(bgm)
+    
+    measure("BGM增删后重新检查一章", toggle_bgm, rounds)
+    measure("重新读取所有文件", validator.recheck_files, rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="项目检查微基准")
+    parser.add_argument('--scenes', type=int, default=100000, help="生成的测试场景数量")
+    parser.add_argument('--rounds', type=int, default=10, help="每项的重复次数")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as root:
+        for folder in ("background", "portrait", "background_music"):
+            os.makedirs(os.path.join(root, folder))
+        for name in ["background/bg%02d.png" % i for i in range(args.scenes // 5000 + 1)] + \
+                ["portrait/p%04d.png" % i for i in range(2000)] + \
+                ["background_music/ch%d.ogg" % i for i in range(args.scenes // 10000 + 1)]:
+            open(os.path.join(root, name), "wb").close()
+        run(make_scenes(args.scenes, root), root, args.rounds)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
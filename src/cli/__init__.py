@@ -0,0 +1,4 @@
+"""命令行工具包
+
+包含无需界面即可运行的批处理工具
+"""
@@ -0,0 +1,93 @@
+"""素材引用报告工具
+
+列出项目中素材的使用位置、资源目录中未使用的素材和场景引用的缺失文件。
+
+用法:
+    python src/cli/asset_report.py <项目文件> [--where 素材路径 ...] [--unused] [--missing] [--type 资源类型]
+
+不指定--where、--unused和--missing时输出未使用素材和缺失文件两项报告。
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 作为脚本运行时将src目录加入模块搜索路径
+SRC_DIR = Path(__file__).resolve().parent.parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from config.settings import load_settings
+from models.resource.resource_model import ResourceModel
+from models.scene.scene_model import SceneModel
+from models.scene.asset_reference_index import AssetReferenceIndex, ASSET_TYPES
+from utils.helpers.logger import log_error
+
+
+def build_reference_index(project_path, config=None):
+    """加载项目并建立素材引用索引（资源清单取自配置的资源目录）
+    
+    Args:
+        project_path: 项目文件路径
+        config: 应用程序配置，默认使用默认配置
+    
+    Returns:
+        tuple: (素材引用索引, 场景列表)，加载失败时返回None
+    """
+    config = config or load_settings()
+    scene_model = SceneModel(config)
+    if not scene_model.load_project(project_path):
+        log_error(f"加载项目失败: {project_path}")
+        return None
+    
+    reference_index = AssetReferenceIndex()
+    resource_model = ResourceModel(config)
+    for resource_type in ASSET_TYPES:
+        reference_index.set_catalog(resource_type, [path for _, path in resource_model.scan_resource_folder(resource_type)])
+    scenes = scene_model.scene_data.get("scenes", [])
+    reference_index.build(scenes, Path(project_path).resolve().parent)
+    return reference_index, scenes
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="输出项目的素材引用报告")
+    parser.add_argument("project", help="项目文件路径（.json或.xml）")
+    parser.add_argument("--where", nargs="+", metavar="PATH", help="列出引用这些素材的场景")
+    parser.add_argument("--unused", action="store_true", help="列出资源目录中没有被引用的素材")
+    parser.add_argument("--missing", action="store_true", help="列出场景引用但不存在的文件")
+    parser.add_argument("--type", choices=ASSET_TYPES, help="只报告该类型的未使用素材")
+    args = parser.parse_args(argv)
+    
+    result = build_reference_index(args.project)
+    if result is None:
+        return 1
+    reference_index, scenes = result
+    if not (args.where or args.unused or args.missing):
+        args.unused = args.missing = True
+    
+    for path in args.where or []:
+        scene_indexes = reference_index.where_used(path)
+        print(f"[引用] {path}: {len(scene_indexes)} 个场景")
+        for scene_index in scene_indexes:
+            scene = scenes[scene_index]
+            print(f"  {scene_index + 1:5d}  {scene.get('character_name', '')}  {' '.join(str(scene.get('text', '')).split())}")
+    
+    if args.unused:
+        unused = reference_index.unused_assets(args.type)
+        print(f"[未使用] {len(unused)} 个素材")
+        for resource_type, path in unused:
+            print(f"  {resource_type:<16} {path}")
+    
+    if args.missing:
+        missing = reference_index.missing_files()
+        print(f"[缺失] {len(missing)} 个文件")
+        for resource_type, path, scene_indexes in missing:
+            scene_text = ", ".join(str(scene_index + 1) for scene_index in scene_indexes)
+            print(f"  {resource_type:<16} {path}  (场景 {scene_text})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""场景批量编辑工具
+
+按角色、素材、场景范围或关键字选择场景，批量设置字段或替换素材，所有修改只保存一次项目。
+
+用法:
+    python src/cli/batch_edit.py <项目文件> [--character 角色名] [--asset 素材路径] [--range 起始-结束] [--text 关键字]
+                                 [--set 字段=值 ...] [--replace-asset 原路径 新路径] [--dry-run]
+
+示例:
+    # 第1-200个场景的BGM换成chapter2.ogg
+    python src/cli/batch_edit.py story.json --range 1-200 --set audio.bgm=resources/background_music/chapter2.ogg
+    # 角色“凛”的台词字号统一为28
+    python src/cli/batch_edit.py story.json --character 凛 --set font.size=28
+
+字段名用点分隔（如audio.bgm、font.size、portraits.0.scale），值按JSON解析，解析失败时作为字符串。
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# 作为脚本运行时将src目录加入模块搜索路径
+SRC_DIR = Path(__file__).resolve().parent.parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from config.settings import load_settings
+from models.scene.scene_model import SceneModel
+from services.project.batch_edit import BatchEditor, SceneSelector, SceneUpdate, MISSING, parse_field, format_field
+from utils.helpers.logger import log_error
+
+
+def parse_range(text):
+    """解析"起始-结束"形式的场景范围（编号从1开始，包含结束编号）
+    
+    Returns:
+        tuple: (起始索引, 结束索引)，不含结束索引
+    """
+    start, _, end = text.partition("-")
+    return int(start) - 1, int(end or start)
+
+
+def parse_assignment(text):
+    """解析"字段=值"形式的设置
+    
+    Returns:
+        tuple: (字段位置, 值)
+    """
+    field, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"应为 字段=值: {text}")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return parse_field(field.strip()), value
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="批量编辑项目中的场景")
+    parser.add_argument("project", help="项目文件路径（.json或.xml）")
+    parser.add_argument("--character", help="角色名（完全一致）")
+    parser.add_argument("--asset", help="引用该素材的场景")
+    parser.add_argument("--range", type=parse_range, help="场景范围，如1-200（编号从1开始）")
+    parser.add_argument("--text", help="台词或角色名包含的关键字")
+    parser.add_argument("--set", type=parse_assignment, action="append", default=[], metavar="FIELD=VALUE",
+                        help="设置字段，可以指定多次")
+    parser.add_argument("--replace-asset", nargs=2, action="append", default=[], metavar=("OLD", "NEW"),
+                        help="把引用的素材替换为另一个素材，可以指定多次")
+    parser.add_argument("--dry-run", action="store_true", help="只输出将要进行的修改")
+    args = parser.parse_args(argv)
+    if not args.set and not args.replace_asset:
+        parser.error("需要指定--set或--replace-asset")
+    
+    scene_model = SceneModel(load_settings())
+    if not scene_model.load_project(args.project):
+        log_error(f"加载项目失败: {args.project}")
+        return 1
+    
+    selector = SceneSelector(character=args.character, asset=args.asset, scene_range=args.range, text=args.text)
+    update = SceneUpdate(dict(args.set), dict(args.replace_asset))
+    editor = BatchEditor(scene_model)
+    plan = editor.plan(selector, update)
+    print(f"{selector.describe()}: {plan.summary()}")
+    if args.dry_run:
+        for scene_index, field, old_value, new_value in plan.changes:
+            old_text = "（无）" if old_value is MISSING else repr(old_value)
+            print(f"  场景 {scene_index + 1} {format_field(field)}: {old_text} -> {new_value!r}")
+        return 0 if plan.ok else 1
+    return 0 if editor.apply(plan) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""分镜表导出工具
+
+在无界面环境下（QT_QPA_PLATFORM=offscreen）将项目导出为多页分镜表。
+
+用法:
+    python src/cli/export_contact_sheet.py <项目文件> [-o 输出目录] [-j 进程数]
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 作为脚本运行时将src目录加入模块搜索路径
+SRC_DIR = Path(__file__).resolve().parent.parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QGuiApplication
+from config.settings import load_settings, resolve_data_dir
+from models.scene.scene_model import SceneModel
+from services.render.contact_sheet import ContactSheetExporter
+from utils.helpers.logger import log_error
+
+
+def export_contact_sheet(project_path, output_dir=None, workers=None, config=None):
+    """将项目导出为分镜表
+    
+    Args:
+        project_path: 项目文件路径
+        output_dir: 输出目录，默认为输出目录下以项目名命名的子目录
+        workers: 工作进程数，默认读取配置
+        config: 应用程序配置，默认使用默认配置
+    
+    Returns:
+        list: 已写入的页面路径列表，失败时返回None
+    """
+    config = config or load_settings()
+    scene_model = SceneModel(config)
+    if not scene_model.load_project(project_path):
+        log_error(f"加载项目失败: {project_path}")
+        return None
+    
+    project_name = Path(project_path).stem
+    if output_dir is None:
+        output_dir = Path(resolve_data_dir(config, "output")) / f"{project_name}_contact_sheet"
+    exporter = ContactSheetExporter(config)
+    return exporter.export(scene_model.scene_data.get("scenes", []), output_dir, project_name,
+                           Path(project_path).resolve().parent, workers)
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="将项目导出为多页分镜表")
+    parser.add_argument("project", help="项目文件路径（.json或.xml）")
+    parser.add_argument("-o", "--output", help="输出目录")
+    parser.add_argument("-j", "--workers", type=int, help="工作进程数")
+    args = parser.parse_args(argv)
+    
+    # 排版说明文字需要字体支持
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+    return 0 if export_contact_sheet(args.project, args.output, args.workers) is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
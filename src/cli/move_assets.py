@@ -0,0 +1,85 @@
+"""素材移动工具
+
+重命名或移动素材文件（或整个目录），并改写项目中所有引用它们的场景；可以试运行，也可以撤销最近一次移动。
+
+用法:
+    python src/cli/move_assets.py <项目文件> <源路径> <目标路径> [--dry-run]
+    python src/cli/move_assets.py <项目文件> --rollback
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 作为脚本运行时将src目录加入模块搜索路径
+SRC_DIR = Path(__file__).resolve().parent.parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from config.settings import load_settings
+from models.scene.scene_model import SceneModel
+from models.scene.asset_reference_index import AssetReferenceIndex
+from services.project.asset_refactor import AssetRefactor
+from utils.helpers.logger import log_error
+
+
+def load_refactor(project_path, config=None):
+    """加载项目并创建素材重构对象
+    
+    Args:
+        project_path: 项目文件路径
+        config: 应用程序配置，默认使用默认配置
+    
+    Returns:
+        AssetRefactor: 素材重构对象，加载失败时返回None
+    """
+    config = config or load_settings()
+    scene_model = SceneModel(config)
+    if not scene_model.load_project(project_path):
+        log_error(f"加载项目失败: {project_path}")
+        return None
+    reference_index = AssetReferenceIndex()
+    reference_index.build(scene_model.scene_data.get("scenes", []), Path(project_path).resolve().parent)
+    return AssetRefactor(scene_model, reference_index)
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="移动素材并改写引用它们的场景")
+    parser.add_argument("project", help="项目文件路径（.json或.xml）")
+    parser.add_argument("source", nargs="?", help="要移动的素材文件或目录")
+    parser.add_argument("destination", nargs="?", help="目标路径（不能已存在）")
+    parser.add_argument("--dry-run", action="store_true", help="只列出将要进行的修改")
+    parser.add_argument("--rollback", action="store_true", help="撤销最近一次移动")
+    args = parser.parse_args(argv)
+    if not args.rollback and not (args.source and args.destination):
+        parser.error("需要指定源路径和目标路径，或使用--rollback")
+    
+    refactor = load_refactor(args.project)
+    if refactor is None:
+        return 1
+    
+    if args.rollback:
+        undo = refactor.rollback()
+        if undo is None:
+            return 1
+        print(f"已撤销: 移回 {len(undo.moves)} 个文件，恢复 {len(undo.rewrites)} 处引用")
+        for error in undo.errors:
+            print(f"  {error}")
+        return 1 if undo.errors else 0
+    
+    plan = refactor.plan(args.source, args.destination)
+    print(plan.summary())
+    if args.dry_run:
+        for old_path, new_path in plan.moves:
+            print(f"  移动 {old_path} -> {new_path}")
+        for scene_index, field, old_value, new_value in plan.rewrites:
+            field_name = ".".join(str(key) for key in field)
+            print(f"  场景 {scene_index + 1} {field_name}: {old_value} -> {new_value}")
+        return 0 if plan.ok else 1
+    return 0 if refactor.apply(plan) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""项目批量渲染工具
+
+在无界面环境下（QT_QPA_PLATFORM=offscreen）将项目中的每个场景渲染为PNG预览图。
+场景分块分配给进程池中的工作进程，每个工作进程持有自己的渲染器和图片缓存；
+已是最新的输出文件会被跳过，中断后重新运行即可从断点继续。
+
+用法:
+    python src/cli/render_project.py <项目文件> [-o 输出目录] [-j 进程数] [--force]
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import as_completed
+from pathlib import Path
+
+# 作为脚本运行时将src目录加入模块搜索路径
+SRC_DIR = Path(__file__).resolve().parent.parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from config.settings import load_settings, resolve_data_dir
+from models.scene.scene_model import SceneModel
+from services.render.render_pool import create_render_pool, chunk_tasks, render_files
+from utils.helpers.logger import log_info, log_error
+
+
+def scene_output_path(output_dir, index):
+    """场景预览图的输出路径
+    
+    Args:
+        output_dir: 输出目录
+        index: 场景索引（从0开始）
+    
+    Returns:
+        Path: 输出文件路径
+    """
+    return Path(output_dir) / f"scene_{index + 1:04d}.png"
+
+
+def collect_tasks(scenes, output_dir, project_mtime, force=False):
+    """收集需要渲染的场景，跳过比项目文件更新的已有输出
+    
+    Args:
+        scenes: 场景列表
+        output_dir: 输出目录
+        project_mtime: 项目文件的修改时间
+        force: 是否强制重新渲染全部场景
+    
+    Returns:
+        list: [(场景索引, 场景字典, 输出路径)]
+    """
+    tasks = []
+    for index, scene in enumerate(scenes):
+        output_path = scene_output_path(output_dir, index)
+        if not force and output_path.exists() and output_path.stat().st_mtime >= project_mtime:
+            continue
+        tasks.append((index, scene, str(output_path)))
+    return tasks
+
+
+def render_project(project_path, output_dir=None, workers=None, force=False, config=None):
+    """将项目中的所有场景渲染为预览图
+    
+    Args:
+        project_path: 项目文件路径
+        output_dir: 输出目录，默认为输出目录下以项目名命名的子目录
+        workers: 工作进程数，默认读取配置（0表示CPU核心数）
+        force: 是否强制重新渲染全部场景
+        config: 应用程序配置，默认使用默认配置
+    
+    Returns:
+        tuple: (渲染成功数, 跳过数, 失败数)，项目加载失败时返回None
+    """
+    config = config or load_settings()
+    scene_model = SceneModel(config)
+    if not scene_model.load_project(project_path):
+        log_error(f"加载项目失败: {project_path}")
+        return None
+    scenes = scene_model.scene_data.get("scenes", [])
+    
+    if output_dir is None:
+        output_dir = Path(resolve_data_dir(config, "output")) / f"{Path(project_path).stem}_render"
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    tasks = collect_tasks(scenes, output_dir, os.path.getmtime(project_path), force)
+    skipped = len(scenes) - len(tasks)
+    if not tasks:
+        log_info(f"所有场景均已是最新: {output_dir}")
+        return 0, skipped, 0
+    
+    base_dir = Path(project_path).resolve().parent
+    executor, workers = create_render_pool(config, base_dir, workers, len(tasks))
+    log_info(f"开始渲染项目: {project_path}, 场景 {len(tasks)} 个（跳过 {skipped} 个）, 进程 {workers} 个")
+    
+    rendered = 0
+    with executor:
+        futures = [executor.submit(render_files, chunk) for chunk in chunk_tasks(tasks, workers)]
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                log_error(f"渲染任务失败: {str(e)}")
+                continue
+            for index, success in results:
+                if success:
+                    rendered += 1
+                else:
+                    log_error(f"场景渲染失败: {index + 1}")
+    
+    failed = len(tasks) - rendered
+    log_info(f"渲染完成: 成功 {rendered} 个, 跳过 {skipped} 个, 失败 {failed} 个, 输出目录: {output_dir}")
+    return rendered, skipped, failed
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="将项目中的每个场景渲染为PNG预览图")
+    parser.add_argument("project", help="项目文件路径（.json或.xml）")
+    parser.add_argument("-o", "--output", help="输出目录")
+    parser.add_argument("-j", "--workers", type=int, help="工作进程数")
+    parser.add_argument("--force", action="store_true", help="重新渲染全部场景，不跳过已有输出")
+    args = parser.parse_args(argv)
+    
+    result = render_project(args.project, args.output, args.workers, args.force)
+    if result is None:
+        return 1
+    return 1 if result[2] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,6 @@
 
 包含应用程序配置
 """
-from .settings import load_settings, save_settings, DEFAULT_CONFIG
+from .settings import load_settings, save_settings, resolve_data_dir, DEFAULT_CONFIG
 
-__all__ = ['load_settings', 'save_settings', 'DEFAULT_CONFIG']
\ No newline at end of file
+__all__ = ['load_settings', 'save_settings', 'resolve_data_dir', 'DEFAULT_CONFIG']
\ No newline at end of file
@@ -3,6 +3,8 @@
 负责管理应用程序的全局设置和配置
 """
 import json
+import os
+import sys
 from pathlib import Path
 from utils.helpers.logger import log_error
 
@@ -15,12 +17,74 @@ DEFAULT_CONFIG = {
     },
     "editor": {
         "portrait_count": 4,  # 默认支持的立绘数量
+        "max_layers": 32,  # 预览画布支持的最大图层数量
         "default_font": "系统默认",
         "default_font_size": 16
     },
+    "performance": {
+        # 背景代理解码质量（相对画布分辨率的比例，0或负数表示始终解码原图）
+        "background_proxy_quality": 1.0,
+        # 立绘金字塔缓存的预缩放级别
+        "portrait_pyramid_levels": [0.5, 0.75, 1.0, 1.5],
+        # 启动时是否在后台批量生成整个立绘文件夹的金字塔
+        "portrait_pyramid_prebuild": False,
+        # 是否裁掉立绘四周的透明边距（不影响保存的位置语义）
+        "trim_portraits": True,
+        # 交互停止后执行平滑重绘的延迟（毫秒）
+        "progressive_refine_delay": 150,
+        # 已解码图片缓存（包括预取的素材）占用内存的上限（MB），超出时丢弃最久未使用的图片
+        "image_cache_mb": 512
+    },
+    "prefetch": {
+        "enabled": True,  # 切换场景时是否在后台预取相邻场景的素材
+        "radius": 2,  # 预取当前场景前后各多少个场景
+        "workers": 2,  # 预取线程数
+        "memory_budget_mb": 256  # 预取素材占用内存的上限（MB）
+    },
+    "scene_navigator": {
+        "text_length": 40  # 场景列表中台词摘要的最大字数
+    },
+    "scene_search": {
+        "enabled": True,  # 是否建立场景全文索引（索引文件保存在项目文件旁边）
+        "max_results": 1000,  # 搜索结果的最大数量
+        "name_weight": 2.0  # 角色名命中的权重
+    },
+    "validation": {
+        "enabled": True,  # 是否检查项目中的常见问题（打开项目时在后台完整检查，之后只检查变化的场景）
+        "scale_range": [0.5, 1.5],  # 立绘缩放的允许范围
+        "font_size_range": [8, 36]  # 字号的允许范围
+    },
+    "render": {
+        # 离屏渲染时画布的底色（无背景或背景带透明通道时可见）
+        "background_color": "#000000",
+        # 批量渲染的工作进程数（0表示使用CPU核心数）
+        "workers": 0,
+        # 每个工作进程缓存的解码图片数量
+        "cache_size": 64
+    },
+    "contact_sheet": {
+        "columns": 5,  # 每页列数
+        "rows": 6,  # 每页行数
+        "thumbnail_width": 256,  # 缩略图宽度（高度按画布比例计算）
+        "caption_length": 30,  # 台词摘要的最大字数
+        "caption_font_size": 12
+    },
+    "playback": {
+        "prefetch": 3,  # 预取当前场景之后的场景数量
+        "workers": 2,  # 预取线程数
+        "crossfade_ms": 400,  # 场景切换的交叉淡化时长（毫秒）
+        "advance_on_voice_end": True  # 语音播放结束后自动前进
+    },
+    "thumbnail_cache": {
+        "enabled": True,  # 打开项目后是否在后台补齐场景缩略图
+        "width": 256,  # 缩略图宽度（高度按画布比例计算）
+        "format": "JPG",
+        "quality": 85
+    },
     "paths": {
         "resources": "resources",
         "output": "output",
+        "cache": "cache",
         "logs": "logs"
     },
     "logging": {
@@ -77,6 +141,39 @@ def save_settings(config, config_path):
         return False
 
 
+def resolve_data_dir(config, path_key, default=None):
+    """解析可写数据目录（输出、缓存等）的绝对路径
+    
+    打包环境下相对于可执行文件所在目录，开发环境下相对于应用程序根目录。
+    
+    Args:
+        config: 配置字典
+        path_key: paths配置中的键名，如output、cache
+        default: 配置缺失时使用的目录名
+        
+    Returns:
+        str: 目录路径（目录会被自动创建）
+    """
+    data_dir = config.get("paths", {}).get(path_key, default or path_key)
+    
+    if not Path(data_dir).is_absolute():
+        if hasattr(sys, '_MEIPASS'):
+            # 使用可执行文件所在目录作为基础路径
+            base_dir = Path(os.path.dirname(os.path.abspath(sys.executable)))
+        elif "app_root" in config:
+            base_dir = Path(config["app_root"])
+        else:
+            # 获取应用程序根目录（src的父目录）
+            base_dir = Path(__file__).parent.parent.parent
+        data_dir = str(base_dir / data_dir)
+    
+    try:
+        Path(data_dir).mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        log_error(f"创建数据目录失败: {str(e)}")
+    return data_dir
+
+
 def _deep_update(d, u):
     """深度更新字典
     
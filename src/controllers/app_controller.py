@@ -3,19 +3,38 @@
 负责协调模型和视图
 """
 import json
+import time
 from datetime import datetime
 from pathlib import Path
-from PyQt5.QtWidgets import QFileDialog, QMessageBox, QAction
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QAction, QProgressDialog, QApplication
 from PyQt5.QtCore import QUrl
 from PyQt5.QtGui import QPixmap, QKeySequence
-from utils.helpers.logger import log_error
+from utils.helpers.logger import log_error, log_debug
 
 from models.scene.scene_model import SceneModel
+from models.scene.scene_list_model import SceneListModel
+from models.scene.asset_reference_index import AssetReferenceIndex
 from models.resource.resource_model import ResourceModel
+from models.resource.resource_list_model import ResourceListModel
 from models.project.project_model import ProjectModel
 from views.screens.main_view import MainView
+from views.components.resource_picker import ResourcePicker
+from views.components.asset_report_dialog import AssetReportDialog
+from views.components.batch_edit_dialog import BatchEditDialog
+from views.components.validation_dialog import ValidationDialog
 from services.media.media_service import MediaService
+from services.media.asset_prefetcher import AssetPrefetcher
+from services.search.scene_indexer import SceneIndexer
+from services.project.asset_refactor import AssetRefactor
+from services.project.batch_edit import BatchEditor
+from services.project.project_validator import ProjectValidator
+from services.render.scene_compositor import resolve_portrait_position
+from services.render.contact_sheet import ContactSheetExporter
+from services.render.thumbnail_cache import ThumbnailCache, ThumbnailFiller
+from models.scene.scene_hash import scene_visual_hash
+from config.settings import resolve_data_dir
 from controllers.handlers.resource_handler import ResourceHandler
+from controllers.handlers.playback_handler import PlaybackHandler
 
 
 class AppController:
@@ -44,11 +63,29 @@ class AppController:
         self.view = MainView(self.config)
         self.view.set_controller(self)
         
-        # 初始化服务
-        self.media_service = MediaService()
+        # 场景导航面板的列表模型（直接读取scene_model中的场景列表）
+        text_length = self.config.get("scene_navigator", {}).get("text_length", 40)
+        self.scene_list_model = SceneListModel(self.scene_model, text_length, self.view)
+        self.view.scene_navigator.set_model(self.scene_list_model)
         
+        # 初始化服务
+        self.media_service = MediaService(config=self.config)
+        # 切换场景时在后台预取相邻场景的素材
+        self.asset_prefetcher = AssetPrefetcher(self.media_service, self.config, self.view)
+        QApplication.instance().aboutToQuit.connect(self.asset_prefetcher.shutdown)
+        # 场景全文索引（打开项目后在后台加载或建立，退出前写回索引文件）
+        self.scene_indexer = SceneIndexer(self.config, self.view)
+        self.scene_indexer.ready.connect(self._on_scene_index_ready)
+        QApplication.instance().aboutToQuit.connect(self.scene_indexer.shutdown)
+        # 项目检查（打开项目后在后台完整检查，之后只重新检查变化的场景和文件）
+        self.project_validator = ProjectValidator(self.config, self.view)
+        self.project_validator.issues_changed.connect(self._on_validation_changed)
+        QApplication.instance().aboutToQuit.connect(self.project_validator.shutdown)
+        self.validation_dialog = None
+
         # 初始化处理器
-        self.resource_handler = ResourceHandler(self.resource_model, self.media_service)
+        self.resource_handler = ResourceHandler(self.resource_model, self.media_service, self.config)
+        self.playback_handler = PlaybackHandler(self.view, self.resource_handler, self.media_service, self.config)
         
         # 初始化标志变量
         self.save_warning_shown = False
@@ -57,11 +94,30 @@ class AppController:
         # 项目状态
         self.current_project = None
         
+        # 资源列表模型（资源类型 -> ResourceListModel），由同类资源的下拉框共享
+        self.resource_lists = {}
+        
+        # 素材引用索引（素材路径 -> 场景），资源清单随资源列表模型同步
+        self.asset_references = AssetReferenceIndex()
+        # 已建立索引的项目文件（与各索引服务是否启用无关），用于判断保存时是否切换了项目
+        self._indexed_project_file = None
+        self.asset_report_dialog = None
+        self.batch_edit_dialog = None
+        
+        # 场景缩略图缓存（按项目创建，打开项目后在后台补齐）
+        self.thumbnail_cache = None
+        self.thumbnail_filler = None
+        
         # 设置资源模型的错误回调函数
         self.resource_model.set_error_callback(self._show_error_message)
         
         # 初始化资源
         self.init_resources()
+        
+        # 按配置在后台批量生成立绘金字塔缓存
+        if self.config.get("performance", {}).get("portrait_pyramid_prebuild", False):
+            portrait_dir = Path(self.resource_model.resource_path) / "portrait"
+            self.media_service.prebuild_portrait_pyramids(str(portrait_dir))
     
     def _initialize_resources(self):
         """初始化应用程序资源"""
@@ -86,53 +142,58 @@ class AppController:
         self.view.show()
     
     def init_resources(self):
-        """初始化资源"""
-        # 加载背景资源
-        backgrounds = self.resource_model.scan_resource_folder("background")
-        self.view.combo_bg.clear()
-        self.view.combo_bg.addItem("无背景", "")
-        for name, path in backgrounds:
-            self.view.combo_bg.addItem(name, path)
-        
-        # 加载立绘资源
-        portraits = self.resource_model.scan_resource_folder("portrait")
-        for combo in self.view.portrait_combos:
-            combo.clear()
-            combo.addItem("无立绘", "")
-            for name, path in portraits:
-                combo.addItem(name, path)
-        
-        # 加载BGM资源
-        bgms = self.resource_model.scan_resource_folder("background_music")
-        self.view.combo_bgm.clear()
-        self.view.combo_bgm.addItem("无BGM", "")
-        for name, path in bgms:
-            self.view.combo_bgm.addItem(name, path)
-        
-        # 加载音效资源
-        sounds = self.resource_model.scan_resource_folder("sound")
-        self.view.combo_sound.clear()
-        self.view.combo_sound.addItem("无音效", "")
-        for name, path in sounds:
-            self.view.combo_sound.addItem(name, path)
-        
-        # 加载语音资源
-        voices = self.resource_model.scan_resource_folder("voice")
-        self.view.combo_voice.clear()
-        self.view.combo_voice.addItem("无语音", "")
-        for name, path in voices:
-            self.view.combo_voice.addItem(name, path)
-        
-        # 加载字体资源
-        fonts = self.resource_model.scan_resource_folder("font")
-        self.view.combo_font.clear()
-        self.view.combo_font.addItem("系统默认", "")
-        for name, path in fonts:
-            self.view.combo_font.addItem(name, path)
+        """初始化资源
+        
+        每类资源只创建一个列表模型，显示同类资源的所有下拉框（如全部立绘下拉框）共享该模型。
+        """
+        view = self.view
+        resource_combos = (
+            ("background", "无背景", [view.combo_bg]),
+            ("portrait", "无立绘", view.portrait_combos),
+            ("background_music", "无BGM", [view.combo_bgm]),
+            ("sound", "无音效", [view.combo_sound]),
+            ("voice", "无语音", [view.combo_voice]),
+            ("font", "系统默认", [view.combo_font])
+        )
+        for resource_type, placeholder, combos in resource_combos:
+            model = self.resource_lists.get(resource_type)
+            if model is None:
+                model = ResourceListModel(placeholder, view)
+                self.resource_lists[resource_type] = model
+                self._watch_resource_list(resource_type, model)
+            model.set_resources(self.resource_model.scan_resource_folder(resource_type))
+            for combo in combos:
+                view.bind_resource_model(combo, model)
         
         # 初始化完成
         self.initialized = True
     
+    def _watch_resource_list(self, resource_type, model):
+        """资源列表变化时同步素材引用索引中的资源清单，并通知项目检查重新检查引用变化文件的场景
+        
+        Args:
+            resource_type: 资源类型
+            model: 资源列表模型
+        """
+        references = self.asset_references
+        validator = self.project_validator
+        model.modelReset.connect(lambda: references.set_catalog(resource_type, model.paths))
+        
+        def on_inserted(parent, first, last):
+            for row in range(first, last + 1):
+                path = model.path_at(row)
+                references.add_resource(resource_type, path)
+                validator.file_changed(path)
+        
+        def on_removed(parent, first, last):
+            for row in range(first, last + 1):
+                path = model.path_at(row)
+                references.remove_resource(path)
+                validator.file_changed(path)
+        
+        model.rowsInserted.connect(on_inserted)
+        model.rowsAboutToBeRemoved.connect(on_removed)
+    
     def on_new_project(self):
         """创建新项目"""
         file_path, _ = QFileDialog.getSaveFileName(
@@ -144,6 +205,8 @@ class AppController:
         
         if file_path:
             self.scene_model.create_new_project(file_path)
+            self.scene_list_model.reset()
+            self._open_project_indexes()
             QMessageBox.information(self.view, "提示", f"项目已创建: {file_path}")
     
     def on_open_project(self):
@@ -156,6 +219,10 @@ class AppController:
         )
         
         if file_path and self.scene_model.load_project(file_path):
+            self.update_thumbnails()
+            self.scene_list_model.reset()
+            self.view.scene_navigator.set_current(self.scene_model.current_index)
+            self._open_project_indexes()
             QMessageBox.information(self.view, "提示", f"项目已加载: {file_path}")
         elif file_path:
             QMessageBox.warning(self.view, "警告", "项目加载失败")
@@ -203,10 +270,373 @@ class AppController:
         self.save_current_scene_info()
         
         if self.scene_model.save_to_file():
+            self.scene_indexer.save()
             QMessageBox.information(self.view, "提示", "项目已保存")
         else:
             QMessageBox.warning(self.view, "警告", "项目保存失败")
     
+    def update_thumbnails(self, scene_indexes=None):
+        """在后台补齐当前项目缺失的场景缩略图
+        
+        缩略图缓存保存在输出目录下以项目名命名的子目录中，按场景画面哈希索引，
+        画面字段发生变化的场景会被重新渲染。
+        
+        Args:
+            scene_indexes: 被修改的场景索引，None表示检查全部场景（新增的场景总会被检查）
+        """
+        thumbnail_config = self.config.get("thumbnail_cache", {})
+        if not thumbnail_config.get("enabled", True) or not self.scene_model.current_file:
+            return
+        
+        project_path = Path(self.scene_model.current_file)
+        cache_dir = Path(resolve_data_dir(self.config, "output")) / "thumbnails" / project_path.stem
+        if self.thumbnail_cache is None or self.thumbnail_cache.cache_dir != cache_dir:
+            self.thumbnail_cache = ThumbnailCache(
+                cache_dir,
+                thumbnail_config.get("width", 256),
+                image_format=thumbnail_config.get("format", "JPG"),
+                quality=thumbnail_config.get("quality", 85)
+            )
+            if self.thumbnail_filler is None:
+                self.thumbnail_filler = ThumbnailFiller(self.thumbnail_cache, self.config, self.view)
+                # 退出前停止后台线程
+                QApplication.instance().aboutToQuit.connect(self.thumbnail_filler.stop)
+            else:
+                self.thumbnail_filler.set_cache(self.thumbnail_cache)
+
+        self.thumbnail_filler.fill(
+            self.scene_model.scene_data.get("scenes", []), project_path.resolve().parent, scene_indexes)
+    
+    def get_scene_thumbnail(self, index):
+        """获取场景缩略图
+        
+        Args:
+            index: 场景索引
+        
+        Returns:
+            QImage: 缩略图，尚未生成时返回None
+        """
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        if self.thumbnail_cache is None or not 0 <= index < len(scenes):
+            return None
+        visual_hash = self.thumbnail_filler.scene_hash(index) or scene_visual_hash(scenes[index])
+        return self.thumbnail_cache.get(visual_hash)
+    
+    def _open_project_indexes(self):
+        """打开或新建项目后建立场景全文索引和素材引用索引，并在后台检查项目"""
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        self._indexed_project_file = self.scene_model.current_file
+        self.scene_indexer.open_project(self.scene_model.current_file, scenes)
+        self.asset_references.build(scenes, Path(self.scene_model.current_file).resolve().parent)
+        self.project_validator.open_project(self.scene_model.current_file, scenes)
+        if self.validation_dialog is not None:
+            self.validation_dialog.set_validator(None)
+        if self.asset_report_dialog is not None:
+            self.asset_report_dialog.close()
+            self.asset_report_dialog = None
+        if self.batch_edit_dialog is not None:
+            self.batch_edit_dialog.set_scene_count(len(scenes))
+    
+    def _index_current_scene(self):
+        """保存场景后更新场景索引（保存时可能切换或新建了项目文件）"""
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        if self._indexed_project_file != self.scene_model.current_file:
+            self._open_project_indexes()
+        elif 0 <= self.scene_model.current_index < len(scenes):
+            scene = scenes[self.scene_model.current_index]
+            self.scene_indexer.update_scene(self.scene_model.current_index, scene)
+            self.asset_references.update_scene(self.scene_model.current_index, scene)
+            self.project_validator.update_scene(self.scene_model.current_index)
+    
+    def on_show_asset_report(self):
+        """显示素材引用报告（素材的使用位置、未使用的素材和缺失的文件）"""
+        if not self.scene_model.current_file:
+            QMessageBox.information(self.view, "提示", "请先打开项目")
+            return
+        if self.asset_report_dialog is None:
+            self.asset_report_dialog = AssetReportDialog(
+                self.asset_references, self.scene_model.scene_data.get("scenes", []), self.view)
+            self.asset_report_dialog.scene_requested.connect(self.show_scene)
+            self.asset_report_dialog.move_requested.connect(self.on_move_asset)
+            self.asset_report_dialog.rollback_requested.connect(self.on_rollback_asset_move)
+        else:
+            self.asset_report_dialog.refresh()
+        self.asset_report_dialog.set_rollback_enabled(AssetRefactor(self.scene_model, self.asset_references).can_rollback())
+        self.asset_report_dialog.show()
+        self.asset_report_dialog.raise_()
+        self.asset_report_dialog.activateWindow()
+    
+    def on_move_asset(self, source):
+        """重命名或移动素材文件（或目录），并改写所有引用它的场景
+        
+        先生成计划（试运行）并请用户确认，确认后移动文件并只保存一次项目。
+        
+        Args:
+            source: 素材文件路径，为空时先选择要移动的目录
+        """
+        parent = self.asset_report_dialog or self.view
+        if not source:
+            source = QFileDialog.getExistingDirectory(parent, "选择要移动的素材目录", self.resource_model.resource_path)
+            if not source:
+                return
+        destination, _ = QFileDialog.getSaveFileName(parent, "移动到", source)
+        if not destination:
+            return
+        
+        refactor = AssetRefactor(self.scene_model, self.asset_references)
+        plan = refactor.plan(source, destination)
+        if not plan.ok:
+            QMessageBox.warning(parent, "无法移动", plan.summary())
+            return
+        reply = QMessageBox.question(parent, "确认移动", f"{plan.summary()}\n\n是否继续？",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        if not refactor.apply(plan):
+            QMessageBox.warning(parent, "警告", "移动素材失败，已恢复原状")
+            return
+        self._after_asset_refactor(plan)
+    
+    def on_rollback_asset_move(self):
+        """撤销最近一次素材重命名或移动"""
+        undo = AssetRefactor(self.scene_model, self.asset_references).rollback()
+        parent = self.asset_report_dialog or self.view
+        if undo is None:
+            QMessageBox.warning(parent, "警告", "没有可撤销的素材移动，或撤销失败")
+            return
+        self._after_asset_refactor(undo)
+        if undo.errors:
+            QMessageBox.warning(parent, "警告", "\n".join(undo.errors))
+    
+    def _after_asset_refactor(self, plan):
+        """素材移动后同步资源列表、当前场景和缩略图
+        
+        Args:
+            plan: 已执行的重构计划
+        """
+        # 资源列表只包含各资源类型目录下的文件（不含子目录）：
+        # 少量文件逐个更新，大量文件（如移动目录）时重新扫描受影响的资源类型
+        resource_root = Path(self.resource_model.resource_path).resolve()
+        type_dirs = {resource_root / resource_type: model for resource_type, model in self.resource_lists.items()}
+        if len(plan.moves) <= 50:
+            for old_path, new_path in plan.moves:
+                old_model = type_dirs.get(Path(old_path).resolve().parent)
+                if old_model is not None:
+                    old_model.remove_resource(old_path)
+                new_file = Path(new_path).resolve()
+                new_model = type_dirs.get(new_file.parent)
+                if new_model is not None and not new_file.name.startswith(".") and new_file.suffix:
+                    new_model.add_file(new_path)
+        else:
+            affected = {Path(path).resolve().parent for move in plan.moves for path in move}
+            for type_dir, model in type_dirs.items():
+                if type_dir in affected:
+                    model.set_resources(self.resource_model.scan_resource_folder(type_dir.name))
+        
+        self._after_scenes_changed(plan.scene_indexes)
+        # 文件位置变化后，引用原位置或新位置的其他场景的检查结果也可能变化
+        for move in plan.moves:
+            for path in move:
+                self.project_validator.file_changed(path)
+        if self.asset_report_dialog is not None:
+            self.asset_report_dialog.set_rollback_enabled(
+                AssetRefactor(self.scene_model, self.asset_references).can_rollback())
+    
+    def on_show_batch_edit(self):
+        """显示批量编辑对话框"""
+        if not self.scene_model.current_file:
+            QMessageBox.information(self.view, "提示", "请先打开项目")
+            return
+        scene_count = len(self.scene_model.scene_data.get("scenes", []))
+        if self.batch_edit_dialog is None:
+            self.batch_edit_dialog = BatchEditDialog(scene_count, self.view)
+            self.batch_edit_dialog.preview_requested.connect(self.on_preview_batch_edit)
+            self.batch_edit_dialog.apply_requested.connect(self.on_apply_batch_edit)
+        else:
+            self.batch_edit_dialog.set_scene_count(scene_count)
+        self.batch_edit_dialog.show()
+        self.batch_edit_dialog.raise_()
+        self.batch_edit_dialog.activateWindow()
+    
+    def _batch_editor(self):
+        """使用当前项目索引的批量编辑对象（全文索引未就绪时由批量编辑临时建立）"""
+        return BatchEditor(self.scene_model, self.asset_references, self.scene_indexer.index)
+    
+    def on_preview_batch_edit(self, selector, update):
+        """预览批量编辑：显示选中和将被修改的场景数量
+        
+        Args:
+            selector: 场景选择条件（SceneSelector）
+            update: 修改操作（SceneUpdate）
+        """
+        self.batch_edit_dialog.show_preview(self._batch_editor().plan(selector, update))
+    
+    def on_apply_batch_edit(self, selector, update):
+        """执行批量编辑，所有修改只保存一次项目
+        
+        Args:
+            selector: 场景选择条件（SceneSelector）
+            update: 修改操作（SceneUpdate）
+        """
+        # 预览之后场景可能又被修改过，按当前内容重新生成计划
+        plan = self._batch_editor().plan(selector, update)
+        if not plan.ok:
+            self.batch_edit_dialog.show_preview(plan)
+            return
+        reply = QMessageBox.question(self.batch_edit_dialog, "确认批量编辑", f"{plan.summary()}\n\n是否继续？",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        if not self._batch_editor().apply(plan):
+            QMessageBox.warning(self.batch_edit_dialog, "警告", "批量编辑失败，场景未被修改")
+            return
+        self._after_scenes_changed(plan.scene_indexes)
+        self.batch_edit_dialog.show_applied(plan)
+    
+    def _after_scenes_changed(self, scene_indexes):
+        """批量修改场景后更新全文索引、项目检查、场景列表、当前场景、缩略图和素材引用报告
+        
+        Args:
+            scene_indexes: 被修改的场景索引
+        """
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        for scene_index in scene_indexes:
+            self.scene_indexer.update_scene(scene_index, scenes[scene_index])
+        self.project_validator.update_scenes(scene_indexes)
+        self.scene_list_model.scenes_changed(scene_indexes)
+        if self.scene_model.current_index in scene_indexes:
+            self.show_scene(self.scene_model.current_index)
+        self.update_thumbnails(scene_indexes)
+        if self.asset_report_dialog is not None:
+            self.asset_report_dialog.refresh()
+    
+    def on_show_validation(self):
+        """显示项目检查结果"""
+        if not self.scene_model.current_file:
+            QMessageBox.information(self.view, "提示", "请先打开项目")
+            return
+        if self.validation_dialog is None:
+            self.validation_dialog = ValidationDialog(self.view)
+            self.validation_dialog.scene_requested.connect(self.show_scene)
+            self.validation_dialog.recheck_requested.connect(self.project_validator.recheck_files)
+        self.validation_dialog.set_validator(self.project_validator.validator)
+        self.validation_dialog.show()
+        self.validation_dialog.raise_()
+        self.validation_dialog.activateWindow()
+    
+    def _on_validation_changed(self, issue_count):
+        """检查结果就绪或变化后更新按钮上的问题数量和打开着的检查结果
+        
+        Args:
+            issue_count: 问题总数
+        """
+        self.view.btn_validate.setText(f"检查 ({issue_count})" if issue_count else "检查")
+        if self.validation_dialog is not None and self.validation_dialog.isVisible():
+            self.validation_dialog.set_validator(self.project_validator.validator)
+
+    def on_search_scenes(self, query):
+        """按台词和角色名搜索场景，场景导航面板中只列出搜索结果
+        
+        Args:
+            query: 查询文本，为空时恢复列出全部场景
+        """
+        navigator = self.view.scene_navigator
+        if not query.strip():
+            self.scene_list_model.set_rows(None)
+            navigator.set_status("")
+            navigator.set_current(self.scene_model.current_index)
+            return
+        
+        limit = self.config.get("scene_search", {}).get("max_results", 1000)
+        start_time = time.perf_counter()
+        results = self.scene_indexer.search(query, limit)
+        if results is None:
+            navigator.set_status("正在建立场景索引，请稍候…")
+            return
+        elapsed = (time.perf_counter() - start_time) * 1000
+        self.scene_list_model.set_rows([scene_index for scene_index, _ in results])
+        navigator.set_status(f"找到 {len(results)} 个场景" + ("（仅显示前部分）" if len(results) >= limit else ""))
+        log_debug(f"场景搜索: {query!r}, {len(results)} 个结果, 耗时 {elapsed:.1f} 毫秒")
+    
+    def _on_scene_index_ready(self, count):
+        """场景索引就绪后执行等待中的搜索"""
+        query = self.view.scene_navigator.search_input.text()
+        if query.strip():
+            self.on_search_scenes(query)
+    
+    def show_scene(self, index):
+        """切换到指定场景，并在后台预取相邻场景的素材
+        
+        Args:
+            index: 场景索引
+        
+        Returns:
+            bool: 是否切换成功
+        """
+        if not self.scene_model.set_current_index(index):
+            return False
+        
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        self.load_scene(scenes[index])
+        self.view.scene_navigator.set_current(index)
+        image_label = self.view.image_label
+        self.asset_prefetcher.schedule(scenes, index, image_label.canvas_width, image_label.canvas_height)
+        return True
+    
+    def on_previous_scene(self):
+        """切换到上一个场景"""
+        self.show_scene(self.scene_model.current_index - 1)
+    
+    def on_next_scene(self):
+        """切换到下一个场景"""
+        self.show_scene(self.scene_model.current_index + 1)
+    
+    def on_start_playback(self):
+        """全屏播放当前项目的所有场景"""
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        if not scenes:
+            QMessageBox.information(self.view, "提示", "当前项目没有可播放的场景")
+            return
+        
+        base_dir = Path(self.scene_model.current_file).resolve().parent if self.scene_model.current_file else None
+        self.playback_handler.start(scenes, 0, base_dir)
+    
+    def on_export_contact_sheet(self):
+        """导出当前项目的分镜表"""
+        scenes = self.scene_model.scene_data.get("scenes", [])
+        if not self.scene_model.current_file or not scenes:
+            QMessageBox.information(self.view, "提示", "请先打开包含场景的项目")
+            return
+        
+        project_path = Path(self.scene_model.current_file)
+        output_dir = QFileDialog.getExistingDirectory(
+            self.view,
+            "选择分镜表输出目录",
+            resolve_data_dir(self.config, "output")
+        )
+        if not output_dir:
+            return
+        
+        exporter = ContactSheetExporter(self.config)
+        page_total = exporter.page_count(len(scenes))
+        progress_dialog = QProgressDialog("正在导出分镜表...", "取消", 0, page_total, self.view)
+        progress_dialog.setWindowTitle("导出分镜表")
+        progress_dialog.setMinimumDuration(0)
+        
+        def on_progress(done, total):
+            # 每页完成后刷新进度并处理界面事件
+            progress_dialog.setValue(done)
+            QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+        
+        pages = exporter.export(scenes, output_dir, project_path.stem, project_path.resolve().parent,
+                                progress=on_progress)
+        progress_dialog.close()
+        if pages is None:
+            QMessageBox.warning(self.view, "警告", "分镜表导出失败")
+        else:
+            QMessageBox.information(self.view, "提示", f"已导出 {len(pages)} 页分镜表: {output_dir}")
+    
     def save_current_scene_info(self):
         """保存当前场景信息"""
         try:
@@ -252,8 +682,9 @@ class AppController:
                 path = self.view.portrait_combos[i].itemData(self.view.portrait_combos[i].currentIndex())
                 if path:  # 只有当立绘路径不为空时才保存
                     # 计算相对位置（百分比）
-                    x = self.view.image_label.portrait_positions[i].x()
-                    y = self.view.image_label.portrait_positions[i].y()
+                    position = self.view.image_label.get_portrait_position(i)
+                    x = position.x()
+                    y = position.y()
                     
                     # 避免除零错误
                     rel_x = x / container_width if container_width > 0 else 0
@@ -270,12 +701,21 @@ class AppController:
                         },
                         "index": i
                     }
+                    # 只保存调整过的叠放顺序，默认与槽位相同
+                    z = self.view.image_label.get_layer_z(i)
+                    if z != i:
+                        portrait_info["z"] = z
                     scene_info["portraits"].append(portrait_info)
             
             # 保存场景信息
             if not self.scene_model.save_current_scene(scene_info):
                 log_error("保存场景信息失败")
                 self._show_error_message("保存场景信息失败")
+            else:
+                self.update_thumbnails([self.scene_model.current_index])
+                self.scene_list_model.scene_appended()
+                self._index_current_scene()
+                self.view.scene_navigator.set_current(self.scene_model.current_index)
         except Exception as e:
             log_error(f"收集和保存场景信息时出错: {str(e)}")
             self._show_error_message(f"保存场景信息时发生错误: {str(e)}")
@@ -347,8 +787,8 @@ class AppController:
                     old_scale = portrait.get("scale", 1.0)
                     break
         
-        # 直接更新立绘缩放比例
-        self.resource_handler.change_portrait(self.view.image_label, path, portrait_index, new_scale)
+        # 直接更新立绘缩放比例（滑块拖动过程中快速缩放，停止后平滑重绘）
+        self.resource_handler.change_portrait(self.view.image_label, path, portrait_index, new_scale, interactive=True)
         # 不再自动保存，只在用户点击保存按钮时保存
         # self.save_current_scene_info()
     
@@ -460,6 +900,22 @@ class AppController:
         
 
     
+    def on_search_resource(self, combo, title):
+        """打开资源搜索选择器，选择结果写回下拉框（触发与手动选择相同的变更事件）
+        
+        Args:
+            combo: 下拉框
+            title: 选择器标题
+        """
+        model = combo.model()
+        picker = ResourcePicker(model, title, combo.itemData(combo.currentIndex()), self.view)
+        try:
+            if picker.exec_() and picker.selected_path is not None:
+                combo.setCurrentIndex(max(0, model.row_of(picker.selected_path)))
+        finally:
+            # 选择器每次新建，关闭后销毁（过滤模型已在关闭时与共享的资源模型断开）
+            picker.deleteLater()
+    
     def import_voice_file(self):
         """导入新的语音文件"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -471,15 +927,11 @@ class AppController:
         
         if file_path:
             # 复制文件到语音资源目录
-            success = self.resource_model.import_resource_file(file_path, "voice")
-            if success:
+            target_path = self.resource_model.import_resource_file(file_path, "voice")
+            if target_path:
+                # 只向语音列表插入新文件，当前选择保持不变
+                self.resource_lists["voice"].add_file(target_path)
                 QMessageBox.information(self.view, "成功", "语音文件导入成功")
-                # 重新加载语音资源
-                voices = self.resource_model.scan_resource_folder("voice")
-                self.view.combo_voice.clear()
-                self.view.combo_voice.addItem("无语音", "")
-                for name, path in voices:
-                    self.view.combo_voice.addItem(name, path)
             else:
                 QMessageBox.warning(self.view, "失败", "语音文件导入失败")
     
@@ -518,128 +970,97 @@ class AppController:
     def load_scene(self, scene_info):
         """加载场景信息
         
+        以批量事务的方式应用场景：先在阻塞信号的状态下同步所有控件，
+        避免setCurrentIndex/setValue触发的变更事件重复加载素材；再根据场景计算出的完整状态
+        对每个素材只加载一次；画布在事务期间暂停刷新，结束时只重绘一次。
+        场景中缺少的字段视为空（无背景、无立绘、无音频）。
+        
         Args:
             scene_info: 场景信息字典
         """
-
-        # 加载背景
-        if "background" in scene_info and scene_info["background"]:
-            background_path = scene_info["background"]
-            # 查找对应的索引
-            index = self.view.combo_bg.findData(background_path)
-            if index >= 0:
-                self.view.combo_bg.setCurrentIndex(index)
-                self.refresh_background(background_path)
-        
-        # 加载立绘
-        if "portraits" in scene_info:
-            # 清空当前所有立绘
-            for i in range(self.config.get("editor", {}).get("portrait_count", 4)):
-                self.resource_handler.change_portrait(self.view.image_label, None, i, 1.0)
-                self.view.portrait_combos[i].setCurrentIndex(0)  # 选择默认项
-            
-            # 加载立绘信息
-            for i, portrait_info in enumerate(scene_info["portraits"]):
-                if "path" in portrait_info and portrait_info["path"]:
-                    path = portrait_info["path"]
-                    scale = portrait_info.get("scale", 1.0)
-                    
-                    # 查找对应的索引
-                    index = self.view.portrait_combos[i].findData(path)
-                    if index >= 0:
-                        self.view.portrait_combos[i].setCurrentIndex(index)
-                        self.view.portrait_scale_sliders[i].setValue(int(scale * 100))
-                        self.resource_handler.change_portrait(self.view.image_label, path, i, scale)
-                        
-                        # 恢复位置
-                        if "position" in portrait_info:
-                            pos = portrait_info["position"]
-                            
-                            # 固定使用1280×720作为画布尺寸
-                            CANVAS_WIDTH = 1280
-                            CANVAS_HEIGHT = 720
-                            
-                            # 优先使用相对坐标（如果有）
-                            if isinstance(pos, dict) and "rel_x" in pos and "rel_y" in pos:
-                                # 根据相对坐标计算基于固定画布的绝对位置
-                                x = int(pos["rel_x"] * CANVAS_WIDTH)
-                                y = int(pos["rel_y"] * CANVAS_HEIGHT)
-                            else:
-                                # 否则使用绝对坐标（兼容旧版本）
-                                if isinstance(pos, list) and len(pos) >= 2:
-                                    x = pos[0]
-                                    y = pos[1]
-                                elif isinstance(pos, dict):
-                                    x = pos.get("x", 0)
-                                    y = pos.get("y", 0)
-                                else:
-                                    x = 0
-                                    y = 0
-                            
-                            # 设置立绘位置
-                            self.view.image_label.set_portrait_position(i, x, y)
-        
-        # 加载音频
-        if "audio" in scene_info:
-            audio_info = scene_info["audio"]
-            
-            # 加载BGM
-            if "bgm" in audio_info and audio_info["bgm"]:
-                bgm_path = audio_info["bgm"]
-                index = self.view.combo_bgm.findData(bgm_path)
-                if index >= 0:
-                    self.view.combo_bgm.setCurrentIndex(index)
-                    self.resource_handler.change_bgm(self.view.bgm_player, bgm_path)
+        view = self.view
+        image_label = view.image_label
+        load_snapshot = self.media_service.load_stats.snapshot()
+        paint_snapshot = image_label.paint_stats.snapshot()
+        
+        # 计算场景的完整状态（找不到对应资源的字段视为空）
+        background_index = self._combo_index(view.combo_bg, scene_info.get("background"))
+        portraits = [(0, 1.0, None)] * len(view.portrait_combos)
+        portrait_z = list(range(len(view.portrait_combos)))
+        for i, portrait_info in enumerate(scene_info.get("portraits", [])):
+            slot = portrait_info.get("index", i)
+            if not 0 <= slot < len(portraits):
+                continue
+            index = self._combo_index(view.portrait_combos[slot], portrait_info.get("path"))
+            if index > 0:
+                portraits[slot] = (index, portrait_info.get("scale", 1.0), portrait_info.get("position"))
+                portrait_z[slot] = portrait_info.get("z", slot)
+        audio_info = scene_info.get("audio") or {}
+        font_info = scene_info.get("font") or {}
+        font_index = self._combo_index(view.combo_font, font_info.get("path"))
+        font_size = font_info.get("size", view.slider_font_size.value())
+        old_bgm = view.combo_bgm.itemData(view.combo_bgm.currentIndex())
+        
+        widgets = view.scene_editor_widgets()
+        blocked = [widget.blockSignals(True) for widget in widgets]
+        image_label.setUpdatesEnabled(False)
+        try:
+            # 同步控件（信号已阻塞，不会触发变更事件）
+            view.combo_bg.setCurrentIndex(background_index)
+            for i, (index, scale, _) in enumerate(portraits):
+                view.portrait_combos[i].setCurrentIndex(index)
+                if index > 0:
+                    view.portrait_scale_sliders[i].setValue(int(scale * 100))
+            for combo, key in ((view.combo_bgm, "bgm"), (view.combo_sound, "sound"), (view.combo_voice, "voice")):
+                combo.setCurrentIndex(self._combo_index(combo, audio_info.get(key)))
+            view.combo_font.setCurrentIndex(font_index)
+            view.slider_font_size.setValue(font_size)
+            view.label_font_size.setText(str(font_size))
             
-            # 加载音效
-            if "sound" in audio_info and audio_info["sound"]:
-                sound_path = audio_info["sound"]
-                index = self.view.combo_sound.findData(sound_path)
-                if index >= 0:
-                    self.view.combo_sound.setCurrentIndex(index)
-                    self.resource_handler.change_sound(self.view.sound_player, sound_path)
+            # 每个素材只加载一次
+            background_path = view.combo_bg.itemData(background_index)
+            self.resource_handler.change_background(image_label, background_path)
+            view.update_background(background_path)
+            for i, (index, scale, position) in enumerate(portraits):
+                path = view.portrait_combos[i].itemData(index)
+                self.resource_handler.change_portrait(image_label, path, i, scale)
+                # 恢复位置（优先使用相对坐标，兼容旧版本的绝对坐标）
+                if path and position is not None:
+                    image_label.set_portrait_position(i, *resolve_portrait_position(position))
+                image_label.set_layer_z(i, portrait_z[i])
             
-            # 加载语音
-            if "voice" in audio_info and audio_info["voice"]:
-                voice_path = audio_info["voice"]
-                index = self.view.combo_voice.findData(voice_path)
-                if index >= 0:
-                    self.view.combo_voice.setCurrentIndex(index)
-                    self.resource_handler.change_voice(self.view.voice_player, voice_path)
-        
-        # 加载文本和字体
-        if "text" in scene_info:
-            self.view.text_edit.setPlainText(scene_info["text"])
-        
-        if "character_name" in scene_info:
-            # 检查是否为旁白
-            is_narration = scene_info.get("is_narration", False)
-            if is_narration:
-                # 旁白时，姓名输入框为空，但显示标签显示"旁白"
-                self.view.name_input.setText("")
-                self.view.name_display_label.setText("旁白")
-            else:
-                # 非旁白时，正常显示角色姓名
-                self.view.name_input.setText(scene_info["character_name"])
-                self.view.name_display_label.setText(f"角色: {scene_info['character_name']}")
+            # 背景音乐与之前相同时继续播放
+            bgm_path = view.combo_bgm.itemData(view.combo_bgm.currentIndex())
+            if bgm_path != old_bgm:
+                self.resource_handler.change_bgm(view.bgm_player, bgm_path)
+            self.resource_handler.change_sound(view.sound_player, view.combo_sound.itemData(view.combo_sound.currentIndex()))
+            self.resource_handler.change_voice(view.voice_player, view.combo_voice.itemData(view.combo_voice.currentIndex()))
+            self.resource_handler.change_font(view.text_edit, view.combo_font.itemData(font_index), font_size)
+        finally:
+            for widget, was_blocked in zip(widgets, blocked):
+                widget.blockSignals(was_blocked)
+            # 恢复刷新时整个画布重绘一次
+            image_label.setUpdatesEnabled(True)
+        
+        # 加载文本和角色姓名
+        view.text_edit.setPlainText(scene_info.get("text", ""))
+        if scene_info.get("is_narration", False):
+            # 旁白时，姓名输入框为空，但显示标签显示"旁白"
+            view.name_input.setText("")
+            view.name_display_label.setText("旁白")
+        else:
+            character_name = scene_info.get("character_name", "")
+            view.name_input.setText(character_name)
+            view.name_display_label.setText(f"角色: {character_name}")
         
-        if "font" in scene_info:
-            font_info = scene_info["font"]
-            
-            # 加载字体
-            if "path" in font_info and font_info["path"]:
-                font_path = font_info["path"]
-                index = self.view.combo_font.findData(font_path)
-                if index >= 0:
-                    self.view.combo_font.setCurrentIndex(index)
-                    font_size = font_info.get("size", self.view.slider_font_size.value())
-                    self.resource_handler.change_font(self.view.text_edit, font_path, font_size)
-            
-            # 加载字体大小
-            if "size" in font_info:
-                font_size = font_info["size"]
-                self.view.slider_font_size.setValue(font_size)
-                self.view.label_font_size.setText(str(font_size))
+        # 画布的重绘在下一次事件循环中进行，这里只统计加载和合成次数
+        log_debug(f"应用场景: 加载 {self.media_service.load_stats.since(load_snapshot)}, "
+                  f"合成 {image_label.paint_stats.since(paint_snapshot)}")
+    
+    @staticmethod
+    def _combo_index(combo, path):
+        """通过资源列表模型的路径索引查找资源路径在下拉框中的索引，路径为空或找不到时返回0（"无"选项）"""
+        return max(0, combo.model().row_of(path))
     
     def refresh_background(self, background_path):
         """刷新背景图片
@@ -3,5 +3,6 @@
 包含所有处理器
 """
 from .resource_handler import ResourceHandler
+from .playback_handler import PlaybackHandler
 
-__all__ = ['ResourceHandler']
\ No newline at end of file
+__all__ = ['ResourceHandler', 'PlaybackHandler']
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""播放处理器
+
+负责全屏播放模式：按顺序播放项目中的场景，并在后台预取后续场景的画面和音频
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+from PyQt5.QtMultimedia import QMediaPlayer
+
+from services.render.scene_renderer import SceneRenderer
+from views.screens.playback_window import PlaybackWindow
+from utils.helpers.logger import log_error, log_info
+
+
+class PlaybackHandler(QObject):
+    """播放处理器，驱动播放窗口并管理预取任务
+    
+    当前场景之后的若干场景在线程池中提前合成为显示尺寸的画面，音频文件提前读入系统缓存，
+    切换场景时直接使用已准备好的画面，不在界面线程中解码或合成。
+    显示尺寸在播放窗口显示（进入全屏）时才确定，之后尺寸变化时按新尺寸重新预取，
+    旧尺寸的画面和移出预取窗口的场景的画面在完成时直接丢弃。
+    """
+    
+    # 工作线程完成画面合成后通知界面线程 (播放代次, 场景索引, 合成尺寸, QImage)
+    _frame_ready = pyqtSignal(int, int, QSize, object)
+    
+    def __init__(self, view, resource_handler, media_service, config=None):
+        """初始化播放处理器
+        
+        Args:
+            view: 主视图（提供媒体播放器）
+            resource_handler: 资源处理器
+            media_service: 媒体服务
+            config: 应用程序配置
+        """
+        super().__init__(view)
+        self.view = view
+        self.resource_handler = resource_handler
+        self.media_service = media_service
+        self.config = config or {}
+        
+        playback_config = self.config.get("playback", {})
+        self.prefetch_count = max(1, playback_config.get("prefetch", 3))
+        self.crossfade_ms = playback_config.get("crossfade_ms", 400)
+        self.workers = max(1, playback_config.get("workers", 2))
+        self.advance_on_voice_end = playback_config.get("advance_on_voice_end", True)
+        
+        self.window = None
+        self.executor = None
+        self.scenes = []
+        self.base_dir = None
+        self.index = -1
+        self.frame_size = None  # 画面的显示尺寸，播放窗口调整尺寸前为None
+        self.generation = 0  # 每次开始播放递增，用于丢弃过期的预取结果
+        self.frames = {}  # 场景索引 -> 已合成的画面
+        self.pending = {}  # 场景索引 -> Future
+        self.waiting_index = None  # 已请求显示但画面尚未就绪的场景
+        self.stalls = 0  # 切换时画面尚未就绪的次数
+        self.current_bgm = None
+        self._local = threading.local()
+        self._frame_ready.connect(self._on_frame_ready, Qt.QueuedConnection)
+    
+    @property
+    def active(self):
+        """是否正在播放"""
+        return self.window is not None
+    
+    def start(self, scenes, start_index=0, base_dir=None):
+        """开始全屏播放
+        
+        Args:
+            scenes: 场景列表
+            start_index: 起始场景索引
+            base_dir: 解析场景中相对路径的基准目录
+        """
+        if self.active or not scenes:
+            return
+        self.scenes = list(scenes)
+        self.base_dir = base_dir
+        self.generation += 1
+        self.frames.clear()
+        self.pending.clear()
+        self.frame_size = None
+        self.stalls = 0
+        self.current_bgm = None
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="playback")
+        
+        self.window = PlaybackWindow(self.crossfade_ms)
+        self.window.advance_requested.connect(self.advance)
+        self.window.back_requested.connect(self.go_back)
+        self.window.exit_requested.connect(self.stop)
+        self.window.frame_size_changed.connect(self._on_frame_size_changed)
+        self.view.voice_player.mediaStatusChanged.connect(self._on_voice_status_changed)
+        # 先登记起始场景，窗口尺寸确定后（_on_frame_size_changed）才开始预取
+        self.show_scene(max(0, min(start_index, len(self.scenes) - 1)))
+        self.window.showFullScreen()
+        
+        log_info(f"开始播放: 共 {len(self.scenes)} 个场景, 从第 {start_index + 1} 个开始")
+    
+    def stop(self):
+        """结束播放并输出帧时间统计"""
+        if not self.active:
+            return
+        window = self.window
+        self.window = None
+        self.generation += 1
+        self.view.voice_player.mediaStatusChanged.disconnect(self._on_voice_status_changed)
+        for player in (self.view.voice_player, self.view.sound_player, self.view.bgm_player):
+            player.stop()
+        
+        for future in self.pending.values():
+            future.cancel()
+        self.executor.shutdown(wait=False)
+        self.executor = None
+        self.pending.clear()
+        self.frames.clear()
+        
+        log_info(f"播放结束: {window.frame_stats.summary()}, 画面未就绪 {self.stalls} 次")
+        window.exit_requested.disconnect(self.stop)
+        window.close()
+        window.deleteLater()
+    
+    def advance(self):
+        """前进到下一个场景，已是最后一个场景时结束播放"""
+        if not self.active:
+            return
+        if self.index + 1 >= len(self.scenes):
+            self.stop()
+            return
+        self.show_scene(self.index + 1)
+    
+    def go_back(self):
+        """后退到上一个场景"""
+        if self.active and self.index > 0:
+            self.show_scene(self.index - 1)
+    
+    def show_scene(self, index):
+        """显示指定场景，画面尚未就绪时等待预取完成后再显示
+        
+        Args:
+            index: 场景索引
+        """
+        self.index = index
+        self._prefetch(index)
+        frame = self.frames.get(index)
+        if frame is None:
+            # 首个场景之外的等待都计为一次卡顿
+            if self.window.current_frame is not None:
+                self.stalls += 1
+            self.waiting_index = index
+            return
+        self.waiting_index = None
+        self._present(index, frame)
+    
+    def _present(self, index, frame):
+        """呈现场景画面并播放音频"""
+        scene = self.scenes[index]
+        font_info = scene.get("font") or {}
+        font = self.media_service.load_font(font_info.get("path"), font_info.get("size")) if font_info.get("path") else None
+        self.window.show_frame(frame, scene.get("character_name", ""), scene.get("text", ""), font)
+        self._play_audio(scene)
+    
+    def _play_audio(self, scene):
+        """通过主视图的播放器播放场景音频，背景音乐与上一场景相同时继续播放"""
+        audio = scene.get("audio") or {}
+        bgm = audio.get("bgm")
+        if bgm != self.current_bgm:
+            self.current_bgm = bgm
+            self.resource_handler.change_bgm(self.view.bgm_player, bgm)
+        self.resource_handler.change_sound(self.view.sound_player, audio.get("sound"))
+        self.resource_handler.change_voice(self.view.voice_player, audio.get("voice"))
+    
+    def _on_voice_status_changed(self, status):
+        """语音播放结束时自动前进"""
+        if not self.advance_on_voice_end or status != QMediaPlayer.EndOfMedia or not self.active:
+            return
+        audio = self.scenes[self.index].get("audio") or {}
+        if audio.get("voice"):
+            self.advance()
+    
+    def _on_frame_size_changed(self, size):
+        """画面显示尺寸确定或变化后，丢弃旧尺寸的画面和任务并按新尺寸重新预取"""
+        if not self.active or size.isEmpty() or size == self.frame_size:
+            return
+        self.frame_size = QSize(size)
+        self.frames.clear()
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self._prefetch(self.index)
+    
+    def _prefetch_window(self, index):
+        """需要预取的场景索引范围：上一个场景、当前场景和之后若干场景"""
+        return range(max(0, index - 1), min(len(self.scenes), index + self.prefetch_count + 1))
+    
+    def _prefetch(self, index):
+        """预取当前场景和之后若干场景，丢弃预取窗口之外的画面和任务"""
+        window = self._prefetch_window(index)
+        for stale in [i for i in self.frames if i not in window]:
+            del self.frames[stale]
+        for stale in [i for i in self.pending if i not in window]:
+            self.pending.pop(stale).cancel()
+        if self.frame_size is None:
+            return
+        
+        size = self.frame_size
+        # 按与当前场景的距离顺序提交，当前场景最先合成
+        for i in sorted(window, key=lambda i: abs(i - index)):
+            if i in self.frames or i in self.pending:
+                continue
+            future = self.executor.submit(self._render_frame, self.generation, i, self.scenes[i], size)
+            self.pending[i] = future
+    
+    def _render_frame(self, generation, index, scene, size):
+        """在工作线程中按显示尺寸合成场景画面并预读音频文件"""
+        renderer = getattr(self._local, "renderer", None)
+        if renderer is None or (renderer.canvas_width, renderer.canvas_height) != (size.width(), size.height()):
+            # 每个工作线程使用独立的渲染器（图片缓存不跨线程共享），直接以显示分辨率合成，不再放大
+            renderer = SceneRenderer(self.config, media_service=self.media_service, base_dir=self.base_dir,
+                                     canvas_width=size.width(), canvas_height=size.height())
+            self._local.renderer = renderer
+        try:
+            image = renderer.render_scene(scene)
+            for path in (scene.get("audio") or {}).values():
+                self._warm_file(path)
+        except Exception as e:
+            log_error(f"预取场景失败: 场景 {index + 1}, 错误: {str(e)}")
+            image = None
+        self._frame_ready.emit(generation, index, size, image)
+    
+    @staticmethod
+    def _warm_file(path, chunk_size=1024 * 1024):
+        """读取一遍文件，让播放器打开时命中系统文件缓存"""
+        if not path:
+            return
+        try:
+            with open(path, 'rb') as f:
+                while f.read(chunk_size):
+                    pass
+        except OSError:
+            pass
+    
+    def _on_frame_ready(self, generation, index, size, image):
+        """界面线程中接收预取完成的画面，丢弃旧尺寸或已移出预取窗口的画面"""
+        if generation != self.generation or not self.active or size != self.frame_size:
+            return
+        self.pending.pop(index, None)
+        if index not in self._prefetch_window(self.index):
+            return
+        if image is None:
+            # 合成失败时使用黑色画面，避免播放卡住
+            image = QImage(size, QImage.Format_RGB32)
+            image.fill(Qt.black)
+        self.frames[index] = image
+        if index == self.waiting_index:
+            self.waiting_index = None
+            self._present(index, image)
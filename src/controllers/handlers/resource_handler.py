@@ -2,9 +2,10 @@
 
 负责处理资源相关的操作
 """
-from PyQt5.QtCore import QUrl, Qt
+from PyQt5.QtCore import QUrl
 from PyQt5.QtGui import QPixmap, QFont
 from PyQt5.QtMultimedia import QMediaContent
+from services.render.scene_compositor import portrait_layout
 from utils.helpers.logger import log_error
 
 
@@ -39,11 +40,16 @@ class ResourceHandler:
             image_label.set_background(None)
             return
         
-        pixmap = self.media_service.load_image(path)
+        # 当前画布尺寸下已合成过的背景直接复用
+        if image_label.show_cached_background(path):
+            return
+        
+        # 按画布分辨率解码背景代理图，避免解码全尺寸原图
+        pixmap = self.media_service.load_background(path, image_label.canvas_width, image_label.canvas_height)
         if pixmap:
-            image_label.set_background(pixmap)
+            image_label.set_background(pixmap, key=path)
     
-    def change_portrait(self, image_label, path, portrait_index, scale=1.0):
+    def change_portrait(self, image_label, path, portrait_index, scale=1.0, interactive=False):
         """更改立绘
         
         Args:
@@ -51,6 +57,7 @@ class ResourceHandler:
             path: 立绘图片路径
             portrait_index: 立绘索引
             scale: 缩放比例
+            interactive: 是否为交互过程中的更新（如拖动缩放滑块）
         """
         if portrait_index < 0 or portrait_index >= self.portrait_count:
             log_error(f"立绘索引超出范围: {portrait_index}")
@@ -62,17 +69,20 @@ class ResourceHandler:
             image_label.set_portrait(None, portrait_index)
             return
         
-        pixmap = self.media_service.load_image(path)
+        # 从最接近目标缩放比例的金字塔级别开始缩放（已裁掉透明边距）
+        pixmap, level, bounds = self.media_service.load_portrait(path, scale)
         if pixmap:
             self.current_portraits[portrait_index] = pixmap
             self.current_portrait_scales[portrait_index] = scale
-            # 应用缩放
-            scaled_pixmap = pixmap.scaled(
-                int(pixmap.width() * scale),
-                int(pixmap.height() * scale),
-                aspectRatioMode=Qt.KeepAspectRatio
-            )
-            image_label.set_portrait(scaled_pixmap, portrait_index)
+            # 完整尺寸始终基于原图计算，与级别和裁剪无关，用于保持位置语义
+            full_size = self.media_service.get_portrait_size(path, scale)
+            if full_size is None:
+                full_size = (int(bounds.right() * scale), int(bounds.bottom() * scale))
+            # 裁剪区域在目标缩放比例下的偏移和尺寸
+            offset, target_size = portrait_layout(bounds, scale)
+            # 由图像标签负责缩放（交互时快速缩放，空闲时平滑重绘）
+            image_label.set_portrait(pixmap, portrait_index, target_size=target_size, interactive=interactive,
+                                     offset=offset, full_size=full_size)
     
     def change_audio(self, media_player, path):
         """通用音频更改方法
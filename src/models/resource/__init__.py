@@ -3,5 +3,8 @@
 包含资源相关的数据模型
 """
 from .resource_model import ResourceModel
+from .resource_list_model import ResourceListModel
+from .resource_search_index import ResourceSearchIndex
+from .resource_filter_model import ResourceFilterModel
 
-__all__ = ['ResourceModel']
\ No newline at end of file
+__all__ = ['ResourceModel', 'ResourceListModel', 'ResourceSearchIndex', 'ResourceFilterModel']
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""资源过滤模型
+
+按搜索文本过滤资源列表模型，供搜索选择器的列表视图使用
+"""
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class ResourceFilterModel(QAbstractListModel):
+    """资源过滤模型
+    
+    不逐行调用filterAcceptsRow，而是直接使用资源列表模型的搜索索引得到匹配的资源编号列表；
+    行数据在data()中按需映射回源模型，配合统一行高的列表视图时只有可见的行会被访问。
+    查询文本为空时第0行为源模型的占位项（如"无语音"）。
+    """
+    
+    def __init__(self, source_model, parent=None):
+        """初始化资源过滤模型
+        
+        Args:
+            source_model: 资源列表模型（ResourceListModel）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.source_model = source_model
+        self.query = ""
+        self._ids = []  # 匹配的资源编号
+        self._has_placeholder = True
+        source_model.modelReset.connect(self.refresh)
+        source_model.rowsInserted.connect(self.refresh)
+        source_model.rowsRemoved.connect(self.refresh)
+        self.refresh()
+    
+    def detach(self):
+        """断开与源模型的连接（视图关闭后调用）
+        
+        源模型在各视图之间共享，且长期存在；不断开时即使本模型已被销毁，
+        PyQt为连接创建的代理仍会保留，之后源模型的每次变化都会触发一次连接调用。
+        """
+        for signal in (self.source_model.modelReset, self.source_model.rowsInserted, self.source_model.rowsRemoved):
+            try:
+                signal.disconnect(self.refresh)
+            except TypeError:
+                pass
+    
+    def set_query(self, query):
+        """设置查询文本并更新过滤结果
+        
+        Args:
+            query: 查询文本
+        
+        Returns:
+            int: 匹配的资源数量
+        """
+        self.query = query
+        self.refresh()
+        return self.match_count
+    
+    def refresh(self):
+        """按当前查询文本重新过滤"""
+        self.beginResetModel()
+        self._ids = self.source_model.search_index.search_ids(self.query)
+        self._has_placeholder = not self.query.strip()
+        self.endResetModel()
+    
+    @property
+    def match_count(self):
+        """匹配的资源数量（不含占位项）"""
+        return len(self._ids)
+    
+    def rowCount(self, parent=QModelIndex()):
+        """行数"""
+        if parent.isValid():
+            return 0
+        return len(self._ids) + (1 if self._has_placeholder else 0)
+    
+    def source_row(self, row):
+        """将本模型的行号映射为源模型的行号
+        
+        Args:
+            row: 本模型的行号
+        
+        Returns:
+            int: 源模型的行号，行号无效时返回-1
+        """
+        if self._has_placeholder:
+            if row == 0:
+                return 0
+            row -= 1
+        if not 0 <= row < len(self._ids):
+            return -1
+        return self.source_model.row_of(self.source_model.search_index.path_of(self._ids[row]))
+    
+    def row_of(self, path):
+        """查找资源路径在过滤结果中的行号
+        
+        Args:
+            path: 资源路径
+        
+        Returns:
+            int: 行号，路径为空时返回占位项的行号（没有占位项时为-1），不在过滤结果中时返回-1
+        """
+        offset = 1 if self._has_placeholder else 0
+        if not path:
+            return 0 if self._has_placeholder else -1
+        resource_id = self.source_model.search_index.id_of(path)
+        if resource_id is None:
+            return -1
+        try:
+            return self._ids.index(resource_id) + offset
+        except ValueError:
+            return -1
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """按需从源模型获取条目数据"""
+        if not index.isValid():
+            return None
+        source_row = self.source_row(index.row())
+        if source_row < 0:
+            return None
+        return self.source_model.data(self.source_model.index(source_row), role)
@@ -0,0 +1,194 @@
+"""资源列表模型
+
+为下拉框等视图提供某一类资源的列表，同类资源的所有视图共享同一个模型
+"""
+import bisect
+from pathlib import Path
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from models.resource.resource_search_index import ResourceSearchIndex
+
+
+class ResourceListModel(QAbstractListModel):
+    """资源列表模型，第0行为占位项（如"无背景"），之后按名称排序列出资源
+    
+    模型只保存名称和路径两个列表，显示文本和条目数据在data()中按需生成，
+    不为每个视图重复创建条目。导入资源时通过insert_resource插入单行，不需要重建整个列表。
+    另外维护路径到行号的哈希索引，按路径查找行号不需要逐行比较（代替QComboBox.findData）。
+    """
+    
+    def __init__(self, placeholder="", parent=None):
+        """初始化资源列表模型
+        
+        Args:
+            placeholder: 占位项的显示文本，占位项的数据为空字符串
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self._names = []  # 按名称排序的资源名称
+        self._paths = []  # 与_names一一对应的资源路径
+        self._rows = {}  # 资源路径 -> 行号，替换全部资源时重建，插入和删除时只更新行号移动的行
+        self._duplicates = 0  # 路径重复的行数，没有重复路径时可以批量更新行号
+        self._search_index = None  # 首次搜索时创建，之后随插入和删除增量更新
+    
+    def rowCount(self, parent=QModelIndex()):
+        """行数（包含占位项）"""
+        if parent.isValid():
+            return 0
+        return len(self._names) + 1
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """按需生成条目数据
+        
+        Args:
+            index: 模型索引
+            role: 数据角色，UserRole为资源路径（与QComboBox.itemData的默认角色一致）
+        
+        Returns:
+            条目数据，不支持的角色返回None
+        """
+        if not index.isValid() or not 0 <= index.row() <= len(self._names):
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.placeholder if row == 0 else self._names[row - 1]
+        if role == Qt.UserRole:
+            return "" if row == 0 else self._paths[row - 1]
+        if role == Qt.ToolTipRole and row > 0:
+            return self._paths[row - 1]
+        return None
+    
+    def set_resources(self, resources):
+        """替换全部资源
+        
+        Args:
+            resources: 资源列表，每个元素为(name, path)元组
+        """
+        resources = sorted(resources, key=lambda x: x[0])
+        self.beginResetModel()
+        self._names = [name for name, _ in resources]
+        self._paths = [path for _, path in resources]
+        self._rows = {}
+        for row, path in enumerate(self._paths, 1):
+            # 路径重复时与findData一样取第一行
+            self._rows.setdefault(path, row)
+        self._duplicates = len(self._paths) - len(self._rows)
+        self._search_index = None
+        self.endResetModel()
+    
+    def _update_rows(self, position):
+        """更新从position开始的各行在路径索引中的行号（插入或删除行之后调用）
+        
+        position之前的行不受影响；路径重复时与findData一样记录第一行。
+        
+        Args:
+            position: 第一个行号可能变化的资源位置（不含占位项）
+        """
+        if not self._duplicates:
+            self._rows.update(zip(self._paths[position:], range(position + 1, len(self._paths) + 1)))
+            return
+        rows = self._rows
+        seen = set()
+        for row, path in enumerate(self._paths[position:], position + 1):
+            if path not in seen:
+                seen.add(path)
+                recorded = rows.get(path)
+                if recorded is None or recorded > position:
+                    rows[path] = row
+    
+    def insert_resource(self, name, path):
+        """按名称顺序插入一个资源
+        
+        Args:
+            name: 资源名称
+            path: 资源路径
+        
+        Returns:
+            int: 插入的行号
+        """
+        position = bisect.bisect_right(self._names, name)
+        row = position + 1
+        self.beginInsertRows(QModelIndex(), row, row)
+        if path in self._rows:
+            self._duplicates += 1
+        self._names.insert(position, name)
+        self._paths.insert(position, path)
+        self._update_rows(position)
+        if self._search_index is not None:
+            self._search_index.add(name, path)
+        self.endInsertRows()
+        return row
+    
+    def remove_resource(self, path):
+        """移除一个资源
+        
+        Args:
+            path: 资源路径
+        
+        Returns:
+            bool: 是否找到并移除
+        """
+        row = self.row_of(path)
+        if row <= 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._names[row - 1]
+        del self._paths[row - 1]
+        # 被移除的是该路径的第一行，路径重复时由之后的行补上
+        del self._rows[path]
+        self._update_rows(row - 1)
+        if path in self._rows:
+            self._duplicates -= 1
+        if self._search_index is not None:
+            self._search_index.remove(path)
+        self.endRemoveRows()
+        return True
+    
+    def add_file(self, path):
+        """以文件名（不含扩展名）为名称插入一个资源文件
+        
+        Args:
+            path: 资源文件路径
+        
+        Returns:
+            int: 插入的行号
+        """
+        return self.insert_resource(Path(path).stem, str(path))
+    
+    def path_at(self, row):
+        """获取指定行的资源路径
+        
+        Args:
+            row: 行号
+        
+        Returns:
+            str: 资源路径，占位项或行号无效时返回空字符串
+        """
+        if not 1 <= row <= len(self._paths):
+            return ""
+        return self._paths[row - 1]
+    
+    @property
+    def paths(self):
+        """所有资源路径（不含占位项，按名称顺序）"""
+        return list(self._paths)
+    
+    def row_of(self, path):
+        """按路径查找行号
+        
+        Args:
+            path: 资源路径
+        
+        Returns:
+            int: 行号，路径为空时返回0（占位项），找不到时返回-1
+        """
+        if not path:
+            return 0
+        return self._rows.get(path, -1)
+    
+    @property
+    def search_index(self):
+        """资源名称的搜索索引（首次访问时创建）"""
+        if self._search_index is None:
+            self._search_index = ResourceSearchIndex(zip(self._names, self._paths))
+        return self._search_index
@@ -114,7 +114,7 @@ class ResourceModel(BaseModel):
             resource_type: 资源类型
             
         Returns:
-            bool: 导入是否成功
+            str: 导入后的文件路径，导入失败时返回None
         """
         try:
             # 获取文件信息
@@ -125,8 +125,8 @@ class ResourceModel(BaseModel):
                 # 返回错误信息给调用者
                 if self.error_callback:
                     self.error_callback(error_msg)
-                return False
-            
+                return None
+
             # 创建目标目录
             target_dir = Path(self.resource_path) / resource_type
             target_dir.mkdir(parents=True, exist_ok=True)
@@ -148,11 +148,11 @@ class ResourceModel(BaseModel):
             
             # 复制文件
             shutil.copy2(source_path, target_path)
-            return True
+            return str(target_path)
         except Exception as e:
             error_msg = f"导入资源文件失败: {str(e)}"
             log_error(error_msg)
             # 返回错误信息给调用者
             if self.error_callback:
                 self.error_callback(error_msg)
-            return False
\ No newline at end of file
+            return None
\ No newline at end of file
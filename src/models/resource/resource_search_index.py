@@ -0,0 +1,208 @@
+"""资源搜索索引
+
+为资源名称建立前缀索引和三元组索引，支持在大量资源中按输入逐字快速查找
+"""
+import bisect
+
+
+class ResourceSearchIndex:
+    """资源名称的增量搜索索引（不区分大小写）
+    
+    - 前缀查找：按小写名称排序的列表，用bisect确定前缀范围
+    - 子串查找：三元组（连续三个字符）到资源编号的倒排索引，取各三元组集合的交集后再逐个确认
+    - 查询少于三个字符时，子串部分退化为对名称的线性扫描
+    - 逐字输入时只在上一次的结果中继续查找
+    
+    每个资源有一个内部编号，删除时只将编号作废，插入和删除都不需要重建索引。
+    """
+    
+    def __init__(self, resources=None):
+        """初始化搜索索引
+        
+        Args:
+            resources: 初始资源列表，每个元素为(name, path)元组
+        """
+        self._names = []  # 编号 -> 小写名称，已删除的编号为None
+        self._paths = []  # 编号 -> 资源路径
+        self._ids = {}  # 资源路径 -> 编号
+        self._sorted = []  # 按小写名称排序的(小写名称, 编号)
+        self._trigrams = {}  # 三元组 -> 编号集合
+        self._last_query = ""  # 上一次的查询文本和结果，用于逐字输入时缩小查找范围
+        self._last_result = []
+        if resources:
+            self.build(resources)
+    
+    def __len__(self):
+        return len(self._ids)
+    
+    @staticmethod
+    def _trigrams_of(text):
+        """名称中出现的所有三元组"""
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    def build(self, resources):
+        """用资源列表重建索引
+        
+        Args:
+            resources: 资源列表，每个元素为(name, path)元组
+        """
+        self._names = []
+        self._paths = []
+        self._ids = {}
+        self._trigrams = {}
+        self._last_query = ""
+        for name, path in resources:
+            self._add_entry(name, path)
+        self._sorted = sorted((lower, resource_id) for resource_id, lower in enumerate(self._names))
+    
+    def _add_entry(self, name, path):
+        """登记资源并写入三元组索引，返回编号"""
+        lower = name.lower()
+        resource_id = len(self._names)
+        self._names.append(lower)
+        self._paths.append(path)
+        self._ids[path] = resource_id
+        for trigram in self._trigrams_of(lower):
+            self._trigrams.setdefault(trigram, set()).add(resource_id)
+        return resource_id
+    
+    def add(self, name, path):
+        """添加一个资源
+        
+        Args:
+            name: 资源名称
+            path: 资源路径
+        """
+        if path in self._ids:
+            self.remove(path)
+        resource_id = self._add_entry(name, path)
+        self._last_query = ""
+        bisect.insort(self._sorted, (self._names[resource_id], resource_id))
+    
+    def remove(self, path):
+        """删除一个资源
+        
+        Args:
+            path: 资源路径
+        
+        Returns:
+            bool: 是否找到并删除
+        """
+        resource_id = self._ids.pop(path, None)
+        if resource_id is None:
+            return False
+        lower = self._names[resource_id]
+        position = bisect.bisect_left(self._sorted, (lower, resource_id))
+        if position < len(self._sorted) and self._sorted[position] == (lower, resource_id):
+            del self._sorted[position]
+        for trigram in self._trigrams_of(lower):
+            ids = self._trigrams.get(trigram)
+            if ids is not None:
+                ids.discard(resource_id)
+                if not ids:
+                    del self._trigrams[trigram]
+        self._names[resource_id] = None
+        self._last_query = ""
+        return True
+    
+    def _prefix_ids(self, query):
+        """名称以query开头的编号（按名称排序）"""
+        start = bisect.bisect_left(self._sorted, (query,))
+        # 所有以query开头的字符串都小于query + U+10FFFF
+        end = bisect.bisect_left(self._sorted, (query + "\U0010ffff",), start)
+        return [resource_id for _, resource_id in self._sorted[start:end]]
+    
+    def _substring_ids(self, query):
+        """名称中包含query但不以query开头的编号（按名称排序）"""
+        if len(query) < 3:
+            # 按排序顺序扫描，结果天然有序
+            return [resource_id for lower, resource_id in self._sorted
+                    if query in lower and not lower.startswith(query)]
+        # 从最小的三元组集合开始求交集
+        postings = sorted((self._trigrams.get(trigram, set()) for trigram in self._trigrams_of(query)), key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return []
+        # 三元组都出现不代表连续出现，需要再确认一次
+        names = self._names
+        if len(candidates) * 8 > len(self._sorted):
+            # 候选很多时按排序顺序扫描，比对候选排序更快
+            return [resource_id for lower, resource_id in self._sorted
+                    if resource_id in candidates and query in lower and not lower.startswith(query)]
+        matches = [resource_id for resource_id in candidates
+                   if query in names[resource_id] and not names[resource_id].startswith(query)]
+        matches.sort(key=names.__getitem__)
+        return matches
+    
+    def _refine(self, query, previous):
+        """在上一次查询的结果中继续查找（query以上一次的查询文本开头时结果只会变少）"""
+        names = self._names
+        prefix_ids = []
+        other_ids = []
+        for resource_id in previous:
+            lower = names[resource_id]
+            if lower.startswith(query):
+                prefix_ids.append(resource_id)
+            elif query in lower:
+                other_ids.append(resource_id)
+        # other_ids由上一次结果中有序的两段组成，排序时可以利用已有的顺序
+        other_ids.sort(key=names.__getitem__)
+        return prefix_ids + other_ids
+    
+    def search_ids(self, query):
+        """查找名称中包含query的资源编号
+        
+        连续输入时（本次查询以上一次查询开头），只在上一次的结果中继续查找。
+        
+        Args:
+            query: 查询文本（不区分大小写）
+        
+        Returns:
+            list: 资源编号列表，前缀匹配的资源在前，其余按名称排序
+        """
+        query = query.strip().lower()
+        if not query:
+            result = [resource_id for _, resource_id in self._sorted]
+        elif self._last_query and query.startswith(self._last_query):
+            result = self._refine(query, self._last_result)
+        else:
+            result = self._prefix_ids(query)
+            if len(result) < len(self._sorted):
+                result += self._substring_ids(query)
+        self._last_query, self._last_result = query, result
+        return result
+    
+    def id_of(self, path):
+        """获取资源路径对应的编号
+        
+        Args:
+            path: 资源路径
+        
+        Returns:
+            int: 资源编号，找不到时返回None
+        """
+        return self._ids.get(path)
+    
+    def path_of(self, resource_id):
+        """获取资源编号对应的路径
+        
+        Args:
+            resource_id: search_ids返回的资源编号
+        
+        Returns:
+            str: 资源路径
+        """
+        return self._paths[resource_id]
+    
+    def search(self, query):
+        """查找名称中包含query的资源
+        
+        Args:
+            query: 查询文本（不区分大小写）
+        
+        Returns:
+            list: 资源路径列表，前缀匹配的资源在前，其余按名称排序
+        """
+        return [self._paths[resource_id] for resource_id in self.search_ids(query)]
@@ -3,5 +3,10 @@
 包含场景相关的数据模型
 """
 from .scene_model import SceneModel
+from .scene_list_model import SceneListModel
+from .scene_search_index import SceneSearchIndex
+from .asset_reference_index import AssetReferenceIndex, scene_asset_fields, scene_asset_paths
+from .scene_hash import scene_visual_fields, scene_visual_hash
+from .scene_validator import SceneValidator, ISSUE_TYPES
 
-__all__ = ['SceneModel']
\ No newline at end of file
+__all__ = ['SceneModel', 'SceneListModel', 'SceneSearchIndex', 'AssetReferenceIndex', 'scene_asset_fields', 'scene_asset_paths', 'scene_visual_fields', 'scene_visual_hash', 'SceneValidator', 'ISSUE_TYPES']
\ No newline at end of file
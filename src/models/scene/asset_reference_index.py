@@ -0,0 +1,307 @@
+"""素材引用索引
+
+记录每个素材被哪些场景引用（素材路径 -> 场景索引），用于查询素材的使用位置、未使用的素材和缺失的文件
+"""
+import os
+import re
+
+
+# 路径中需要规范化的部分：连续的分隔符、"."和".."目录、末尾的分隔符
+_UNNORMALIZED_PATH = re.compile(r'[\\/]\.{0,2}(?:[\\/]|$)')
+
+# 场景可以引用的资源类型（与资源目录下的子目录名一致）
+ASSET_TYPES = ("background", "portrait", "background_music", "sound", "voice", "font")
+
+
+def scene_asset_fields(scene):
+    """列出场景中引用素材的字段
+    
+    Args:
+        scene: 场景字典
+    
+    Returns:
+        list: (资源类型, 字段位置, 素材路径)列表，字段位置为键和下标组成的元组，
+            如("background",)、("portraits", 0, "path")、("audio", "voice")；空路径被忽略
+    """
+    fields = []
+    if scene.get("background"):
+        fields.append(("background", ("background",), scene["background"]))
+    for position, portrait in enumerate(scene.get("portraits") or []):
+        if portrait.get("path"):
+            fields.append(("portrait", ("portraits", position, "path"), portrait["path"]))
+    audio = scene.get("audio") or {}
+    for field, resource_type in (("bgm", "background_music"), ("sound", "sound"), ("voice", "voice")):
+        if audio.get(field):
+            fields.append((resource_type, ("audio", field), audio[field]))
+    font = scene.get("font")
+    if isinstance(font, dict) and font.get("path"):
+        fields.append(("font", ("font", "path"), font["path"]))
+    return fields
+
+
+def scene_asset_paths(scene):
+    """列出场景引用的素材
+    
+    Args:
+        scene: 场景字典
+    
+    Returns:
+        list: (资源类型, 素材路径)列表，空路径被忽略
+    """
+    return [(resource_type, path) for resource_type, _, path in scene_asset_fields(scene)]
+
+
+class AssetReferenceIndex:
+    """素材到场景的反向索引
+    
+    场景保存或加载时增量更新引用关系，同时维护两个结果集合，报告只需遍历结果本身：
+    - 未使用的素材：资源目录中存在（资源清单中）但没有场景引用的素材
+    - 缺失的文件：被场景引用但不在资源清单中、且文件不存在的路径；
+      资源清单中的文件视为存在，只有清单之外的路径在首次被引用时检查一次文件，
+      之后在外部删除的文件需要调用recheck_missing重新检查
+    
+    路径按项目目录解析相对路径并规范化后作为键，同一文件的不同写法视为同一个素材。
+    """
+    
+    def __init__(self, base_dir=None):
+        """初始化素材引用索引
+        
+        Args:
+            base_dir: 解析场景中相对路径的基准目录（通常为项目文件所在目录）
+        """
+        self.base_dir = str(base_dir) if base_dir else None
+        self._keys = {}  # 路径 -> 素材键（同一路径在大量场景中重复出现，缓存规范化结果）
+        self._scenes = {}  # 素材键 -> 引用该素材的场景索引集合
+        self._scene_keys = []  # 场景索引 -> 该场景引用的素材键
+        self._paths = {}  # 素材键 -> (资源类型, 场景中记录的路径)
+        self._catalog = {}  # 素材键 -> (资源类型, 资源路径)
+        self._unused = set()  # 资源清单中未被引用的素材键
+        self._missing = set()  # 被引用但文件不存在的素材键
+    
+    def __len__(self):
+        """被引用的素材数量"""
+        return len(self._scenes)
+    
+    def key(self, path):
+        """素材路径的规范化键
+        
+        Args:
+            path: 素材路径（绝对路径或相对于项目目录的路径）
+        
+        Returns:
+            str: 规范化的绝对路径
+        """
+        key = self._keys.get(path)
+        if key is None:
+            full_path = path
+            if self.base_dir and not os.path.isabs(path):
+                full_path = os.path.join(self.base_dir, path)
+            if os.path.isabs(full_path) and not _UNNORMALIZED_PATH.search(full_path):
+                # 扫描资源目录得到的路径已是规范的绝对路径，不需要再经过abspath
+                key = os.path.normcase(full_path)
+            else:
+                key = os.path.normcase(os.path.abspath(full_path))
+            self._keys[path] = key
+        return key
+    
+    def clear_scenes(self, base_dir=None):
+        """清除所有场景的引用（保留资源清单），用于切换项目
+        
+        Args:
+            base_dir: 新项目的基准目录
+        """
+        base_dir = str(base_dir) if base_dir else None
+        if base_dir != self.base_dir:
+            # 相对路径的解析结果随基准目录变化
+            self.base_dir = base_dir
+            self._keys = {path: key for path, key in self._keys.items() if os.path.isabs(path)}
+        self._scenes = {}
+        self._scene_keys = []
+        self._paths = {}
+        self._missing = set()
+        self._unused = set(self._catalog)
+    
+    def build(self, scenes, base_dir=None):
+        """用场景列表重建引用关系
+        
+        Args:
+            scenes: 场景列表
+            base_dir: 解析相对路径的基准目录
+        """
+        self.clear_scenes(base_dir)
+        for scene_index, scene in enumerate(scenes):
+            self.update_scene(scene_index, scene)
+    
+    def update_scene(self, scene_index, scene):
+        """更新一个场景的引用（新增场景或场景内容变化后调用）
+        
+        Args:
+            scene_index: 场景索引
+            scene: 场景字典
+        """
+        keys = {}
+        for resource_type, path in scene_asset_paths(scene):
+            keys.setdefault(self.key(path), (resource_type, path))
+        
+        if scene_index >= len(self._scene_keys):
+            self._scene_keys.extend([()] * (scene_index + 1 - len(self._scene_keys)))
+        old_keys = self._scene_keys[scene_index]
+        for key in old_keys:
+            if key not in keys:
+                self._remove_reference(key, scene_index)
+        for key, (resource_type, path) in keys.items():
+            if key not in old_keys:
+                self._add_reference(key, scene_index, resource_type, path)
+        self._scene_keys[scene_index] = tuple(keys)
+    
+    def truncate(self, scene_count):
+        """移除超出场景数量的场景的引用（场景被删除后调用）
+        
+        Args:
+            scene_count: 当前场景数量
+        """
+        for scene_index in range(scene_count, len(self._scene_keys)):
+            for key in self._scene_keys[scene_index]:
+                self._remove_reference(key, scene_index)
+        del self._scene_keys[scene_count:]
+    
+    def _add_reference(self, key, scene_index, resource_type, path):
+        """登记引用，素材首次被引用时更新未使用和缺失集合"""
+        scenes = self._scenes.get(key)
+        if scenes is None:
+            scenes = self._scenes[key] = set()
+            self._paths[key] = (resource_type, path)
+            self._unused.discard(key)
+            if key not in self._catalog and not os.path.exists(key):
+                self._missing.add(key)
+        scenes.add(scene_index)
+    
+    def _remove_reference(self, key, scene_index):
+        """移除引用，素材不再被引用时更新未使用和缺失集合"""
+        scenes = self._scenes.get(key)
+        if scenes is None:
+            return
+        scenes.discard(scene_index)
+        if not scenes:
+            del self._scenes[key]
+            del self._paths[key]
+            self._missing.discard(key)
+            if key in self._catalog:
+                self._unused.add(key)
+    
+    def set_catalog(self, resource_type, paths):
+        """设置某类资源的清单（资源目录中实际存在的文件）
+        
+        Args:
+            resource_type: 资源类型
+            paths: 资源路径列表
+        """
+        for key in [key for key, (kind, _) in self._catalog.items() if kind == resource_type]:
+            self._remove_catalog_key(key)
+        for path in paths:
+            self.add_resource(resource_type, path)
+    
+    def add_resource(self, resource_type, path):
+        """资源清单中新增一个文件
+        
+        Args:
+            resource_type: 资源类型
+            path: 资源路径
+        """
+        key = self.key(path)
+        self._catalog[key] = (resource_type, path)
+        self._missing.discard(key)
+        if key not in self._scenes:
+            self._unused.add(key)
+    
+    def remove_resource(self, path):
+        """资源清单中移除一个文件（文件被删除、移动或重命名）
+        
+        Args:
+            path: 资源路径
+        """
+        self._remove_catalog_key(self.key(path))
+    
+    def _remove_catalog_key(self, key):
+        """从资源清单中移除，仍被引用的素材重新检查文件是否存在"""
+        if self._catalog.pop(key, None) is None:
+            return
+        self._unused.discard(key)
+        if key in self._scenes and not os.path.exists(key):
+            self._missing.add(key)
+    
+    def where_used(self, path):
+        """查询引用某个素材的场景
+        
+        Args:
+            path: 素材路径
+        
+        Returns:
+            list: 场景索引列表（升序）
+        """
+        return sorted(self._scenes.get(self.key(path), ()))
+    
+    def use_count(self, path):
+        """引用某个素材的场景数量
+        
+        Args:
+            path: 素材路径
+        
+        Returns:
+            int: 场景数量
+        """
+        return len(self._scenes.get(self.key(path), ()))
+    
+    def referenced_assets(self, resource_type=None):
+        """列出被引用的素材
+        
+        Args:
+            resource_type: 只列出该类型的素材，None表示全部
+        
+        Returns:
+            list: (资源类型, 素材路径, 引用场景数)列表，按类型和路径排序
+        """
+        return sorted(
+            (kind, path, len(self._scenes[key]))
+            for key, (kind, path) in self._paths.items()
+            if resource_type is None or kind == resource_type
+        )
+    
+    def unused_assets(self, resource_type=None):
+        """列出资源清单中没有被任何场景引用的素材
+        
+        Args:
+            resource_type: 只列出该类型的素材，None表示全部
+        
+        Returns:
+            list: (资源类型, 资源路径)列表，按类型和路径排序
+        """
+        return sorted(
+            self._catalog[key] for key in self._unused
+            if resource_type is None or self._catalog[key][0] == resource_type
+        )
+    
+    def missing_files(self):
+        """列出被场景引用但文件不存在的素材
+        
+        Returns:
+            list: (资源类型, 场景中记录的路径, 场景索引列表)列表，按路径排序
+        """
+        # 文件可能已被补回
+        for key in [key for key in self._missing if os.path.exists(key)]:
+            self._missing.discard(key)
+        return sorted(
+            (self._paths[key][0], self._paths[key][1], sorted(self._scenes[key]))
+            for key in self._missing
+        )
+    
+    def recheck_missing(self):
+        """重新检查所有被引用的素材是否存在（文件可能在程序外被删除）
+        
+        耗时与被引用的素材数量成正比，与场景数量无关。
+        
+        Returns:
+            int: 缺失的文件数量
+        """
+        self._missing = {key for key in self._scenes if not os.path.exists(key)}
+        return len(self._missing)
@@ -0,0 +1,49 @@
+"""场景哈希
+
+根据场景中影响画面的字段计算稳定的哈希，用于缩略图等派生数据的缓存键
+"""
+import hashlib
+import json
+
+
+def scene_visual_fields(scene):
+    """提取场景中影响画面的字段
+    
+    没有路径的立绘不影响画面，会被忽略；缩放比例统一保留4位小数。
+    立绘的叠放顺序（z）只在设置时计入，未设置z的场景哈希保持不变。
+    
+    Args:
+        scene: 场景字典
+    
+    Returns:
+        dict: 规范化的画面字段
+    """
+    portraits = []
+    for portrait_info in scene.get("portraits", []):
+        if not portrait_info.get("path"):
+            continue
+        fields = {
+            "path": portrait_info["path"],
+            "scale": round(float(portrait_info.get("scale", 1.0)), 4),
+            "position": portrait_info.get("position")
+        }
+        if "z" in portrait_info:
+            fields["z"] = portrait_info["z"]
+        portraits.append(fields)
+    return {
+        "background": scene.get("background") or "",
+        "portraits": portraits
+    }
+
+
+def scene_visual_hash(scene):
+    """计算场景画面的哈希（背景、立绘、位置和缩放），其他字段的变化不影响结果
+    
+    Args:
+        scene: 场景字典
+    
+    Returns:
+        str: 十六进制SHA-1哈希
+    """
+    payload = json.dumps(scene_visual_fields(scene), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
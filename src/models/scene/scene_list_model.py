@@ -0,0 +1,181 @@
+"""场景列表模型
+
+为场景导航面板提供项目中所有场景的列表
+"""
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtWidgets import QApplication, QStyle
+from utils.helpers.string_utils import truncate
+
+
+class SceneListModel(QAbstractListModel):
+    """场景列表模型，直接读取SceneModel中的场景列表
+    
+    不复制场景数据，也不为每个场景创建条目；显示文本、提示和语音标记都在data()中按需生成，
+    配合统一行高的列表视图时只有可见的行会被访问，场景数量很多时也能流畅滚动。
+    设置了搜索结果时只列出结果中的场景，行号与场景索引不再相同，通过SceneIndexRole取得场景索引。
+    """
+    
+    # 场景索引角色
+    SceneIndexRole = Qt.UserRole
+    
+    def __init__(self, scene_model, text_length=40, parent=None):
+        """初始化场景列表模型
+        
+        Args:
+            scene_model: 场景模型
+            text_length: 列表中台词摘要的最大字数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.scene_model = scene_model
+        self.text_length = text_length
+        self._voice_icon = None
+        self._blank_icon = None
+        # 模型已通知视图的场景数，场景列表变化后由reset/scene_appended同步
+        self._row_count = len(self.scenes)
+        self._rows = None  # 搜索结果（场景索引列表），None表示列出全部场景
+    
+    @property
+    def scenes(self):
+        """当前项目的场景列表"""
+        return self.scene_model.scene_data.get("scenes", [])
+    
+    def rowCount(self, parent=QModelIndex()):
+        """行数"""
+        if parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return self._row_count
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """按需生成场景条目的数据
+        
+        Args:
+            index: 模型索引
+            role: 数据角色
+        
+        Returns:
+            条目数据，不支持的角色返回None
+        """
+        if not index.isValid():
+            return None
+        scene_index = self.scene_index(index.row())
+        scenes = self.scenes
+        if not 0 <= scene_index < min(self._row_count, len(scenes)):
+            return None
+        scene = scenes[scene_index]
+        
+        if role == Qt.DisplayRole:
+            text = " ".join(str(scene.get("text", "")).split())
+            return f"{scene_index + 1:05d}  {self.speaker(scene)}  {truncate(text, self.text_length)}".rstrip()
+        if role == Qt.ToolTipRole:
+            return f"{self.speaker(scene)}\n{scene.get('text', '')}".strip()
+        if role == Qt.DecorationRole:
+            # 有语音的场景显示语音标记，其他场景使用同尺寸的空白图标保持文字对齐
+            return self._icons()[0 if (scene.get("audio") or {}).get("voice") else 1]
+        if role == self.SceneIndexRole:
+            return scene_index
+        return None
+    
+    def scene_index(self, row):
+        """行号对应的场景索引
+        
+        Args:
+            row: 行号
+        
+        Returns:
+            int: 场景索引，行号无效时返回-1
+        """
+        if self._rows is None:
+            return row
+        return self._rows[row] if 0 <= row < len(self._rows) else -1
+    
+    def row_of(self, scene_index):
+        """场景索引对应的行号
+        
+        Args:
+            scene_index: 场景索引
+        
+        Returns:
+            int: 行号，场景不在当前列表中时返回-1
+        """
+        if self._rows is None:
+            return scene_index if 0 <= scene_index < self._row_count else -1
+        try:
+            return self._rows.index(scene_index)
+        except ValueError:
+            return -1
+    
+    def set_rows(self, rows):
+        """只列出指定的场景（如搜索结果）
+        
+        Args:
+            rows: 场景索引列表，None表示列出全部场景
+        """
+        self.beginResetModel()
+        self._rows = list(rows) if rows is not None else None
+        self.endResetModel()
+    
+    @property
+    def filtered(self):
+        """是否只列出了部分场景"""
+        return self._rows is not None
+    
+    @staticmethod
+    def speaker(scene):
+        """场景的说话人（旁白场景返回"旁白"）
+        
+        Args:
+            scene: 场景字典
+        
+        Returns:
+            str: 说话人
+        """
+        if scene.get("is_narration"):
+            return "旁白"
+        return scene.get("character_name", "")
+    
+    def _icons(self):
+        """语音标记图标和空白图标（首次使用时创建）"""
+        if self._voice_icon is None:
+            self._voice_icon = QApplication.style().standardIcon(QStyle.SP_MediaVolume)
+            blank = QPixmap(16, 16)
+            blank.fill(Qt.transparent)
+            self._blank_icon = QIcon(blank)
+        return self._voice_icon, self._blank_icon
+    
+    def reset(self):
+        """场景列表整体替换后（如打开了另一个项目）刷新模型，并清除搜索结果"""
+        self.beginResetModel()
+        self._row_count = len(self.scenes)
+        self._rows = None
+        self.endResetModel()
+    
+    def scene_appended(self):
+        """场景列表末尾追加了场景后通知视图"""
+        count = len(self.scenes)
+        if count <= self._row_count:
+            return
+        if self._rows is not None:
+            # 搜索结果中不包含新场景，只更新场景数
+            self._row_count = count
+            return
+        self.beginInsertRows(QModelIndex(), self._row_count, count - 1)
+        self._row_count = count
+        self.endInsertRows()
+    
+    def scenes_changed(self, scene_indexes):
+        """场景内容被原地修改后（批量编辑、素材移动）刷新对应的行，只发出一次信号
+        
+        Args:
+            scene_indexes: 场景索引列表
+        """
+        if self._rows is None:
+            rows = [scene_index for scene_index in scene_indexes if 0 <= scene_index < self._row_count]
+        else:
+            changed = set(scene_indexes)
+            rows = [row for row, scene_index in enumerate(self._rows) if scene_index in changed]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
@@ -32,6 +32,7 @@ class SceneModel(BaseModel):
             "scenes": []
         }
         self.current_file = None
+        self.current_index = -1  # 当前场景索引，-1表示没有场景
         self.portrait_count = self.config.get("editor", {}).get("portrait_count", 4)
         self.file_service = FileService()
     
@@ -58,6 +59,7 @@ class SceneModel(BaseModel):
         }
         
         self.current_file = file_path
+        self.current_index = -1
         self.save_to_file()
         return file_path
     
@@ -82,6 +84,7 @@ class SceneModel(BaseModel):
                 
             if self.scene_data:
                 self.current_file = file_path
+                self.current_index = len(self.scene_data.get("scenes", [])) - 1
                 log_info(f"项目加载成功: {file_path}")
                 return True
             return False
@@ -148,6 +151,7 @@ class SceneModel(BaseModel):
         
         # 添加场景信息
         self.scene_data.setdefault("scenes", []).append(scene_info)
+        self.current_index = len(self.scene_data["scenes"]) - 1
         
         # 保存到文件
         return self.save_to_file()
@@ -185,6 +189,22 @@ class SceneModel(BaseModel):
             dict: 当前场景数据，如果没有场景则返回空字典
         """
         scenes = self.scene_data.get("scenes", [])
+        if 0 <= self.current_index < len(scenes):
+            return scenes[self.current_index]
         if scenes:
-            return scenes[-1]  # 返回最后一个场景作为当前场景
-        return {}
\ No newline at end of file
+            return scenes[-1]  # 未选择场景时返回最后一个场景作为当前场景
+        return {}
+    
+    def set_current_index(self, index):
+        """设置当前场景索引
+        
+        Args:
+            index: 场景索引
+        
+        Returns:
+            bool: 索引是否有效
+        """
+        if not 0 <= index < len(self.scene_data.get("scenes", [])):
+            return False
+        self.current_index = index
+        return True
\ No newline at end of file
@@ -0,0 +1,384 @@
+"""场景全文索引
+
+为场景台词和角色名建立倒排索引，支持在大量场景中按关键字快速查找，索引文件保存在项目文件旁边
+"""
+import heapq
+import json
+import math
+import os
+import sys
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from utils.helpers.logger import log_error, log_debug
+from utils.helpers.string_utils import tokenize, is_cjk
+
+
+class SceneSearchIndex:
+    """场景台词和角色名的倒排索引
+    
+    - 文本按utils.helpers.string_utils.tokenize切分，中日韩文字使用二元组
+    - 每个词元对应一个按文档编号递增的数组，词元在台词中出现几次编号就重复几次（即词频）
+    - 场景内容变化时为其分配新的文档编号并作废旧编号，索引只追加不修改；
+      作废的编号多于有效编号时整体重建
+    - 每个文档记录台词和角色名的CRC32，重新打开项目时只需重建内容变化的场景
+    
+    查询词元之间为"与"关系，结果按BM25评分排序，角色名命中额外加分。
+    """
+    
+    # 索引文件格式版本，格式变化时旧文件会被忽略并重建
+    FORMAT_VERSION = 1
+    # BM25参数
+    K1 = 1.2
+    B = 0.75
+    
+    def __init__(self, name_weight=2.0):
+        """初始化场景索引
+        
+        Args:
+            name_weight: 角色名命中的权重（相对于台词中出现一次）
+        """
+        self.name_weight = name_weight
+        self.dirty = False  # 是否有尚未保存到文件的变化
+        self._clear()
+    
+    def _clear(self):
+        """清空索引"""
+        self._doc_scene = array('i')  # 文档编号 -> 场景索引，已作废的文档为-1
+        self._doc_length = array('I')  # 文档编号 -> 台词词元数
+        self._doc_crc = array('I')  # 文档编号 -> 内容校验值
+        self._scene_doc = array('i')  # 场景索引 -> 文档编号，-1表示未索引
+        self._text_postings = {}  # 词元 -> 文档编号数组（台词）
+        self._name_postings = {}  # 词元 -> 文档编号数组（角色名，每个文档最多一次）
+        self._text_first = {}  # 单字 -> 以该字开头的台词二元组
+        self._text_second = {}  # 单字 -> 以该字结尾的台词二元组
+        self._name_chars = {}  # 单字 -> 包含该字的角色名二元组
+        self._live_count = 0
+        self._total_length = 0
+    
+    def __len__(self):
+        return self._live_count
+    
+    @staticmethod
+    def path_for(project_file):
+        """项目对应的索引文件路径（与项目文件位于同一目录）
+        
+        Args:
+            project_file: 项目文件路径
+        
+        Returns:
+            Path: 索引文件路径，如 story.json -> story.json.search
+        """
+        project_path = Path(project_file)
+        return project_path.with_name(project_path.name + ".search")
+    
+    @staticmethod
+    def scene_signature(scene):
+        """场景中被索引内容的校验值
+        
+        Args:
+            scene: 场景字典
+        
+        Returns:
+            int: 角色名和台词的CRC32
+        """
+        content = f"{scene.get('character_name', '')}\x00{scene.get('text', '')}"
+        return zlib.crc32(content.encode('utf-8'))
+    
+    def _add_bigram(self, token, name=False):
+        """登记新出现的二元组，查询单个字时不需要遍历全部词元"""
+        if len(token) != 2:
+            return
+        if name:
+            for char in set(token):
+                self._name_chars.setdefault(char, []).append(token)
+        else:
+            self._text_first.setdefault(token[0], []).append(token)
+            self._text_second.setdefault(token[1], []).append(token)
+    
+    def _add_doc(self, scene_index, scene, crc):
+        """为场景分配新的文档编号并写入倒排表"""
+        doc = len(self._doc_scene)
+        tokens = tokenize(str(scene.get("text", "")))
+        for token in tokens:
+            postings = self._text_postings.get(token)
+            if postings is None:
+                postings = self._text_postings[token] = array('I')
+                self._add_bigram(token)
+            postings.append(doc)
+        for token in set(tokenize(str(scene.get("character_name", "")))):
+            postings = self._name_postings.get(token)
+            if postings is None:
+                postings = self._name_postings[token] = array('I')
+                self._add_bigram(token, name=True)
+            postings.append(doc)
+        
+        self._doc_scene.append(scene_index)
+        self._doc_length.append(len(tokens))
+        self._doc_crc.append(crc)
+        if scene_index >= len(self._scene_doc):
+            self._scene_doc.extend([-1] * (scene_index + 1 - len(self._scene_doc)))
+        self._scene_doc[scene_index] = doc
+        self._live_count += 1
+        self._total_length += len(tokens)
+    
+    def _drop_doc(self, doc):
+        """作废文档编号（倒排表中的旧编号在查询时被跳过）"""
+        if self._doc_scene[doc] < 0:
+            return
+        self._doc_scene[doc] = -1
+        self._live_count -= 1
+        self._total_length -= self._doc_length[doc]
+    
+    def update_scene(self, scene_index, scene):
+        """索引新增的场景或重新索引内容变化的场景
+        
+        Args:
+            scene_index: 场景索引
+            scene: 场景字典
+        
+        Returns:
+            bool: 索引是否发生变化（内容未变化时为False）
+        """
+        crc = self.scene_signature(scene)
+        doc = self._scene_doc[scene_index] if scene_index < len(self._scene_doc) else -1
+        if doc >= 0:
+            if self._doc_crc[doc] == crc:
+                return False
+            self._drop_doc(doc)
+        self._add_doc(scene_index, scene, crc)
+        self.dirty = True
+        return True
+    
+    def build(self, scenes):
+        """用场景列表重建索引
+        
+        Args:
+            scenes: 场景列表
+        """
+        self._clear()
+        for scene_index, scene in enumerate(scenes):
+            self._add_doc(scene_index, scene, self.scene_signature(scene))
+        self.dirty = True
+    
+    def sync(self, scenes):
+        """使索引与场景列表一致，只重新索引内容变化的场景
+        
+        Args:
+            scenes: 场景列表
+        
+        Returns:
+            int: 重新索引的场景数量
+        """
+        changed = 0
+        for scene_index, scene in enumerate(scenes):
+            if self.update_scene(scene_index, scene):
+                changed += 1
+        # 场景列表变短时作废多出来的场景
+        for scene_index in range(len(scenes), len(self._scene_doc)):
+            doc = self._scene_doc[scene_index]
+            if doc >= 0:
+                self._drop_doc(doc)
+                self._scene_doc[scene_index] = -1
+                changed += 1
+                self.dirty = True
+        del self._scene_doc[len(scenes):]
+        
+        # 作废的编号过多时重建，避免倒排表无限增长
+        if len(self._doc_scene) - self._live_count > max(self._live_count, 1024):
+            log_debug(f"场景索引中作废的文档过多，重建索引（{len(self._doc_scene)} -> {len(scenes)}）")
+            self.build(scenes)
+        return changed
+    
+    def _term_postings(self, token):
+        """查询词元的词频和命中角色名的文档
+        
+        单个中日韩文字（查询只有一个字时）没有对应的二元组，改为合并包含该字的所有二元组
+        （从建立索引时记录的单字 -> 二元组表中取得）：以该字开头的二元组计入词频，只在片段末尾出现时按出现一次计。
+        
+        Returns:
+            tuple: (文档编号 -> 台词中的词频, 角色名包含该词元的文档编号集合)
+        """
+        empty = array('I')
+        frequencies = Counter(self._text_postings.get(token, empty))
+        name_docs = set(self._name_postings.get(token, empty))
+        if len(token) == 1 and is_cjk(token):
+            text_postings = self._text_postings
+            for bigram in self._text_first.get(token, ()):
+                frequencies.update(text_postings[bigram])
+            for bigram in self._text_second.get(token, ()):
+                for doc in text_postings[bigram]:
+                    frequencies.setdefault(doc, 1)
+            for bigram in self._name_chars.get(token, ()):
+                name_docs.update(self._name_postings[bigram])
+        return frequencies, name_docs
+    
+    def name_candidates(self, name):
+        """角色名包含name全部词元的场景，按角色名精确筛选时先用它缩小范围
+        
+        Args:
+            name: 角色名
+        
+        Returns:
+            set: 场景索引集合（角色名与name相同的场景一定在其中），name没有词元时返回None
+        """
+        tokens = set(tokenize(name))
+        if not tokens:
+            return None
+        docs = None
+        for token in sorted(tokens, key=lambda token: len(self._name_postings.get(token, ()))):
+            postings = self._name_postings.get(token, ())
+            docs = set(postings) if docs is None else docs.intersection(postings)
+            if not docs:
+                return set()
+        doc_scene = self._doc_scene
+        return {doc_scene[doc] for doc in docs if doc_scene[doc] >= 0}
+    
+    def search(self, query, limit=None):
+        """查找台词或角色名中包含query全部词元的场景
+        
+        Args:
+            query: 查询文本
+            limit: 最多返回的结果数量，None表示不限制
+        
+        Returns:
+            list: (场景索引, 评分)列表，按评分从高到低排列，评分相同时按场景顺序
+        """
+        tokens = set(tokenize(query))
+        if not tokens or not self._live_count:
+            return []
+        
+        # 从文档最少的词元开始求交集
+        terms = sorted((self._term_postings(token) for token in tokens), key=lambda term: len(term[0]) + len(term[1]))
+        candidates = None
+        term_stats = []
+        for frequencies, name_docs in terms:
+            docs = frequencies.keys() | name_docs
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+            term_stats.append((frequencies, name_docs, len(docs)))
+        
+        doc_scene = self._doc_scene
+        doc_length = self._doc_length
+        live_count = self._live_count
+        average_length = self._total_length / live_count or 1.0
+        k1, b = self.K1, self.B
+        weights = [
+            (frequencies, name_docs, math.log(1 + (live_count - doc_count + 0.5) / (doc_count + 0.5)))
+            for frequencies, name_docs, doc_count in term_stats
+        ]
+        ranked = []  # (负评分, 场景索引)，直接比较元组即可排序
+        for doc in candidates:
+            scene_index = doc_scene[doc]
+            if scene_index < 0:
+                continue
+            length_norm = k1 * (1 - b + b * doc_length[doc] / average_length)
+            score = 0.0
+            for frequencies, name_docs, idf in weights:
+                frequency = frequencies.get(doc)
+                if frequency:
+                    score += idf * frequency * (k1 + 1) / (frequency + length_norm)
+                if doc in name_docs:
+                    score += idf * self.name_weight
+            ranked.append((-score, scene_index))
+        
+        if limit is None:
+            ranked.sort()
+        else:
+            ranked = heapq.nsmallest(limit, ranked)
+        return [(scene_index, -score) for score, scene_index in ranked]
+    
+    def save(self, path):
+        """保存索引文件（先写临时文件再替换，写入中断时不会损坏旧文件）
+        
+        文件第一行为JSON头，记录版本、字节序和各词元倒排表的长度，之后依次为各数组的原始数据。
+        
+        Args:
+            path: 索引文件路径
+        
+        Returns:
+            bool: 是否成功
+        """
+        path = Path(path)
+        text_tokens = list(self._text_postings)
+        name_tokens = list(self._name_postings)
+        header = {
+            "version": self.FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "docs": len(self._doc_scene),
+            "scenes": len(self._scene_doc),
+            "text": [[token, len(self._text_postings[token])] for token in text_tokens],
+            "name": [[token, len(self._name_postings[token])] for token in name_tokens]
+        }
+        temp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b"\n")
+                for data in (self._doc_scene, self._doc_length, self._doc_crc, self._scene_doc):
+                    data.tofile(f)
+                for token in text_tokens:
+                    self._text_postings[token].tofile(f)
+                for token in name_tokens:
+                    self._name_postings[token].tofile(f)
+            os.replace(temp_path, path)
+            self.dirty = False
+            return True
+        except Exception as e:
+            log_error(f"保存场景索引失败: {str(e)}")
+            return False
+    
+    def load(self, path):
+        """加载索引文件，文件不存在、版本不符或内容损坏时保持空索引
+        
+        Args:
+            path: 索引文件路径
+        
+        Returns:
+            bool: 是否成功加载
+        """
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline().decode('utf-8'))
+                if header.get("version") != self.FORMAT_VERSION:
+                    return False
+                swap = header.get("byteorder") != sys.byteorder
+                
+                def read_array(typecode, count):
+                    data = array(typecode)
+                    data.fromfile(f, count)
+                    if swap:
+                        data.byteswap()
+                    return data
+                
+                doc_scene = read_array('i', header["docs"])
+                doc_length = read_array('I', header["docs"])
+                doc_crc = read_array('I', header["docs"])
+                scene_doc = read_array('i', header["scenes"])
+                text_postings = {token: read_array('I', count) for token, count in header["text"]}
+                name_postings = {token: read_array('I', count) for token, count in header["name"]}
+        except Exception as e:
+            log_error(f"加载场景索引失败，将重建索引: {str(e)}")
+            return False
+        
+        self._clear()
+        self._doc_scene = doc_scene
+        self._doc_length = doc_length
+        self._doc_crc = doc_crc
+        self._scene_doc = scene_doc
+        self._text_postings = text_postings
+        self._name_postings = name_postings
+        for token in text_postings:
+            self._add_bigram(token)
+        for token in name_postings:
+            self._add_bigram(token, name=True)
+        for doc, scene_index in enumerate(doc_scene):
+            if scene_index >= 0:
+                self._live_count += 1
+                self._total_length += doc_length[doc]
+        self.dirty = False
+        return True
@@ -0,0 +1,307 @@
+"""场景检查
+
+检查项目中的常见问题：缺失的素材文件、超出范围的立绘缩放、超出画布的立绘、有语音但没有台词、超出范围的字号
+"""
+import os
+from PyQt5.QtGui import QImageReader
+from models.scene.asset_reference_index import AssetReferenceIndex, scene_asset_fields
+from services.render.scene_compositor import resolve_portrait_position, clamp_portrait_position
+
+
+# 问题类型及其显示名称
+ISSUE_TYPES = {
+    "missing_file": "缺失文件",
+    "scale": "缩放超出范围",
+    "off_canvas": "立绘超出画布",
+    "voice_without_text": "有语音无台词",
+    "font_size": "字号超出范围"
+}
+
+# 没有读到尺寸的文件（音频、字体或无法识别的图片）
+_NO_SIZE = ()
+
+
+class SceneValidator:
+    """项目中各场景的检查结果，场景或资源文件变化时只重新检查受影响的场景
+    
+    - 只与场景内容有关的检查（缩放、字号、语音与台词）按场景的检查输入缓存，
+      输入相同的场景（包括内容被改回原样的场景）直接复用结果
+    - 与文件有关的检查（文件是否存在、立绘尺寸）通过文件信息缓存完成，每个文件只读取一次；
+      文件被添加、删除或移动后调用file_changed，只重新检查引用该文件的场景
+    - 场景更新时先比较检查输入，未变化的场景不做任何检查
+    """
+    
+    def __init__(self, base_dir=None, scale_range=(0.5, 1.5), font_size_range=(8, 36)):
+        """初始化场景检查
+        
+        Args:
+            base_dir: 解析场景中相对路径的基准目录（通常为项目文件所在目录）
+            scale_range: 立绘缩放的允许范围 (最小值, 最大值)
+            font_size_range: 字号的允许范围 (最小值, 最大值)
+        """
+        self.scale_range = tuple(scale_range)
+        self.font_size_range = tuple(font_size_range)
+        self._references = AssetReferenceIndex(base_dir)  # 素材 -> 引用它的场景，用于文件变化时找到受影响的场景
+        self._inputs = []  # 场景索引 -> 检查输入
+        self._issues = []  # 场景索引 -> 问题元组 ((问题类型, 说明), ...)
+        self._issue_scenes = set()  # 有问题的场景索引
+        self._content_cache = {}  # 内容检查输入 -> 问题元组
+        self._file_info = {}  # 素材键 -> 图片尺寸(宽, 高)、_NO_SIZE，文件不存在时为None
+    
+    def __len__(self):
+        """已检查的场景数量"""
+        return len(self._inputs)
+    
+    @property
+    def issue_count(self):
+        """问题总数"""
+        return sum(len(self._issues[scene_index]) for scene_index in self._issue_scenes)
+    
+    @property
+    def scene_count(self):
+        """有问题的场景数量"""
+        return len(self._issue_scenes)
+    
+    def _content_input(self, scene):
+        """只与场景内容有关的检查输入"""
+        font = scene.get("font")
+        audio = scene.get("audio") or {}
+        return (
+            tuple(portrait.get("scale", 1.0) for portrait in scene.get("portraits") or [] if portrait.get("path")),
+            bool(audio.get("voice")),
+            bool(str(scene.get("text") or "").strip()),
+            font.get("size") if isinstance(font, dict) else None
+        )
+    
+    def _scene_input(self, scene):
+        """场景的全部检查输入：内容检查输入、素材路径、立绘的路径、画布坐标和缩放
+        
+        输入中只有不可变的值，场景字典被原地修改后仍能与旧输入比较。
+        """
+        portraits = []
+        for portrait in scene.get("portraits") or []:
+            if portrait.get("path"):
+                try:
+                    x, y = resolve_portrait_position(portrait.get("position"))
+                except (TypeError, ValueError):
+                    x, y = 0, 0
+                portraits.append((portrait["path"], x, y, portrait.get("scale", 1.0)))
+        assets = tuple((resource_type, path) for resource_type, _, path in scene_asset_fields(scene))
+        return self._content_input(scene), assets, tuple(portraits)
+    
+    def _check_content(self, content_input):
+        """只与场景内容有关的检查（结果按检查输入缓存）"""
+        issues = self._content_cache.get(content_input)
+        if issues is not None:
+            return issues
+        scales, has_voice, has_text, font_size = content_input
+        issues = []
+        low, high = self.scale_range
+        for position, scale in enumerate(scales):
+            try:
+                out_of_range = not low <= float(scale) <= high
+            except (TypeError, ValueError):
+                out_of_range = True
+            if out_of_range:
+                issues.append(("scale", f"立绘{position + 1}的缩放 {scale} 不在 {low}-{high} 之间"))
+        if has_voice and not has_text:
+            issues.append(("voice_without_text", "设置了语音但没有台词"))
+        if font_size is not None:
+            low, high = self.font_size_range
+            try:
+                out_of_range = not low <= int(font_size) <= high
+            except (TypeError, ValueError):
+                out_of_range = True
+            if out_of_range:
+                issues.append(("font_size", f"字号 {font_size} 不在 {low}-{high} 之间"))
+        issues = tuple(issues)
+        self._content_cache[content_input] = issues
+        return issues
+    
+    def _file(self, path):
+        """读取文件信息（只读取一次）"""
+        key = self._references.key(path)
+        info = self._file_info.get(key, False)
+        if info is False:
+            info = self._read_file_info(key)
+            self._file_info[key] = info
+        return info
+    
+    @staticmethod
+    def _read_file_info(key):
+        """检查文件是否存在，图片只读取文件头得到尺寸"""
+        if not os.path.isfile(key):
+            return None
+        size = QImageReader(key).size()
+        return (size.width(), size.height()) if size.isValid() else _NO_SIZE
+    
+    def _check_files(self, assets, portraits):
+        """与文件有关的检查：文件是否存在、立绘是否超出画布"""
+        issues = []
+        for resource_type, path in assets:
+            if self._file(path) is None:
+                issues.append(("missing_file", f"文件不存在: {path}"))
+        for position, (path, x, y, scale) in enumerate(portraits):
+            info = self._file(path)
+            if not info:
+                continue
+            try:
+                width, height = int(info[0] * float(scale)), int(info[1] * float(scale))
+            except (TypeError, ValueError):
+                continue
+            if clamp_portrait_position(x, y, width, height) != (x, y):
+                issues.append(("off_canvas", f"立绘{position + 1}超出画布（{x}, {y}），渲染时会被移回画布内"))
+        return tuple(issues)
+    
+    def _store(self, scene_index, scene_input, issues):
+        """保存场景的检查输入和结果"""
+        if scene_index >= len(self._inputs):
+            grow = scene_index + 1 - len(self._inputs)
+            self._inputs.extend([None] * grow)
+            self._issues.extend([()] * grow)
+        self._inputs[scene_index] = scene_input
+        self._issues[scene_index] = issues
+        if issues:
+            self._issue_scenes.add(scene_index)
+        else:
+            self._issue_scenes.discard(scene_index)
+    
+    def update_scene(self, scene_index, scene):
+        """检查新增的场景或重新检查内容变化的场景
+        
+        Args:
+            scene_index: 场景索引
+            scene: 场景字典
+        
+        Returns:
+            bool: 是否重新检查（检查输入未变化时为False）
+        """
+        scene_input = self._scene_input(scene)
+        if scene_index < len(self._inputs) and self._inputs[scene_index] == scene_input:
+            return False
+        content_input, assets, portraits = scene_input
+        self._references.update_scene(scene_index, scene)
+        self._store(scene_index, scene_input, self._check_content(content_input) + self._check_files(assets, portraits))
+        return True
+    
+    def build(self, scenes, base_dir=None):
+        """检查全部场景
+        
+        Args:
+            scenes: 场景列表
+            base_dir: 解析相对路径的基准目录，None表示沿用当前的基准目录
+        """
+        self._references.clear_scenes(base_dir if base_dir is not None else self._references.base_dir)
+        self._inputs = []
+        self._issues = []
+        self._issue_scenes = set()
+        self._file_info = {}
+        for scene_index, scene in enumerate(scenes):
+            self.update_scene(scene_index, scene)
+        self._prune_cache()
+    
+    def sync(self, scenes):
+        """使检查结果与场景列表一致，只重新检查输入变化的场景
+        
+        Args:
+            scenes: 场景列表
+        
+        Returns:
+            int: 重新检查的场景数量
+        """
+        changed = 0
+        for scene_index, scene in enumerate(scenes):
+            if self.update_scene(scene_index, scene):
+                changed += 1
+        self.truncate(len(scenes))
+        return changed
+    
+    def truncate(self, scene_count):
+        """移除超出场景数量的场景的结果（场景被删除后调用）
+        
+        Args:
+            scene_count: 当前场景数量
+        """
+        self._references.truncate(scene_count)
+        for scene_index in range(scene_count, len(self._inputs)):
+            self._issue_scenes.discard(scene_index)
+        del self._inputs[scene_count:]
+        del self._issues[scene_count:]
+    
+    def file_changed(self, path):
+        """文件被添加、删除或移动后重新检查引用它的场景
+        
+        Args:
+            path: 文件路径
+        
+        Returns:
+            int: 重新检查的场景数量
+        """
+        key = self._references.key(path)
+        if key not in self._file_info:
+            return 0
+        info = self._read_file_info(key)
+        if info == self._file_info[key]:
+            return 0
+        self._file_info[key] = info
+        scene_indexes = self._references.where_used(path)
+        for scene_index in scene_indexes:
+            self._recheck_files(scene_index)
+        return len(scene_indexes)
+    
+    def recheck_files(self):
+        """重新读取所有被引用的文件（文件可能在程序外被修改或删除）
+        
+        Returns:
+            int: 重新检查的场景数量
+        """
+        changed = set()
+        for key, info in list(self._file_info.items()):
+            new_info = self._read_file_info(key)
+            if new_info != info:
+                self._file_info[key] = new_info
+                changed.update(self._references.where_used(key))
+        for scene_index in changed:
+            self._recheck_files(scene_index)
+        return len(changed)
+    
+    def _recheck_files(self, scene_index):
+        """文件信息变化后重新检查场景（内容检查结果来自缓存）"""
+        if scene_index >= len(self._inputs) or self._inputs[scene_index] is None:
+            return
+        scene_input = self._inputs[scene_index]
+        content_input, assets, portraits = scene_input
+        self._store(scene_index, scene_input, self._check_content(content_input) + self._check_files(assets, portraits))
+    
+    def _prune_cache(self):
+        """丢弃不再被任何场景使用的内容检查结果"""
+        if len(self._content_cache) > 2 * len(self._inputs) + 1024:
+            live = {scene_input[0] for scene_input in self._inputs if scene_input is not None}
+            self._content_cache = {key: issues for key, issues in self._content_cache.items() if key in live}
+    
+    def scene_issues(self, scene_index):
+        """场景的问题
+        
+        Args:
+            scene_index: 场景索引
+        
+        Returns:
+            tuple: ((问题类型, 说明), ...)
+        """
+        return self._issues[scene_index] if 0 <= scene_index < len(self._issues) else ()
+    
+    def issues(self, issue_type=None):
+        """列出所有问题（耗时只与有问题的场景数量有关）
+        
+        Args:
+            issue_type: 只列出该类型的问题，None表示全部
+        
+        Returns:
+            list: (场景索引, 问题类型, 说明)列表，按场景顺序排列
+        """
+        return [
+            (scene_index, kind, message)
+            for scene_index in sorted(self._issue_scenes)
+            for kind, message in self._issues[scene_index]
+            if issue_type is None or kind == issue_type
+        ]
@@ -2,6 +2,7 @@
 
 提供统一的文件操作功能，使用pathlib.Path处理路径
 """
+import hashlib
 import json
 import os
 import shutil
@@ -14,6 +15,9 @@ from utils.helpers.logger import log_error, log_debug, log_warning
 class FileService:
     """文件服务，负责统一的文件操作"""
     
+    # 文件哈希缓存: path -> ((mtime_ns, size), 哈希)
+    _hash_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
     @staticmethod
     def ensure_directory(directory_path: str) -> bool:
         """确保目录存在，如果不存在则创建
@@ -131,6 +135,41 @@ class FileService:
             log_error(f"复制文件失败: {e}")
             return False
     
+    @staticmethod
+    def move_file(source_path: str, destination_path: str) -> bool:
+        """移动或重命名文件，目标文件已存在时不覆盖
+        
+        Args:
+            source_path: 源文件路径
+            destination_path: 目标文件路径
+        
+        Returns:
+            bool: 是否成功移动
+        """
+        try:
+            if not source_path or not destination_path:
+                log_debug("源文件路径或目标文件路径为空")
+                return False
+            
+            source = Path(source_path)
+            if not source.is_file():
+                log_debug(f"源文件不存在: {source_path}")
+                return False
+            
+            destination = Path(destination_path)
+            if destination.exists():
+                log_warning(f"目标文件已存在，不覆盖: {destination_path}")
+                return False
+            if not FileService.ensure_directory(str(destination.parent)):
+                return False
+            
+            shutil.move(str(source), str(destination))
+            FileService._hash_cache.pop(str(source), None)
+            return True
+        except Exception as e:
+            log_error(f"移动文件失败: {source_path} -> {destination_path}, 错误: {str(e)}")
+            return False
+    
     @staticmethod
     def get_file_name_without_extension(file_path: str) -> str:
         """获取不带扩展名的文件名
@@ -161,6 +200,69 @@ class FileService:
         
         return Path(file_path).suffix.lower()
     
+    @staticmethod
+    def get_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> Optional[str]:
+        """计算文件内容的SHA-1哈希
+        
+        Args:
+            file_path: 文件路径
+            chunk_size: 每次读取的字节数
+            
+        Returns:
+            Optional[str]: 十六进制哈希字符串，如果失败则返回None
+        """
+        try:
+            if not file_path:
+                return None
+            
+            digest = hashlib.sha1()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except Exception as e:
+            log_error(f"计算文件哈希失败: {file_path}, 错误: {str(e)}")
+            return None
+    
+    @staticmethod
+    def get_file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+        """获取文件签名（修改时间和大小），用于快速判断文件是否变化
+        
+        Args:
+            file_path: 文件路径
+        
+        Returns:
+            Optional[Tuple[int, int]]: (mtime_ns, size)，文件不存在时返回None
+        """
+        try:
+            stat = os.stat(file_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    @staticmethod
+    def get_cached_file_hash(file_path: str) -> Optional[str]:
+        """获取文件内容哈希，文件签名未变化时直接返回缓存结果
+        
+        Args:
+            file_path: 文件路径
+        
+        Returns:
+            Optional[str]: 十六进制哈希字符串，如果失败则返回None
+        """
+        signature = FileService.get_file_signature(file_path)
+        if signature is None:
+            return None
+        
+        cached = FileService._hash_cache.get(file_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        content_hash = FileService.get_file_hash(file_path)
+        if content_hash:
+            FileService._hash_cache[file_path] = (signature, content_hash)
+        return content_hash
+    
     @staticmethod
     def scan_directory(directory_path: str, extensions: Optional[List[str]] = None) -> List[Tuple[str, str]]:
         """扫描目录中的文件
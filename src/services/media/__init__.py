@@ -3,5 +3,8 @@
 包含音频和图像处理相关服务
 """
 from .media_service import MediaService
+from .image_pyramid import ImagePyramid
+from .asset_analyzer import AssetAnalyzer
+from .asset_prefetcher import AssetPrefetcher
 
-__all__ = ['MediaService']
\ No newline at end of file
+__all__ = ['MediaService', 'ImagePyramid', 'AssetAnalyzer', 'AssetPrefetcher']
\ No newline at end of file
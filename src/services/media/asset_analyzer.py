@@ -0,0 +1,121 @@
+"""资源分析器
+
+分析图片资源的不透明区域等信息，按内容哈希持久化分析结果
+"""
+import threading
+from pathlib import Path
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QImage
+from services.file.file_service import FileService
+from utils.helpers.logger import log_error, log_debug
+
+
+class AssetAnalyzer:
+    """资源分析器，计算立绘的不透明包围盒并按内容哈希缓存
+    
+    分析结果以追加方式写入文本缓存文件，每行格式为
+    "<内容哈希> <x> <y> <宽度> <高度> <原图宽度> <原图高度>"，
+    同一内容的图片无论路径如何变化都只分析一次。
+    """
+    
+    def __init__(self, cache_file):
+        """初始化资源分析器
+        
+        Args:
+            cache_file: 分析结果缓存文件路径
+        """
+        self.cache_file = Path(cache_file)
+        self._bounds = {}  # 内容哈希 -> (QRect 包围盒, 原图宽度, 原图高度)
+        self._lock = threading.Lock()
+        self._load_cache()
+    
+    def _load_cache(self):
+        """从缓存文件加载已有的分析结果"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 7:
+                        continue
+                    x, y, width, height, source_width, source_height = (int(value) for value in parts[1:])
+                    self._bounds[parts[0]] = (QRect(x, y, width, height), source_width, source_height)
+        except Exception as e:
+            log_error(f"加载资源分析缓存失败: {str(e)}")
+    
+    def _append_cache(self, content_hash, bounds, source_width, source_height):
+        """追加一条分析结果到缓存文件"""
+        try:
+            FileService.ensure_directory(str(self.cache_file.parent))
+            with self._lock, open(self.cache_file, 'a', encoding='utf-8') as f:
+                f.write(f"{content_hash} {bounds.x()} {bounds.y()} {bounds.width()} {bounds.height()} "
+                        f"{source_width} {source_height}\n")
+        except Exception as e:
+            log_error(f"写入资源分析缓存失败: {str(e)}")
+    
+    @staticmethod
+    def compute_opaque_bounds(image):
+        """计算图片不透明区域的包围盒
+        
+        Args:
+            image: QImage图像
+        
+        Returns:
+            QRect: 包围盒，图片完全不透明时为整张图片，完全透明时为空矩形
+        """
+        if not image.hasAlphaChannel():
+            return image.rect()
+        # 只用QImage（可在工作线程中使用）：取出透明通道后逐行扫描，
+        # 每行用字节串的strip在C中跳过两端完全透明的像素，半透明边缘保留在包围盒内
+        image = image.convertToFormat(QImage.Format_Alpha8)
+        bits = image.constBits()
+        bits.setsize(image.byteCount())
+        data = bytes(bits)
+        width = image.width()
+        bytes_per_line = image.bytesPerLine()
+        top = bottom = None
+        left, right = width, 0
+        for y in range(image.height()):
+            start = y * bytes_per_line
+            row = data[start:start + width]
+            stripped = row.rstrip(b"\0")
+            if not stripped:
+                continue
+            if top is None:
+                top = y
+            bottom = y
+            right = max(right, len(stripped))
+            left = min(left, len(stripped) - len(stripped.lstrip(b"\0")))
+        if top is None:
+            return QRect()
+        return QRect(left, top, right - left, bottom - top + 1)
+    
+    def opaque_bounds(self, image_path, image=None):
+        """获取图片的不透明包围盒（原图像素坐标），已分析过的内容直接返回缓存结果
+        
+        Args:
+            image_path: 图片路径
+            image: 已解码的原图（可选），避免重复解码
+        
+        Returns:
+            QRect: 包围盒，无法分析时返回None
+        """
+        content_hash = FileService.get_cached_file_hash(image_path)
+        if not content_hash:
+            return None
+        
+        cached = self._bounds.get(content_hash)
+        if cached is not None:
+            return QRect(cached[0])
+        
+        if image is None:
+            image = QImage(image_path)
+        if image.isNull():
+            log_debug(f"加载图片失败: {image_path}")
+            return None
+        
+        bounds = self.compute_opaque_bounds(image)
+        self._bounds[content_hash] = (bounds, image.width(), image.height())
+        self._append_cache(content_hash, bounds, image.width(), image.height())
+        return QRect(bounds)
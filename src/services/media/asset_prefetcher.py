@@ -0,0 +1,170 @@
+"""场景素材预取
+
+切换场景时在后台解码相邻场景的背景和立绘，存入媒体服务的图片缓存，
+之后打开这些场景时直接命中缓存
+"""
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from utils.helpers.logger import log_error, log_debug
+
+
+class AssetPrefetcher(QObject):
+    """相邻场景素材预取器
+    
+    显示场景i时，按与i的距离由近到远在线程池中解码场景i-k到i+k用到的素材（距离相同时先预取后面的场景）。
+    工作线程只解码QImage，结果回到界面线程后转换为QPixmap并写入MediaService.image_cache，
+    缓存键与同步加载时一致。预取的素材总量受内存预算限制，超出预算时优先丢弃距离最远的素材
+    （整个图片缓存另有总预算，见MediaService.image_cache_budget）；
+    用户跳转后不再需要的任务会被取消，已完成的结果直接丢弃。
+    """
+    
+    # 工作线程完成解码后通知界面线程 (缓存键, QImage, bounds)
+    _decoded = pyqtSignal(object, object, object)
+    
+    def __init__(self, media_service, config=None, parent=None):
+        """初始化素材预取器
+        
+        Args:
+            media_service: 媒体服务
+            config: 应用程序配置
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.media_service = media_service
+        self.config = config or {}
+        
+        prefetch_config = self.config.get("prefetch", {})
+        self.enabled = prefetch_config.get("enabled", True)
+        self.radius = max(0, prefetch_config.get("radius", 2))
+        self.workers = max(1, prefetch_config.get("workers", 2))
+        self.memory_budget = max(0, prefetch_config.get("memory_budget_mb", 256)) * 1024 * 1024
+        
+        self.executor = None
+        self.wanted = {}  # 缓存键 -> 与当前场景的距离
+        self.pending = {}  # 缓存键 -> Future
+        self.prefetched = {}  # 缓存键 -> (缓存中的对象, 占用字节数)
+        self.prefetched_bytes = 0
+        self._decoded.connect(self._on_decoded, Qt.QueuedConnection)
+    
+    def schedule(self, scenes, index, canvas_width, canvas_height):
+        """以指定场景为中心重新安排预取任务
+        
+        Args:
+            scenes: 场景列表
+            index: 当前场景索引
+            canvas_width: 画布宽度（决定背景的解码尺寸）
+            canvas_height: 画布高度
+        """
+        if not self.enabled or not scenes:
+            return
+        
+        # 按距离收集需要的素材，多个场景共用的素材取最近的距离
+        jobs = {}
+        for distance, scene_index in self._neighbours(index, len(scenes)):
+            for key, job in self._scene_jobs(scenes[scene_index], canvas_width, canvas_height):
+                if key not in jobs:
+                    jobs[key] = (distance, job)
+        self.wanted = {key: distance for key, (distance, _) in jobs.items()}
+        
+        # 取消跳转后不再需要的任务，释放不再需要的预取结果
+        for key in [key for key in self.pending if key not in self.wanted]:
+            self.pending.pop(key).cancel()
+        for key in [key for key in self.prefetched if key not in self.wanted]:
+            self._evict(key)
+        
+        submitted = 0
+        for key, (distance, job) in sorted(jobs.items(), key=lambda item: item[1][0]):
+            if key in self.pending or key in self.media_service.image_cache:
+                continue
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+            self.pending[key] = self.executor.submit(self._decode, key, job)
+            submitted += 1
+        if submitted:
+            log_debug(f"预取场景素材: 场景 {index + 1}, 新任务 {submitted} 个, 进行中 {len(self.pending)} 个")
+    
+    def _neighbours(self, index, count):
+        """按距离由近到远列出预取范围内的场景，距离相同时后面的场景优先
+        
+        Returns:
+            list: [(距离, 场景索引)]
+        """
+        result = [(0, index)] if 0 <= index < count else []
+        for distance in range(1, self.radius + 1):
+            for scene_index in (index + distance, index - distance):
+                if 0 <= scene_index < count:
+                    result.append((distance, scene_index))
+        return result
+    
+    def _scene_jobs(self, scene, canvas_width, canvas_height):
+        """列出场景用到的素材解码任务
+        
+        Returns:
+            list: [(缓存键, 解码任务)]
+        """
+        jobs = []
+        background = scene.get("background")
+        if background:
+            key = self.media_service.background_cache_key(background, canvas_width, canvas_height)
+            jobs.append((key, ("background", background, canvas_width, canvas_height)))
+        for portrait in scene.get("portraits", []):
+            path = portrait.get("path")
+            if path:
+                scale = portrait.get("scale", 1.0)
+                jobs.append((self.media_service.portrait_cache_key(path, scale), ("portrait", path, scale)))
+        return jobs
+    
+    def _decode(self, key, job):
+        """在工作线程中解码素材"""
+        image, bounds = None, None
+        try:
+            if job[0] == "background":
+                image = self.media_service.read_background_image(job[1], job[2], job[3])
+            else:
+                image, _, bounds = self.media_service.load_portrait_image(job[1], job[2])
+        except Exception as e:
+            log_error(f"预取素材失败: {job[1]}, 错误: {str(e)}")
+        self._decoded.emit(key, image, bounds)
+    
+    def _on_decoded(self, key, image, bounds):
+        """界面线程中将解码结果存入缓存，超出内存预算时丢弃距离最远的素材"""
+        if self.pending.pop(key, None) is None or image is None:
+            return
+        distance = self.wanted.get(key)
+        # 已被同步加载或已不在预取范围内
+        if distance is None or key in self.media_service.image_cache:
+            return
+        
+        size = image.sizeInBytes()
+        farther = sorted((k for k in self.prefetched if self.wanted.get(k, 0) > distance),
+                         key=lambda k: self.wanted[k], reverse=True)
+        while self.prefetched_bytes + size > self.memory_budget and farther:
+            self._evict(farther.pop(0))
+        if self.prefetched_bytes + size > self.memory_budget:
+            # 预算已被更近的素材占满，更远的任务也不必再做
+            for pending_key in [k for k in self.pending if self.wanted.get(k, 0) >= distance]:
+                self.pending.pop(pending_key).cancel()
+            return
+        
+        if bounds is None:
+            pixmap = self.media_service.cache_background_image(key, image)
+        else:
+            pixmap = self.media_service.cache_portrait_image(key, image, bounds)
+        self.prefetched[key] = (self.media_service.image_cache[key], size)
+        self.prefetched_bytes += size
+        log_debug(f"预取素材完成: {pixmap.width()}x{pixmap.height()}, 已预取 {self.prefetched_bytes / 1048576:.1f} MB")
+    
+    def _evict(self, key):
+        """从缓存中移除预取的素材（缓存条目已被替换时只移除记录）"""
+        entry, size = self.prefetched.pop(key)
+        self.prefetched_bytes -= size
+        self.media_service.discard_image(key, entry)
+    
+    def shutdown(self):
+        """取消所有预取任务并关闭线程池"""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
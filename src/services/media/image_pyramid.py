@@ -0,0 +1,245 @@
+"""立绘金字塔缓存
+
+为立绘预先生成多个缩放级别并持久化到磁盘，缩放时从最接近的级别开始
+"""
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QImageReader
+from services.file.file_service import FileService
+from utils.resource_utils import ResourceLoader
+from utils.helpers.logger import log_error, log_debug, log_info
+
+
+# 默认的预缩放级别
+DEFAULT_LEVELS = (0.5, 0.75, 1.0, 1.5)
+
+# 支持生成金字塔的图片扩展名
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.bmp', '.webp']
+
+
+class ImagePyramid:
+    """立绘金字塔缓存，按图片路径和内容哈希组织磁盘缓存
+    
+    缓存目录结构为 <cache_dir>/<路径哈希>_<内容哈希>/<级别>.png，图片内容变化后
+    生成新目录时删除同一路径的旧目录。
+    级别1.0直接使用原图，不在磁盘上重复保存。
+    所有图像操作都基于QImage，可以安全地在工作线程中执行。
+    """
+    
+    def __init__(self, cache_dir, levels=None):
+        """初始化立绘金字塔缓存
+        
+        Args:
+            cache_dir: 缓存目录
+            levels: 预缩放级别列表
+        """
+        self.cache_dir = Path(cache_dir)
+        self.levels = sorted(set(levels or DEFAULT_LEVELS) | {1.0})
+        # 原图尺寸缓存: path -> ((mtime_ns, size), QSize)
+        self._source_sizes = {}
+        self._executor = None
+        self._futures = []
+    
+    def _entry_dir(self, image_path):
+        """获取图片对应的缓存子目录，文件未变化时不重复计算哈希
+        
+        Args:
+            image_path: 图片路径
+        
+        Returns:
+            Path: 缓存子目录，无法计算时返回None
+        """
+        content_hash = FileService.get_cached_file_hash(image_path)
+        if not content_hash:
+            return None
+        return self.cache_dir / f"{self._path_key(image_path)}_{content_hash}"
+    
+    @staticmethod
+    def _path_key(image_path):
+        """图片路径的哈希，同一图片的各版本缓存目录以它为前缀"""
+        path = os.path.normcase(os.path.abspath(image_path))
+        return hashlib.sha1(path.encode('utf-8')).hexdigest()[:16]
+    
+    def _prune_versions(self, entry_dir):
+        """删除同一图片旧版本的缓存目录（图片被修改后调用）"""
+        prefix = entry_dir.name.split('_', 1)[0] + '_'
+        for sibling in self.cache_dir.glob(prefix + '*'):
+            if sibling != entry_dir and sibling.is_dir():
+                shutil.rmtree(sibling, ignore_errors=True)
+                log_debug(f"删除过期的立绘金字塔缓存: {sibling}")
+    
+    @staticmethod
+    def _level_name(level):
+        """级别对应的缓存文件名"""
+        return f"{int(round(level * 100)):03d}.png"
+    
+    def nearest_level(self, scale):
+        """获取不小于目标缩放比例的最近级别，保证始终是缩小操作
+        
+        Args:
+            scale: 目标缩放比例
+        
+        Returns:
+            float: 级别
+        """
+        for level in self.levels:
+            if level >= scale:
+                return level
+        return self.levels[-1]
+    
+    def source_size(self, image_path):
+        """获取原图尺寸（只读取文件头）
+        
+        Args:
+            image_path: 图片路径
+        
+        Returns:
+            QSize: 原图尺寸
+        """
+        signature = FileService.get_file_signature(image_path)
+        cached = self._source_sizes.get(image_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        size = QImageReader(image_path).size()
+        self._source_sizes[image_path] = (signature, size)
+        return size
+    
+    def load_level(self, image_path, level):
+        """加载指定级别的图像，缓存缺失时从原图生成并写入磁盘
+        
+        Args:
+            image_path: 图片路径
+            level: 级别
+        
+        Returns:
+            QImage: 图像，加载失败时返回None
+        """
+        try:
+            if level == 1.0:
+                image = QImage(image_path)
+                return None if image.isNull() else ResourceLoader.normalize_image(image)
+            
+            entry_dir = self._entry_dir(image_path)
+            if entry_dir is None:
+                return None
+            
+            level_path = entry_dir / self._level_name(level)
+            if level_path.exists():
+                image = QImage(str(level_path))
+                if not image.isNull():
+                    return ResourceLoader.normalize_image(image)
+            
+            # 缓存缺失，从原图生成该级别
+            source = QImage(image_path)
+            if source.isNull():
+                log_debug(f"加载图片失败: {image_path}")
+                return None
+            image = self._scale(ResourceLoader.normalize_image(source), level)
+            self._save(image, level_path)
+            return image
+        except Exception as e:
+            log_error(f"加载立绘金字塔级别失败: {image_path}, 错误: {str(e)}")
+            return None
+    
+    def load_for_scale(self, image_path, scale):
+        """加载最适合目标缩放比例的级别
+        
+        Args:
+            image_path: 图片路径
+            scale: 目标缩放比例
+        
+        Returns:
+            tuple: (QImage, 级别)，加载失败时图像为None
+        """
+        level = self.nearest_level(scale)
+        return self.load_level(image_path, level), level
+    
+    def build(self, image_path):
+        """为单张图片生成所有缺失的级别，原图只解码一次
+        
+        Args:
+            image_path: 图片路径
+        
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            entry_dir = self._entry_dir(image_path)
+            if entry_dir is None:
+                return False
+            
+            missing = [level for level in self.levels
+                       if level != 1.0 and not (entry_dir / self._level_name(level)).exists()]
+            if not missing:
+                return True
+            
+            source = QImage(image_path)
+            if source.isNull():
+                log_debug(f"加载图片失败: {image_path}")
+                return False
+            source = ResourceLoader.normalize_image(source)
+            for level in missing:
+                self._save(self._scale(source, level), entry_dir / self._level_name(level))
+            return True
+        except Exception as e:
+            log_error(f"生成立绘金字塔失败: {image_path}, 错误: {str(e)}")
+            return False
+    
+    def build_folder(self, folder_path, max_workers=None):
+        """在后台线程池中为整个文件夹生成金字塔
+        
+        Args:
+            folder_path: 立绘文件夹路径
+            max_workers: 最大工作线程数，默认为CPU核心数
+        
+        Returns:
+            list: 每张图片对应的Future列表
+        """
+        image_paths = [path for _, path in FileService.scan_directory(folder_path, IMAGE_EXTENSIONS)]
+        if not image_paths:
+            return []
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers or os.cpu_count() or 2,
+                thread_name_prefix="pyramid"
+            )
+        log_info(f"开始后台生成立绘金字塔: {len(image_paths)} 张")
+        futures = [self._executor.submit(self.build, path) for path in image_paths]
+        self._futures = [future for future in self._futures if not future.done()] + futures
+        return futures
+    
+    def shutdown(self):
+        """停止后台生成任务：取消尚未开始的任务，不等待正在执行的任务"""
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    @staticmethod
+    def _scale(source, level):
+        """平滑缩放到指定级别"""
+        return source.scaled(
+            max(1, int(source.width() * level)),
+            max(1, int(source.height() * level)),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        )
+    
+    def _save(self, image, level_path):
+        """原子地写入级别文件，避免并发生成时读到半写入的文件"""
+        if not level_path.parent.exists():
+            self._prune_versions(level_path.parent)
+            FileService.ensure_directory(str(level_path.parent))
+        temp_path = level_path.with_name(f"{level_path.stem}.{threading.get_ident()}.tmp.png")
+        if image.save(str(temp_path), "PNG"):
+            os.replace(temp_path, level_path)
+        else:
+            log_debug(f"写入立绘金字塔缓存失败: {level_path}")
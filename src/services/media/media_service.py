@@ -2,22 +2,87 @@
 
 负责音频和图像处理
 """
-from PyQt5.QtCore import QUrl
+import math
+from collections import OrderedDict
+from pathlib import Path
+from PyQt5.QtCore import QUrl, QSize, QRect
 from PyQt5.QtGui import QPixmap, QFont, QFontDatabase
-from PyQt5.QtMultimedia import QMediaContent
+from config.settings import resolve_data_dir
+from services.media.asset_analyzer import AssetAnalyzer
+from services.media.image_pyramid import ImagePyramid
 from utils.resource_utils import ResourceLoader
 from utils.helpers.logger import log_info
+from utils.helpers.perf_stats import EventCounter
 
 
 class MediaService:
     """媒体服务，负责加载和管理各种媒体资源"""
     
-    def __init__(self):
-        """初始化媒体服务"""
-        # 资源缓存
-        self.image_cache = {}
+    def __init__(self, config=None):
+        """初始化媒体服务
+        
+        Args:
+            config: 应用程序配置
+        """
+        self.config = config or {}
+        # 背景代理解码质量，相对画布分辨率的比例
+        performance_config = self.config.get("performance", {})
+        self.background_proxy_quality = performance_config.get("background_proxy_quality", 1.0)
+        
+        # 立绘金字塔磁盘缓存
+        cache_dir = Path(resolve_data_dir(self.config, "cache"))
+        self.portrait_pyramid = ImagePyramid(cache_dir / "portrait_pyramid", performance_config.get("portrait_pyramid_levels"))
+        # 资源分析器（立绘不透明包围盒）
+        self.asset_analyzer = AssetAnalyzer(cache_dir / "asset_bounds.txt")
+        self.trim_portraits = performance_config.get("trim_portraits", True)
+        
+        # 资源缓存；图片缓存（包括预取的素材）按最近使用顺序保存，总占用超出预算时丢弃最久未使用的图片
+        self.image_cache = OrderedDict()
+        self.image_cache_budget = max(0, performance_config.get("image_cache_mb", 512)) * 1024 * 1024
+        self.image_cache_bytes = 0
+        self._image_bytes = {}  # 缓存键 -> 图片占用的字节数
         self.audio_cache = {}
         self.font_cache = {}
+        # 加载统计：load_background/load_portrait的调用次数，以及其中未命中缓存需要解码的次数
+        self.load_stats = EventCounter()
+    
+    def _cached_image(self, cache_key):
+        """从图片缓存取出条目并标记为最近使用，不存在时返回None"""
+        entry = self.image_cache.get(cache_key)
+        if entry is not None:
+            self.image_cache.move_to_end(cache_key)
+        return entry
+    
+    def _store_image(self, cache_key, entry, pixmap):
+        """将条目存入图片缓存，总占用超出预算时丢弃最久未使用的条目（刚存入的条目总会保留）
+        
+        Args:
+            cache_key: 缓存键
+            entry: 缓存中的对象（QPixmap或(QPixmap, bounds)）
+            pixmap: 条目中的图片，用于计算占用的字节数
+        """
+        self.discard_image(cache_key)
+        size = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self.image_cache[cache_key] = entry
+        self._image_bytes[cache_key] = size
+        self.image_cache_bytes += size
+        while self.image_cache_bytes > self.image_cache_budget and len(self.image_cache) > 1:
+            oldest_key = next(iter(self.image_cache))
+            self.discard_image(oldest_key)
+    
+    def discard_image(self, cache_key, entry=None):
+        """从图片缓存中移除条目
+        
+        Args:
+            cache_key: 缓存键
+            entry: 只在缓存中的对象仍是entry时才移除，None表示无条件移除
+        """
+        if cache_key not in self.image_cache:
+            return
+        if entry is not None and self.image_cache[cache_key] is not entry:
+            return
+        del self.image_cache[cache_key]
+        self.image_cache_bytes -= self._image_bytes.pop(cache_key, 0)
     
     def load_image(self, image_path):
         """加载图片资源，使用缓存优化性能
@@ -33,18 +98,260 @@ class MediaService:
             return None
             
         # 检查缓存
-        if image_path in self.image_cache:
-            return self.image_cache[image_path]
+        cached = self._cached_image(image_path)
+        if cached is not None:
+            return cached
         
         # 使用 ResourceLoader 加载图片
         pixmap = ResourceLoader.load_image(image_path)
         
         # 存入缓存
         if pixmap:
-            self.image_cache[image_path] = pixmap
+            self._store_image(image_path, pixmap, pixmap)
+        
+        return pixmap
+    
+    def load_background(self, image_path, canvas_width, canvas_height):
+        """按画布分辨率加载背景代理图，使用缓存优化性能
+        
+        背景最终会被缩放到画布尺寸，因此只需解码到画布所需的分辨率。
+        原图仅在导出等需要全分辨率的场景通过load_image加载。
+        
+        Args:
+            image_path: 图像文件路径
+            canvas_width: 画布宽度
+            canvas_height: 画布高度
+            
+        Returns:
+            QPixmap: 图像对象，加载失败时返回None
+        """
+        # 空路径检查
+        if not image_path:
+            return None
+        self.load_stats.increment("background")
+        
+        # 代理质量无效时回退到原图解码
+        target_size = self._background_target_size(canvas_width, canvas_height)
+        if target_size is None:
+            return self.load_image(image_path)
+        
+        cache_key = self.background_cache_key(image_path, canvas_width, canvas_height)
+        
+        # 检查缓存
+        cached = self._cached_image(cache_key)
+        if cached is not None:
+            return cached
+        
+        # 使用 ResourceLoader 按目标分辨率解码
+        self.load_stats.increment("background_decode")
+        pixmap = ResourceLoader.load_image_scaled(image_path, target_size)
+        
+        # 存入缓存
+        if pixmap:
+            self._store_image(cache_key, pixmap, pixmap)
+        
+        return pixmap
+    
+    def _background_target_size(self, canvas_width, canvas_height):
+        """背景代理图的解码尺寸，代理质量无效时返回None（解码原图）"""
+        quality = self.background_proxy_quality
+        if not quality or quality <= 0:
+            return None
+        return QSize(
+            max(1, int(canvas_width * min(quality, 1.0))),
+            max(1, int(canvas_height * min(quality, 1.0)))
+        )
+    
+    def background_cache_key(self, image_path, canvas_width, canvas_height):
+        """获取背景在图片缓存中的键，与load_background使用的键一致
+        
+        Args:
+            image_path: 图像文件路径
+            canvas_width: 画布宽度
+            canvas_height: 画布高度
+        
+        Returns:
+            缓存键
+        """
+        target_size = self._background_target_size(canvas_width, canvas_height)
+        if target_size is None:
+            return image_path
+        return image_path, target_size.width(), target_size.height()
+    
+    def read_background_image(self, image_path, canvas_width, canvas_height):
+        """按画布分辨率解码背景（不缓存，只使用QImage）
+        
+        可以在工作线程中调用，解码尺寸与load_background一致。
+        
+        Args:
+            image_path: 图像文件路径
+            canvas_width: 画布宽度
+            canvas_height: 画布高度
+        
+        Returns:
+            QImage: 图像对象，加载失败时返回None
+        """
+        target_size = self._background_target_size(canvas_width, canvas_height)
+        return ResourceLoader.read_image_scaled(image_path, target_size or QSize())
+    
+    def portrait_cache_key(self, image_path, scale=1.0):
+        """获取立绘在图片缓存中的键，与load_portrait使用的键一致
+        
+        Args:
+            image_path: 立绘文件路径
+            scale: 目标缩放比例
+        
+        Returns:
+            tuple: 缓存键
+        """
+        return image_path, "pyramid", self.portrait_pyramid.nearest_level(scale)
+    
+    def cache_background_image(self, cache_key, image):
+        """将工作线程中解码好的背景存入缓存（需在界面线程中调用）
+        
+        Args:
+            cache_key: background_cache_key返回的键
+            image: read_background_image返回的图像
         
+        Returns:
+            QPixmap: 存入缓存的图像
+        """
+        pixmap = QPixmap.fromImage(image)
+        self._store_image(cache_key, pixmap, pixmap)
         return pixmap
     
+    def cache_portrait_image(self, cache_key, image, bounds):
+        """将工作线程中解码好的立绘存入缓存（需在界面线程中调用）
+        
+        Args:
+            cache_key: portrait_cache_key返回的键
+            image: load_portrait_image返回的图像
+            bounds: load_portrait_image返回的裁剪区域
+        
+        Returns:
+            QPixmap: 存入缓存的图像
+        """
+        pixmap = QPixmap.fromImage(image)
+        self._store_image(cache_key, (pixmap, bounds), pixmap)
+        return pixmap
+    
+    def load_portrait(self, image_path, scale=1.0):
+        """加载最适合目标缩放比例的立绘金字塔级别，使用缓存优化性能
+        
+        启用裁剪时返回的图片已裁掉四周的透明边距，bounds给出裁剪区域在原图中的位置。
+        
+        Args:
+            image_path: 立绘文件路径
+            scale: 目标缩放比例
+        
+        Returns:
+            tuple: (QPixmap, 级别, bounds)，bounds为原图像素坐标下的QRect，
+                加载失败时图像为None
+        """
+        # 空路径检查
+        if not image_path:
+            return None, 1.0, None
+        self.load_stats.increment("portrait")
+        
+        cache_key = self.portrait_cache_key(image_path, scale)
+        level = cache_key[2]
+        
+        # 检查缓存
+        cached = self._cached_image(cache_key)
+        if cached is not None:
+            pixmap, bounds = cached
+            return pixmap, level, bounds
+        
+        self.load_stats.increment("portrait_decode")
+        image, level, bounds = self.load_portrait_image(image_path, scale)
+        if image is None:
+            return None, level, None
+        
+        # 存入缓存
+        pixmap = self.cache_portrait_image(cache_key, image, bounds)
+        return pixmap, level, bounds
+    
+    def load_portrait_image(self, image_path, scale=1.0):
+        """加载最适合目标缩放比例的立绘金字塔级别（不缓存，只使用QImage）
+        
+        可以在工作线程或无界面的渲染进程中调用，裁剪规则与load_portrait一致。
+        
+        Args:
+            image_path: 立绘文件路径
+            scale: 目标缩放比例
+        
+        Returns:
+            tuple: (QImage, 级别, bounds)，加载失败时图像为None
+        """
+        image, level = self.portrait_pyramid.load_for_scale(image_path, scale)
+        if image is None:
+            return None, level, None
+
+        bounds = self._trim_bounds(image_path, image, level)
+        if bounds is not None:
+            level_bounds = self._level_rect(bounds, level).intersected(image.rect())
+            image = image.copy(level_bounds)
+        else:
+            bounds = QRect(0, 0, round(image.width() / level), round(image.height() / level))
+        return image, level, bounds
+    
+    def _trim_bounds(self, image_path, image, level):
+        """获取立绘的不透明包围盒，未启用裁剪或无需裁剪时返回None
+        
+        Args:
+            image_path: 立绘文件路径
+            image: 已加载的级别图像
+            level: 级别
+        
+        Returns:
+            QRect: 原图像素坐标下的包围盒
+        """
+        if not self.trim_portraits:
+            return None
+        # 级别1.0即原图，直接用于分析，避免重复解码
+        bounds = self.asset_analyzer.opaque_bounds(image_path, image if level == 1.0 else None)
+        if bounds is None or bounds.isEmpty():
+            return None
+        source_size = self.portrait_pyramid.source_size(image_path)
+        if bounds.size() == source_size:
+            return None
+        return bounds
+    
+    @staticmethod
+    def _level_rect(bounds, level):
+        """将原图坐标下的矩形换算到级别图像坐标，向外取整保证不丢失像素"""
+        left = math.floor(bounds.x() * level)
+        top = math.floor(bounds.y() * level)
+        right = math.ceil((bounds.x() + bounds.width()) * level)
+        bottom = math.ceil((bounds.y() + bounds.height()) * level)
+        return QRect(left, top, right - left, bottom - top)
+    
+    def get_portrait_size(self, image_path, scale=1.0):
+        """获取立绘按缩放比例缩放后的目标尺寸（基于原图尺寸计算）
+        
+        Args:
+            image_path: 立绘文件路径
+            scale: 缩放比例
+            
+        Returns:
+            tuple: (宽度, 高度)，无法读取时返回None
+        """
+        source_size = self.portrait_pyramid.source_size(image_path)
+        if not source_size.isValid():
+            return None
+        return int(source_size.width() * scale), int(source_size.height() * scale)
+    
+    def prebuild_portrait_pyramids(self, portrait_dir):
+        """在后台批量生成立绘文件夹的金字塔缓存
+        
+        Args:
+            portrait_dir: 立绘文件夹路径
+            
+        Returns:
+            list: 后台任务的Future列表
+        """
+        return self.portrait_pyramid.build_folder(portrait_dir)
+    
     def load_audio(self, audio_path):
         """加载音频资源，使用缓存优化性能
         
@@ -127,6 +434,8 @@ class MediaService:
         """
         if cache_type == 'image' or cache_type is None:
             self.image_cache.clear()
+            self._image_bytes.clear()
+            self.image_cache_bytes = 0
         if cache_type == 'audio' or cache_type is None:
             self.audio_cache.clear()
         if cache_type == 'font' or cache_type is None:
@@ -0,0 +1,9 @@
+"""项目服务包
+
+包含作用于整个项目的批量操作
+"""
+from .asset_refactor import AssetRefactor, RefactorPlan
+from .batch_edit import BatchEditor, BatchEditPlan, SceneSelector, SceneUpdate
+from .project_validator import ProjectValidator
+
+__all__ = ['AssetRefactor', 'RefactorPlan', 'BatchEditor', 'BatchEditPlan', 'SceneSelector', 'SceneUpdate', 'ProjectValidator']
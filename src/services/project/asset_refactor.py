@@ -0,0 +1,346 @@
+"""素材重构
+
+重命名或移动素材文件（或整个目录），并改写所有引用这些素材的场景，支持试运行和按日志撤销
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from models.scene.asset_reference_index import scene_asset_fields
+from services.file.file_service import FileService
+from utils.helpers.logger import log_error, log_info, log_warning
+
+
+def set_scene_field(scene, field, value):
+    """按字段位置设置场景中的值
+    
+    Args:
+        scene: 场景字典
+        field: 字段位置，如("portraits", 0, "path")
+        value: 新的值
+    """
+    target = scene
+    for key in field[:-1]:
+        target = target[key]
+    target[field[-1]] = value
+
+
+class RefactorPlan:
+    """素材重构计划，由AssetRefactor.plan生成，试运行时只生成计划不执行
+    
+    Attributes:
+        moves: 文件移动列表 [(源路径, 目标路径)]
+        rewrites: 场景改写列表 [(场景索引, 字段位置, 原路径, 新路径)]
+        errors: 无法执行的原因
+        directory: 移动整个目录时为(源目录, 目标目录)，否则为None
+    """
+    
+    def __init__(self):
+        self.moves = []
+        self.rewrites = []
+        self.errors = []
+        self.directory = None
+    
+    @property
+    def ok(self):
+        """计划是否可以执行"""
+        return bool(self.moves) and not self.errors
+    
+    @property
+    def scene_indexes(self):
+        """需要改写的场景索引（升序）"""
+        return sorted({rewrite[0] for rewrite in self.rewrites})
+    
+    def summary(self):
+        """计划的简要说明"""
+        text = f"移动 {len(self.moves)} 个文件，改写 {len(self.scene_indexes)} 个场景中的 {len(self.rewrites)} 处引用"
+        if self.errors:
+            text += "\n" + "\n".join(self.errors)
+        return text
+
+
+class AssetRefactor:
+    """项目范围的素材重命名和移动
+    
+    - plan：通过素材引用索引找到引用每个文件的场景，生成文件移动和场景改写计划，不修改任何内容（试运行）
+    - apply：先写入撤销日志，再通过FileService逐个移动文件，然后在内存中改写场景并只保存一次项目；
+      任何一步失败时已移动的文件会被移回，场景恢复原值
+    - rollback：按撤销日志把文件移回原处并恢复场景中的路径（同样只保存一次），
+      也可以用于恢复执行中途被中断的操作
+    
+    场景中原为相对路径的引用改写后仍为相对于项目目录的路径。撤销日志保存在项目文件旁边（<项目文件>.refactor.json），
+    只保留最近一次操作。
+    """
+    
+    JOURNAL_VERSION = 1
+    
+    def __init__(self, scene_model, reference_index):
+        """初始化素材重构
+        
+        Args:
+            scene_model: 场景模型（提供场景列表和保存）
+            reference_index: 素材引用索引（AssetReferenceIndex），需与场景列表一致
+        """
+        self.scene_model = scene_model
+        self.reference_index = reference_index
+    
+    @property
+    def scenes(self):
+        """当前项目的场景列表"""
+        return self.scene_model.scene_data.get("scenes", [])
+    
+    @staticmethod
+    def journal_path_for(project_file):
+        """项目对应的撤销日志路径
+        
+        Args:
+            project_file: 项目文件路径
+        
+        Returns:
+            Path: 撤销日志路径，如 story.json -> story.json.refactor.json
+        """
+        project_path = Path(project_file)
+        return project_path.with_name(project_path.name + ".refactor.json")
+    
+    def plan(self, source, destination):
+        """生成重命名或移动计划（试运行）
+        
+        Args:
+            source: 源文件或目录
+            destination: 目标文件或目录（不能已存在）
+        
+        Returns:
+            RefactorPlan: 重构计划
+        """
+        plan = RefactorPlan()
+        source = Path(source)
+        destination = Path(destination)
+        if not source.exists():
+            plan.errors.append(f"源路径不存在: {source}")
+            return plan
+        if destination.exists():
+            plan.errors.append(f"目标路径已存在: {destination}")
+            return plan
+        
+        if source.is_dir():
+            resolved_source = source.resolve()
+            resolved_destination = destination.resolve()
+            if resolved_destination == resolved_source or resolved_source in resolved_destination.parents:
+                plan.errors.append(f"不能将目录移动到其自身内部: {destination}")
+                return plan
+            plan.directory = (str(source), str(destination))
+            plan.moves = [
+                (str(file_path), str(destination / file_path.relative_to(source)))
+                for file_path in sorted(source.rglob("*")) if file_path.is_file()
+            ]
+        else:
+            plan.moves = [(str(source), str(destination))]
+        
+        index = self.reference_index
+        scenes = self.scenes
+        for old_path, new_path in plan.moves:
+            old_key = index.key(old_path)
+            for scene_index in index.where_used(old_path):
+                if scene_index >= len(scenes):
+                    continue
+                for _, field, value in scene_asset_fields(scenes[scene_index]):
+                    if index.key(value) == old_key:
+                        plan.rewrites.append((scene_index, field, value, self._rewritten_path(value, new_path)))
+        return plan
+    
+    def _rewritten_path(self, old_value, new_path):
+        """改写后的路径，保持原路径的相对或绝对形式"""
+        base_dir = self.reference_index.base_dir
+        if base_dir and not os.path.isabs(old_value):
+            try:
+                return Path(os.path.relpath(new_path, base_dir)).as_posix()
+            except ValueError:
+                # 不在同一驱动器上，无法表示为相对路径
+                pass
+        return os.path.abspath(new_path)
+    
+    def apply(self, plan, dry_run=False):
+        """执行重构计划
+        
+        Args:
+            plan: plan返回的重构计划
+            dry_run: 只输出计划，不移动文件也不修改场景
+        
+        Returns:
+            bool: 是否成功（试运行时返回计划能否执行）
+        """
+        if not plan.ok:
+            log_warning(f"素材重构计划无法执行: {plan.summary()}")
+            return False
+        if dry_run:
+            log_info(f"素材重构试运行: {plan.summary()}")
+            return True
+        if not self.scene_model.current_file:
+            log_warning("没有打开的项目，无法执行素材重构")
+            return False
+        
+        journal_path = self.journal_path_for(self.scene_model.current_file)
+        journal = {
+            "version": self.JOURNAL_VERSION,
+            "project": str(Path(self.scene_model.current_file).resolve()),
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "state": "pending",
+            "directory": plan.directory,
+            "moves": plan.moves,
+            "rewrites": [list(rewrite) for rewrite in plan.rewrites]
+        }
+        # 先写入撤销日志，执行中途被中断时也可以撤销
+        if not self._write_journal(journal_path, journal):
+            return False
+        
+        moved = []
+        for old_path, new_path in plan.moves:
+            if not FileService.move_file(old_path, new_path):
+                log_error(f"移动文件失败，撤销已移动的 {len(moved)} 个文件")
+                self._move_back(moved, plan.directory)
+                journal["state"] = "failed"
+                self._write_journal(journal_path, journal)
+                return False
+            moved.append((old_path, new_path))
+        
+        self._rewrite_scenes([(scene_index, field, new_value)
+                              for scene_index, field, _, new_value in plan.rewrites])
+        if not self.scene_model.save_to_file():
+            log_error("保存项目失败，撤销素材重构")
+            self._rewrite_scenes([(scene_index, field, old_value)
+                                  for scene_index, field, old_value, _ in plan.rewrites])
+            self._move_back(moved, plan.directory)
+            journal["state"] = "failed"
+            self._write_journal(journal_path, journal)
+            return False
+        
+        if plan.directory:
+            self._remove_empty_directories(plan.directory[0])
+        journal["state"] = "applied"
+        self._write_journal(journal_path, journal)
+        log_info(f"素材重构完成: {plan.summary()}")
+        return True
+    
+    def can_rollback(self):
+        """当前项目是否有可撤销的素材重构
+        
+        Returns:
+            bool: 撤销日志存在且未被撤销
+        """
+        journal = self._read_journal()
+        return journal is not None and journal.get("state") in ("pending", "applied")
+    
+    def rollback(self):
+        """按撤销日志撤销最近一次素材重构
+        
+        文件只在新位置存在、原位置不存在时才移回；场景中的路径只在仍为改写后的值时才恢复。
+        
+        Returns:
+            RefactorPlan: 实际执行的反向操作（moves为移回的文件），没有可撤销的操作或失败时返回None
+        """
+        journal = self._read_journal()
+        if journal is None or journal.get("state") not in ("pending", "applied"):
+            log_warning("没有可撤销的素材重构")
+            return None
+        
+        undo = RefactorPlan()
+        for old_path, new_path in reversed(journal.get("moves", [])):
+            if os.path.exists(new_path) and not os.path.exists(old_path):
+                if FileService.move_file(new_path, old_path):
+                    undo.moves.append((new_path, old_path))
+                else:
+                    undo.errors.append(f"无法移回: {new_path}")
+        directory = journal.get("directory")
+        if directory:
+            undo.directory = (directory[1], directory[0])
+            self._remove_empty_directories(directory[1])
+        
+        scenes = self.scenes
+        for scene_index, field, old_value, new_value in journal.get("rewrites", []):
+            field = tuple(field)
+            if scene_index < len(scenes) and self._get_field(scenes[scene_index], field) == new_value:
+                undo.rewrites.append((scene_index, field, new_value, old_value))
+        self._rewrite_scenes([(scene_index, field, old_value)
+                              for scene_index, field, _, old_value in undo.rewrites])
+        if undo.rewrites and not self.scene_model.save_to_file():
+            log_error("撤销素材重构时保存项目失败")
+            return None
+        
+        journal["state"] = "rolled_back"
+        self._write_journal(self.journal_path_for(self.scene_model.current_file), journal)
+        log_info(f"已撤销素材重构: 移回 {len(undo.moves)} 个文件，恢复 {len(undo.rewrites)} 处引用")
+        for error in undo.errors:
+            log_warning(error)
+        return undo
+    
+    def _rewrite_scenes(self, changes):
+        """改写场景字段并更新素材引用索引
+        
+        Args:
+            changes: [(场景索引, 字段位置, 新的值)]
+        """
+        scenes = self.scenes
+        for scene_index, field, value in changes:
+            set_scene_field(scenes[scene_index], tuple(field), value)
+        for scene_index in {change[0] for change in changes}:
+            self.reference_index.update_scene(scene_index, scenes[scene_index])
+    
+    @staticmethod
+    def _get_field(scene, field):
+        """按字段位置读取场景中的值，字段不存在时返回None"""
+        target = scene
+        try:
+            for key in field:
+                target = target[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return target
+    
+    @classmethod
+    def _move_back(cls, moved, directory=None):
+        """把已移动的文件移回原处，并删除移动目录时创建的空目录"""
+        for old_path, new_path in reversed(moved):
+            if not FileService.move_file(new_path, old_path):
+                log_error(f"无法移回文件: {new_path} -> {old_path}")
+        if directory:
+            cls._remove_empty_directories(directory[1])
+    
+    @staticmethod
+    def _remove_empty_directories(root):
+        """删除目录树中的空目录（移动整个目录后留下的源目录），仍有文件的目录保留"""
+        root = Path(root)
+        if not root.is_dir():
+            return
+        for directory in sorted((path for path in root.rglob("*") if path.is_dir()), reverse=True) + [root]:
+            try:
+                directory.rmdir()
+            except OSError:
+                # 目录不为空
+                pass
+    
+    def _read_journal(self):
+        """读取当前项目的撤销日志，不存在或不属于当前项目时返回None"""
+        if not self.scene_model.current_file:
+            return None
+        journal_path = self.journal_path_for(self.scene_model.current_file)
+        if not journal_path.exists():
+            return None
+        journal = FileService.load_json(str(journal_path))
+        if not journal or journal.get("version") != self.JOURNAL_VERSION:
+            return None
+        if journal.get("project") != str(Path(self.scene_model.current_file).resolve()):
+            return None
+        return journal
+    
+    @staticmethod
+    def _write_journal(journal_path, journal):
+        """写入撤销日志（先写临时文件再替换）"""
+        temp_path = Path(journal_path).with_name(Path(journal_path).name + ".tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(journal, f, ensure_ascii=False)
+            os.replace(temp_path, journal_path)
+            return True
+        except Exception as e:
+            log_error(f"写入素材重构日志失败: {str(e)}")
+            return False
@@ -0,0 +1,365 @@
+"""批量编辑场景
+
+按声明式的条件选择场景并批量修改字段（如替换整章的BGM、统一一条线路的字号），所有修改作为一个事务只保存一次项目
+"""
+from pathlib import Path
+from models.scene.asset_reference_index import AssetReferenceIndex, scene_asset_fields
+from models.scene.scene_search_index import SceneSearchIndex
+from utils.helpers.logger import log_error, log_info, log_warning
+
+
+# 字段原本不存在的标记（撤销时删除该字段）
+MISSING = object()
+
+
+def parse_field(text):
+    """解析点分隔的字段名
+    
+    Args:
+        text: 字段名，如"audio.bgm"、"font.size"、"portraits.0.scale"
+    
+    Returns:
+        tuple: 字段位置，数字部分为列表下标
+    """
+    return tuple(int(part) if part.isdigit() else part for part in text.split("."))
+
+
+def format_field(field):
+    """字段位置的点分隔形式（parse_field的逆操作）"""
+    return ".".join(str(key) for key in field)
+
+
+def get_scene_field(scene, field, default=None):
+    """按字段位置读取场景中的值
+    
+    Args:
+        scene: 场景字典
+        field: 字段位置
+        default: 字段不存在时的返回值
+    
+    Returns:
+        字段的值
+    """
+    target = scene
+    try:
+        for key in field:
+            target = target[key]
+    except (KeyError, IndexError, TypeError):
+        return default
+    return target
+
+
+def _can_set(scene, field):
+    """字段能否被设置：中间缺失（或为None）的字典可以创建，列表下标必须已存在"""
+    target = scene
+    for position, key in enumerate(field[:-1]):
+        if isinstance(key, int):
+            if not isinstance(target, list) or not 0 <= key < len(target):
+                return False
+            target = target[key]
+        elif isinstance(target, dict):
+            target = target.get(key)
+            if target is None:
+                # 之后的位置都会新建字典，不能再有列表下标
+                return not any(isinstance(rest, int) for rest in field[position + 1:])
+        else:
+            return False
+    key = field[-1]
+    if isinstance(key, int):
+        return isinstance(target, list) and 0 <= key < len(target)
+    return isinstance(target, dict)
+
+
+def _set_field(scene, field, value):
+    """设置字段，中间缺失或为None的字典自动创建；value为MISSING时删除该字段
+    
+    Returns:
+        tuple: (新建的最外层字典的字段位置, 该位置的原值)，撤销时恢复该位置的原值即可（原本不存在时为MISSING）；
+            没有新建字典时返回None
+    """
+    target = scene
+    created = None
+    for position, key in enumerate(field[:-1]):
+        if isinstance(target, dict) and target.get(key) is None:
+            if created is None:
+                created = (field[:position + 1], target.get(key, MISSING))
+            target[key] = {}
+        target = target[key]
+    if value is MISSING:
+        target.pop(field[-1], None)
+    else:
+        target[field[-1]] = value
+    return created
+
+
+class SceneSelector:
+    """场景选择条件，各条件之间为"与"关系，未指定的条件不参与筛选（没有任何条件时选中全部场景）
+    
+    Attributes:
+        character: 角色名（完全一致）
+        asset: 场景引用的素材路径（任意素材字段）
+        scene_range: (起始索引, 结束索引)，不含结束索引
+        text: 关键字，匹配规则与场景导航面板的搜索相同（台词或角色名包含全部词元）
+    """
+    
+    def __init__(self, character=None, asset=None, scene_range=None, text=None):
+        self.character = character or None
+        self.asset = asset or None
+        self.scene_range = tuple(scene_range) if scene_range is not None else None
+        self.text = text or None
+    
+    def describe(self):
+        """条件的简要说明"""
+        parts = []
+        if self.scene_range is not None:
+            parts.append(f"第 {self.scene_range[0] + 1}-{self.scene_range[1]} 个场景")
+        if self.character:
+            parts.append(f"角色为“{self.character}”")
+        if self.asset:
+            parts.append(f"引用 {self.asset}")
+        if self.text:
+            parts.append(f"包含“{self.text}”")
+        return "，".join(parts) or "全部场景"
+
+
+class SceneUpdate:
+    """批量修改操作
+    
+    Attributes:
+        values: 字段位置 -> 新的值，如{("audio", "bgm"): 路径, ("font", "size"): 28}
+        replace_assets: 旧素材路径 -> 新素材路径，只改写选中场景中引用旧素材的字段
+    """
+    
+    def __init__(self, values=None, replace_assets=None):
+        self.values = {tuple(field): value for field, value in (values or {}).items()}
+        self.replace_assets = dict(replace_assets or {})
+    
+    @property
+    def empty(self):
+        """是否没有任何修改"""
+        return not self.values and not self.replace_assets
+
+
+class BatchEditPlan:
+    """批量编辑计划，由BatchEditor.plan生成，预览时只生成计划不修改场景
+    
+    Attributes:
+        selected: 选中的场景索引（升序）
+        changes: 字段修改列表 [(场景索引, 字段位置, 原值, 新值)]，字段原本不存在时原值为MISSING
+        skipped: 字段位置 -> 因字段位置不存在（如立绘下标超出范围）而跳过的场景数
+        errors: 无法执行的原因
+    """
+    
+    def __init__(self, selected=None):
+        self.selected = selected or []
+        self.changes = []
+        self.skipped = {}
+        self.errors = []
+    
+    @property
+    def ok(self):
+        """计划是否可以执行"""
+        return bool(self.changes) and not self.errors
+    
+    @property
+    def scene_indexes(self):
+        """会被修改的场景索引（升序）"""
+        return sorted({change[0] for change in self.changes})
+    
+    def summary(self):
+        """计划的简要说明（预览时显示）"""
+        text = f"选中 {len(self.selected)} 个场景，将修改其中 {len(self.scene_indexes)} 个场景的 {len(self.changes)} 处字段"
+        for field, count in self.skipped.items():
+            text += f"\n{count} 个场景没有字段 {format_field(field)}，已跳过"
+        if self.errors:
+            text += "\n" + "\n".join(self.errors)
+        return text
+
+
+class BatchEditor:
+    """场景批量编辑
+    
+    选择场景时优先使用索引缩小范围，只对候选场景逐个核对：
+    - 素材：素材引用索引（AssetReferenceIndex.where_used）
+    - 关键字：场景全文索引（SceneSearchIndex.search）
+    - 角色名：场景全文索引中的角色名倒排表（SceneSearchIndex.name_candidates），再核对是否完全一致
+    - 范围：直接截取索引区间
+    未提供的素材引用索引和全文索引在第一次需要时用当前场景列表临时建立（只按角色名选择时不建立全文索引）。
+    
+    apply在内存中修改全部场景后只保存一次项目，保存失败时恢复所有字段的原值。
+    """
+    
+    def __init__(self, scene_model, reference_index=None, search_index=None):
+        """初始化批量编辑
+        
+        Args:
+            scene_model: 场景模型（提供场景列表和保存）
+            reference_index: 素材引用索引，需与场景列表一致；修改后会随之更新
+            search_index: 场景全文索引，需与场景列表一致（不会被更新，由调用方在修改后更新）
+        """
+        self.scene_model = scene_model
+        self.reference_index = reference_index
+        self.search_index = search_index
+    
+    @property
+    def scenes(self):
+        """当前项目的场景列表"""
+        return self.scene_model.scene_data.get("scenes", [])
+    
+    def _references(self):
+        """素材引用索引，未提供时临时建立"""
+        if self.reference_index is None:
+            base_dir = Path(self.scene_model.current_file).resolve().parent if self.scene_model.current_file else None
+            self.reference_index = AssetReferenceIndex()
+            self.reference_index.build(self.scenes, base_dir)
+        return self.reference_index
+    
+    def _search(self):
+        """场景全文索引，未提供时临时建立"""
+        if self.search_index is None:
+            self.search_index = SceneSearchIndex()
+            self.search_index.build(self.scenes)
+        return self.search_index
+    
+    def select(self, selector):
+        """选择符合条件的场景
+        
+        Args:
+            selector: 场景选择条件（SceneSelector）
+        
+        Returns:
+            list: 场景索引列表（升序）
+        """
+        scenes = self.scenes
+        start, stop = 0, len(scenes)
+        if selector.scene_range is not None:
+            start = max(start, selector.scene_range[0])
+            stop = min(stop, selector.scene_range[1])
+            if start >= stop:
+                return []
+        
+        candidates = None  # None表示范围内的全部场景
+        lookups = []
+        if selector.asset:
+            lookups.append(lambda: self._references().where_used(selector.asset))
+        if selector.text:
+            lookups.append(lambda: [scene_index for scene_index, _ in self._search().search(selector.text)])
+        if selector.character and self.search_index is not None:
+            # 没有现成的全文索引时直接比较角色名，比临时建立索引快
+            lookups.append(lambda: self.search_index.name_candidates(selector.character))
+        for lookup in lookups:
+            found = lookup()
+            if found is None:
+                continue
+            candidates = set(found) if candidates is None else candidates.intersection(found)
+            if not candidates:
+                return []
+        
+        if candidates is None:
+            candidates = range(start, stop)
+        else:
+            candidates = sorted(scene_index for scene_index in candidates if start <= scene_index < stop)
+        if selector.character:
+            return [scene_index for scene_index in candidates
+                    if scenes[scene_index].get("character_name", "") == selector.character]
+        return list(candidates)
+    
+    def plan(self, selector, update):
+        """生成批量编辑计划（预览），不修改场景
+        
+        Args:
+            selector: 场景选择条件（SceneSelector）
+            update: 修改操作（SceneUpdate）
+        
+        Returns:
+            BatchEditPlan: 批量编辑计划
+        """
+        if update.empty:
+            plan = BatchEditPlan()
+            plan.errors.append("没有指定要修改的内容")
+            return plan
+        
+        plan = BatchEditPlan(self.select(selector))
+        scenes = self.scenes
+        values = list(update.values.items())
+        replacements = {}
+        if update.replace_assets:
+            references = self._references()
+            replacements = {references.key(old): new for old, new in update.replace_assets.items()}
+        
+        for scene_index in plan.selected:
+            scene = scenes[scene_index]
+            for field, value in values:
+                old_value = get_scene_field(scene, field, MISSING)
+                if old_value == value:
+                    continue
+                if old_value is MISSING and not _can_set(scene, field):
+                    plan.skipped[field] = plan.skipped.get(field, 0) + 1
+                    continue
+                plan.changes.append((scene_index, field, old_value, value))
+            if replacements:
+                for _, field, path in scene_asset_fields(scene):
+                    new_path = replacements.get(references.key(path))
+                    if new_path is not None and new_path != path and field not in update.values:
+                        plan.changes.append((scene_index, field, path, new_path))
+        return plan
+    
+    def apply(self, plan):
+        """执行批量编辑计划：修改全部场景后只保存一次项目
+        
+        Args:
+            plan: plan返回的批量编辑计划
+        
+        Returns:
+            bool: 是否成功（失败时场景保持原状）
+        """
+        if not plan.ok:
+            log_warning(f"批量编辑计划无法执行: {plan.summary()}")
+            return False
+        if not self.scene_model.current_file:
+            log_warning("没有打开的项目，无法批量编辑")
+            return False
+        
+        try:
+            undo = self._write_changes([(scene_index, field, new_value, old_value)
+                                        for scene_index, field, old_value, new_value in plan.changes])
+        except Exception as e:
+            log_error(f"批量编辑失败，已撤销: {str(e)}")
+            return False
+        if not self.scene_model.save_to_file():
+            log_error("保存项目失败，撤销批量编辑")
+            self._write_changes(reversed(undo))
+            return False
+        log_info(f"批量编辑完成: {plan.summary()}")
+        return True
+    
+    def _write_changes(self, changes):
+        """改写场景字段并更新素材引用索引
+        
+        Args:
+            changes: [(场景索引, 字段位置, 新的值, 原值)]
+        
+        Returns:
+            list: 按相反顺序执行即可恢复原状的修改列表
+        
+        Raises:
+            Exception: 改写某个字段失败时先恢复已改写的字段再抛出
+        """
+        scenes = self.scenes
+        undo = []
+        try:
+            for scene_index, field, value, old_value in changes:
+                created = _set_field(scenes[scene_index], field, value)
+                if created is None:
+                    undo.append((scene_index, field, old_value, value))
+                else:
+                    created_field, created_old_value = created
+                    undo.append((scene_index, created_field, created_old_value, value))
+        except Exception:
+            for scene_index, field, old_value, _ in reversed(undo):
+                _set_field(scenes[scene_index], field, old_value)
+            raise
+        if self.reference_index is not None:
+            for scene_index in sorted({change[0] for change in undo}):
+                self.reference_index.update_scene(scene_index, scenes[scene_index])
+        return undo
@@ -0,0 +1,146 @@
+"""项目检查服务
+
+打开项目时在后台完整检查一次，之后随场景保存、批量编辑和资源文件变化只重新检查受影响的场景
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from models.scene.scene_validator import SceneValidator
+from utils.helpers.logger import log_error, log_info
+
+
+class ProjectValidator(QObject):
+    """当前项目的检查结果管理器
+    
+    打开项目时在工作线程中检查全部场景，完成后回到界面线程接管结果，
+    再补上这期间保存过的场景和变化过的文件。结果就绪前validator为None。
+    """
+    
+    # 工作线程完成后通知界面线程 (项目文件, 检查结果, 快照中的场景数)
+    _loaded = pyqtSignal(object, object, int)
+    # 检查结果就绪或发生变化 (问题总数)
+    issues_changed = pyqtSignal(int)
+    
+    def __init__(self, config=None, parent=None):
+        """初始化项目检查管理器
+        
+        Args:
+            config: 应用程序配置
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.config = config or {}
+        validation_config = self.config.get("validation", {})
+        self.enabled = validation_config.get("enabled", True)
+        self.scale_range = tuple(validation_config.get("scale_range", (0.5, 1.5)))
+        self.font_size_range = tuple(validation_config.get("font_size_range", (8, 36)))
+        
+        self.project_file = None
+        self.validator = None
+        self.scenes = []
+        self.pending = set()  # 检查期间保存过的场景索引
+        self.pending_files = set()  # 检查期间变化过的文件
+        self.executor = None
+        self.future = None  # 后台任务，打开另一个项目或退出时取消尚未开始的任务
+        self._loaded.connect(self._on_loaded, Qt.QueuedConnection)
+    
+    def open_project(self, project_file, scenes):
+        """切换到指定项目，在后台检查全部场景
+        
+        Args:
+            project_file: 项目文件路径
+            scenes: 项目的场景列表（之后的修改通过update_scene通知）
+        """
+        if not self.enabled or not project_file:
+            return
+        self.project_file = project_file
+        self.validator = None
+        self.scenes = scenes
+        self.pending = set()
+        self.pending_files = set()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-validate")
+        if self.future is not None:
+            self.future.cancel()
+        # 工作线程只读取场景列表的快照
+        self.future = self.executor.submit(self._load, project_file, list(scenes))
+    
+    def _load(self, project_file, scenes):
+        """在工作线程中检查全部场景"""
+        validator = SceneValidator(Path(project_file).resolve().parent, self.scale_range, self.font_size_range)
+        try:
+            start_time = time.perf_counter()
+            validator.build(scenes)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            log_info(f"项目检查完成: {len(scenes)} 个场景, {validator.scene_count} 个场景存在问题, 耗时 {elapsed:.0f} 毫秒")
+        except Exception as e:
+            log_error(f"检查项目失败: {str(e)}")
+            validator = None
+        self._loaded.emit(project_file, validator, len(scenes))
+    
+    def _on_loaded(self, project_file, validator, snapshot_count):
+        """界面线程中接管检查结果，补上检查期间保存和新增的场景以及变化过的文件"""
+        if validator is None or project_file != self.project_file:
+            return
+        for path in self.pending_files:
+            validator.file_changed(path)
+        for scene_index in sorted(self.pending | set(range(snapshot_count, len(self.scenes)))):
+            if scene_index < len(self.scenes):
+                validator.update_scene(scene_index, self.scenes[scene_index])
+        self.pending = set()
+        self.pending_files = set()
+        self.validator = validator
+        self.issues_changed.emit(validator.issue_count)
+    
+    def update_scenes(self, scene_indexes):
+        """场景保存或批量修改后重新检查这些场景（结果未就绪时由就绪后的补查完成）
+        
+        Args:
+            scene_indexes: 场景索引列表
+        """
+        if self.validator is None:
+            if self.project_file:
+                self.pending.update(scene_indexes)
+            return
+        changed = False
+        for scene_index in scene_indexes:
+            if scene_index < len(self.scenes) and self.validator.update_scene(scene_index, self.scenes[scene_index]):
+                changed = True
+        if changed:
+            self.issues_changed.emit(self.validator.issue_count)
+    
+    def update_scene(self, scene_index):
+        """场景保存后重新检查该场景
+        
+        Args:
+            scene_index: 场景索引
+        """
+        self.update_scenes((scene_index,))
+    
+    def file_changed(self, path):
+        """资源文件被添加、删除或移动后重新检查引用它的场景
+        
+        Args:
+            path: 文件路径
+        """
+        if self.validator is None:
+            if self.project_file:
+                self.pending_files.add(path)
+            return
+        if self.validator.file_changed(path):
+            self.issues_changed.emit(self.validator.issue_count)
+    
+    def recheck_files(self):
+        """重新读取所有被引用的文件（文件可能在程序外被修改或删除）"""
+        if self.validator is not None and self.validator.recheck_files():
+            self.issues_changed.emit(self.validator.issue_count)
+    
+    def shutdown(self):
+        """关闭线程池"""
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
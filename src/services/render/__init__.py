@@ -0,0 +1,17 @@
+"""渲染服务包
+
+包含预览与离屏渲染共用的场景合成规则、离屏场景渲染器、分镜表导出和缩略图缓存
+"""
+from .scene_compositor import (
+    CANVAS_WIDTH, CANVAS_HEIGHT, background_rect, resolve_portrait_position,
+    clamp_portrait_position, portrait_layout
+)
+from .scene_renderer import SceneRenderer
+from .contact_sheet import ContactSheetExporter
+from .thumbnail_cache import ThumbnailCache, ThumbnailFiller
+
+__all__ = [
+    'CANVAS_WIDTH', 'CANVAS_HEIGHT', 'background_rect', 'resolve_portrait_position',
+    'clamp_portrait_position', 'portrait_layout', 'SceneRenderer', 'ContactSheetExporter',
+    'ThumbnailCache', 'ThumbnailFiller'
+]
@@ -0,0 +1,224 @@
+"""分镜表导出
+
+将项目中所有场景的缩略图按网格排版成多页分镜表，并附上角色名和台词摘要
+"""
+import os
+from concurrent.futures import as_completed
+from pathlib import Path
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QPainter, QColor, QFont, QFontMetrics
+from services.file.file_service import FileService
+from services.render.render_pool import create_render_pool, chunk_tasks, render_thumbnails, image_from_bytes
+from services.render.scene_compositor import CANVAS_WIDTH, CANVAS_HEIGHT
+from utils.helpers.string_utils import truncate
+from utils.helpers.logger import log_error, log_info
+
+
+class ContactSheetExporter:
+    """分镜表导出器
+    
+    逐页流式导出：每一页的缩略图在进程池中并行渲染，排版保存后立即释放，
+    任何时候内存中最多只有一页的缩略图，与项目的场景总数无关。
+    """
+    
+    def __init__(self, config=None):
+        """初始化分镜表导出器
+        
+        Args:
+            config: 应用程序配置
+        """
+        self.config = config or {}
+        sheet_config = self.config.get("contact_sheet", {})
+        self.columns = max(1, sheet_config.get("columns", 5))
+        self.rows = max(1, sheet_config.get("rows", 6))
+        self.thumbnail_width = max(16, sheet_config.get("thumbnail_width", 256))
+        self.thumbnail_height = max(9, round(self.thumbnail_width * CANVAS_HEIGHT / CANVAS_WIDTH))
+        self.caption_length = sheet_config.get("caption_length", 30)
+        self.margin = sheet_config.get("margin", 24)
+        self.spacing = sheet_config.get("spacing", 16)
+        
+        self.caption_font = QFont()
+        self.caption_font.setPixelSize(sheet_config.get("caption_font_size", 12))
+        self.header_font = QFont(self.caption_font)
+        self.header_font.setPixelSize(self.caption_font.pixelSize() + 6)
+        self.header_font.setBold(True)
+        self.line_height = QFontMetrics(self.caption_font).height()
+        self.header_height = QFontMetrics(self.header_font).height() + self.spacing
+    
+    @property
+    def scenes_per_page(self):
+        """每页的场景数"""
+        return self.columns * self.rows
+    
+    def page_count(self, scene_count):
+        """计算页数
+        
+        Args:
+            scene_count: 场景总数
+        
+        Returns:
+            int: 页数
+        """
+        return (scene_count + self.scenes_per_page - 1) // self.scenes_per_page
+    
+    def cell_size(self):
+        """单个场景格子（缩略图加两行说明文字）的尺寸
+        
+        Returns:
+            tuple: (宽度, 高度)
+        """
+        return self.thumbnail_width, self.thumbnail_height + self.line_height * 2 + 4
+    
+    def page_size(self):
+        """单页尺寸
+        
+        Returns:
+            tuple: (宽度, 高度)
+        """
+        cell_width, cell_height = self.cell_size()
+        width = self.margin * 2 + self.columns * cell_width + (self.columns - 1) * self.spacing
+        height = self.margin * 2 + self.header_height + self.rows * cell_height + (self.rows - 1) * self.spacing
+        return width, height
+    
+    def caption(self, index, scene):
+        """生成场景的说明文字
+        
+        Args:
+            index: 场景索引（从0开始）
+            scene: 场景字典
+        
+        Returns:
+            tuple: (标题行, 台词摘要)
+        """
+        name = scene.get("character_name") or ("旁白" if scene.get("is_narration") else "")
+        title = f"#{index + 1:04d} {name}".rstrip()
+        text = " ".join(str(scene.get("text", "")).split())
+        return title, truncate(text, self.caption_length)
+    
+    def compose_page(self, scenes, page, page_total, thumbnails, title=""):
+        """排版一页分镜表
+        
+        Args:
+            scenes: 场景列表
+            page: 页码（从0开始）
+            page_total: 总页数
+            thumbnails: 本页的缩略图 {场景索引: QImage}
+            title: 页眉标题
+        
+        Returns:
+            QImage: 排版好的页面
+        """
+        width, height = self.page_size()
+        cell_width, cell_height = self.cell_size()
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(Qt.white)
+        
+        painter = QPainter(image)
+        try:
+            painter.setFont(self.header_font)
+            painter.setPen(Qt.black)
+            header_rect = QRect(self.margin, self.margin, width - self.margin * 2, self.header_height)
+            painter.drawText(header_rect, Qt.AlignLeft | Qt.AlignTop, title)
+            painter.drawText(header_rect, Qt.AlignRight | Qt.AlignTop, f"{page + 1} / {page_total}")
+            
+            painter.setFont(self.caption_font)
+            metrics = QFontMetrics(self.caption_font)
+            first = page * self.scenes_per_page
+            for slot, index in enumerate(range(first, min(first + self.scenes_per_page, len(scenes)))):
+                x = self.margin + (slot % self.columns) * (cell_width + self.spacing)
+                y = self.margin + self.header_height + (slot // self.columns) * (cell_height + self.spacing)
+                thumbnail_rect = QRect(x, y, self.thumbnail_width, self.thumbnail_height)
+                
+                thumbnail = thumbnails.get(index)
+                if thumbnail is not None:
+                    painter.drawImage(thumbnail_rect.topLeft(), thumbnail)
+                else:
+                    # 渲染失败的场景用占位色块标出
+                    painter.fillRect(thumbnail_rect, QColor(200, 200, 200))
+                painter.setPen(QColor(160, 160, 160))
+                painter.drawRect(thumbnail_rect.adjusted(0, 0, -1, -1))
+                
+                caption_title, snippet = self.caption(index, scenes[index])
+                text_y = y + self.thumbnail_height + 2
+                painter.setPen(Qt.black)
+                painter.drawText(QRect(x, text_y, cell_width, self.line_height), Qt.AlignLeft,
+                                 metrics.elidedText(caption_title, Qt.ElideRight, cell_width))
+                painter.setPen(QColor(90, 90, 90))
+                painter.drawText(QRect(x, text_y + self.line_height, cell_width, self.line_height), Qt.AlignLeft,
+                                 metrics.elidedText(snippet, Qt.ElideRight, cell_width))
+        finally:
+            painter.end()
+        return image
+    
+    @staticmethod
+    def page_path(output_dir, page):
+        """分镜表页面的输出路径
+        
+        Args:
+            output_dir: 输出目录
+            page: 页码（从0开始）
+        
+        Returns:
+            Path: 输出文件路径
+        """
+        return Path(output_dir) / f"contact_sheet_{page + 1:04d}.png"
+    
+    def export(self, scenes, output_dir, title="", base_dir=None, workers=None, progress=None):
+        """逐页导出分镜表
+        
+        Args:
+            scenes: 场景列表
+            output_dir: 输出目录
+            title: 页眉标题（通常为项目名）
+            base_dir: 解析场景中相对路径的基准目录
+            workers: 工作进程数，默认读取配置
+            progress: 进度回调 progress(已完成页数, 总页数)，返回False时取消导出
+        
+        Returns:
+            list: 已写入的页面路径列表，导出失败时返回None
+        """
+        if not scenes:
+            return []
+        if not FileService.ensure_directory(str(output_dir)):
+            log_error(f"创建分镜表输出目录失败: {output_dir}")
+            return None
+        
+        page_total = self.page_count(len(scenes))
+        executor, workers = create_render_pool(self.config, base_dir, workers, min(len(scenes), self.scenes_per_page))
+        log_info(f"开始导出分镜表: 场景 {len(scenes)} 个, {page_total} 页, 进程 {workers} 个")
+        
+        written = []
+        with executor:
+            for page in range(page_total):
+                first = page * self.scenes_per_page
+                tasks = [(index, scenes[index]) for index in range(first, min(first + self.scenes_per_page, len(scenes)))]
+                futures = [
+                    executor.submit(render_thumbnails, chunk, self.thumbnail_width, self.thumbnail_height)
+                    for chunk in chunk_tasks(tasks, workers, 1)
+                ]
+                
+                # 只保留当前页的缩略图
+                thumbnails = {}
+                for future in as_completed(futures):
+                    try:
+                        for index, data in future.result():
+                            thumbnails[index] = image_from_bytes(data)
+                    except Exception as e:
+                        log_error(f"渲染分镜表缩略图失败: {str(e)}")
+                
+                page_image = self.compose_page(scenes, page, page_total, thumbnails, title)
+                del thumbnails
+                output_path = self.page_path(output_dir, page)
+                temp_path = output_path.with_name(f"{output_path.stem}.tmp.png")
+                if not page_image.save(str(temp_path)):
+                    log_error(f"保存分镜表失败: {output_path}")
+                    return None
+                os.replace(temp_path, output_path)
+                written.append(output_path)
+                
+                if progress is not None and progress(page + 1, page_total) is False:
+                    log_info(f"分镜表导出已取消: 已完成 {page + 1} / {page_total} 页")
+                    break
+        
+        log_info(f"分镜表导出完成: {len(written)} 页, 输出目录: {output_dir}")
+        return written
@@ -0,0 +1,133 @@
+"""渲染进程池
+
+批量渲染共用的进程池：每个工作进程持有独立的无界面应用程序实例、离屏渲染器和图片缓存
+"""
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5.QtGui import QImage
+
+
+# 每个工作进程的渲染器（由进程池初始化函数创建）
+_worker_app = None
+_worker_renderer = None
+
+
+def _init_worker(config, base_dir):
+    """工作进程初始化：创建无界面的应用程序实例和独立的渲染器
+    
+    Args:
+        config: 应用程序配置
+        base_dir: 解析场景中相对路径的基准目录
+    """
+    global _worker_app, _worker_renderer
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QGuiApplication
+    from services.render.scene_renderer import SceneRenderer
+    _worker_app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+    _worker_renderer = SceneRenderer(config, base_dir=base_dir)
+
+
+def create_render_pool(config, base_dir=None, workers=None, task_count=None):
+    """创建渲染进程池
+    
+    使用spawn启动工作进程，避免复制父进程中的Qt状态。
+    
+    Args:
+        config: 应用程序配置
+        base_dir: 解析场景中相对路径的基准目录
+        workers: 工作进程数，默认读取配置（0表示CPU核心数）
+        task_count: 任务数量，用于避免创建多余的进程
+    
+    Returns:
+        tuple: (ProcessPoolExecutor, 工作进程数)
+    """
+    workers = workers or config.get("render", {}).get("workers") or os.cpu_count() or 1
+    if task_count:
+        workers = min(workers, task_count)
+    workers = max(1, workers)
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config, str(base_dir) if base_dir else None)
+    )
+    return executor, workers
+
+
+def chunk_tasks(tasks, workers, chunks_per_worker=4):
+    """将任务按连续的块划分
+    
+    相邻场景通常共用素材，按连续的块分配给工作进程可以提高进程内缓存的命中率。
+    
+    Args:
+        tasks: 任务列表
+        workers: 工作进程数
+        chunks_per_worker: 每个工作进程平均分到的块数（兼顾负载均衡）
+    
+    Returns:
+        list: 任务块列表
+    """
+    chunk_size = max(1, math.ceil(len(tasks) / (workers * chunks_per_worker)))
+    return [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+
+def render_files(tasks):
+    """在工作进程中渲染一组场景并保存为文件
+    
+    Args:
+        tasks: [(场景索引, 场景字典, 输出路径)]
+    
+    Returns:
+        list: [(场景索引, 是否成功)]
+    """
+    return [(index, _worker_renderer.render_to_file(scene, output_path)) for index, scene, output_path in tasks]
+
+
+def render_thumbnails(tasks, width, height):
+    """在工作进程中渲染一组场景缩略图
+    
+    缩略图以原始像素数据返回，便于跨进程传递。
+    
+    Args:
+        tasks: [(场景索引, 场景字典)]
+        width: 缩略图宽度
+        height: 缩略图高度
+    
+    Returns:
+        list: [(场景索引, 像素数据)]，像素数据可用image_from_bytes还原
+    """
+    results = []
+    for index, scene in tasks:
+        image = _worker_renderer.render_thumbnail(scene, width, height)
+        results.append((index, image_to_bytes(image)))
+    return results
+
+
+def image_to_bytes(image):
+    """将QImage转换为可跨进程传递的像素数据
+    
+    Args:
+        image: QImage图像
+    
+    Returns:
+        tuple: (宽度, 高度, 每行字节数, 格式, 像素字节)
+    """
+    bits = image.constBits()
+    bits.setsize(image.byteCount())
+    return image.width(), image.height(), image.bytesPerLine(), int(image.format()), bytes(bits)
+
+
+def image_from_bytes(data):
+    """从像素数据还原QImage
+    
+    Args:
+        data: image_to_bytes返回的像素数据
+    
+    Returns:
+        QImage: 图像（拥有独立的像素缓冲区）
+    """
+    width, height, bytes_per_line, image_format, pixels = data
+    return QImage(pixels, width, height, bytes_per_line, QImage.Format(image_format)).copy()
@@ -0,0 +1,108 @@
+"""场景合成规则
+
+预览画布和离屏渲染器共用的几何计算：画布尺寸、背景铺放、立绘位置解析、边界限制和裁剪布局
+"""
+from PyQt5.QtCore import Qt, QRect, QSize
+
+
+# 固定的画布尺寸
+CANVAS_WIDTH = 1280
+CANVAS_HEIGHT = 720
+
+
+def background_rect(image_size, canvas_width, canvas_height):
+    """计算背景在画布上的绘制区域：保持宽高比填满画布并居中，超出部分裁剪
+    
+    Args:
+        image_size: 背景图片尺寸(QSize)
+        canvas_width: 画布宽度
+        canvas_height: 画布高度
+    
+    Returns:
+        QRect: 画布坐标系下的绘制区域
+    """
+    size = QSize(image_size).scaled(canvas_width, canvas_height, Qt.KeepAspectRatioByExpanding)
+    return QRect(
+        (canvas_width - size.width()) // 2,
+        (canvas_height - size.height()) // 2,
+        size.width(),
+        size.height()
+    )
+
+
+def resolve_portrait_position(position, canvas_width=CANVAS_WIDTH, canvas_height=CANVAS_HEIGHT):
+    """解析场景数据中保存的立绘位置
+    
+    优先使用相对坐标（rel_x/rel_y），否则使用绝对坐标（兼容旧版本的列表或x/y字典）。
+    
+    Args:
+        position: 场景数据中的位置信息
+        canvas_width: 画布宽度
+        canvas_height: 画布高度
+    
+    Returns:
+        tuple: 画布坐标系下的(x, y)
+    """
+    if isinstance(position, dict) and "rel_x" in position and "rel_y" in position:
+        return int(position["rel_x"] * canvas_width), int(position["rel_y"] * canvas_height)
+    if isinstance(position, (list, tuple)) and len(position) >= 2:
+        return int(position[0]), int(position[1])
+    if isinstance(position, dict):
+        return int(position.get("x", 0)), int(position.get("y", 0))
+    return 0, 0
+
+
+def clamp_portrait_position(x, y, width, height, canvas_width=CANVAS_WIDTH, canvas_height=CANVAS_HEIGHT):
+    """限制立绘位置：允许立绘超出画布边界一半的宽度和高度
+    
+    Args:
+        x: x坐标 - 基于画布坐标系统
+        y: y坐标 - 基于画布坐标系统
+        width: 未裁剪立绘缩放后的宽度
+        height: 未裁剪立绘缩放后的高度
+        canvas_width: 画布宽度
+        canvas_height: 画布高度
+    
+    Returns:
+        tuple: 修正后的(x, y)
+    """
+    x = max(-width // 2, min(x, canvas_width - width // 2))
+    y = max(-height // 2, min(y, canvas_height - height // 2))
+    return x, y
+
+
+def portraits_in_draw_order(portraits):
+    """按叠放顺序排列场景中的立绘（先绘制的在下）
+    
+    立绘的z字段决定叠放顺序，没有z时与立绘槽位（index）相同；z相同时按槽位排列。
+    
+    Args:
+        portraits: 场景数据中的立绘列表
+    
+    Returns:
+        list: 排序后的立绘信息列表
+    """
+    def order(item):
+        position, portrait_info = item
+        slot = portrait_info.get("index", position)
+        return portrait_info.get("z", slot), slot
+    return [portrait_info for _, portrait_info in sorted(enumerate(portraits), key=order)]
+
+
+def portrait_layout(bounds, scale):
+    """计算裁剪后的立绘在目标缩放比例下的偏移和尺寸
+    
+    Args:
+        bounds: 裁剪区域（原图像素坐标下的QRect）
+        scale: 缩放比例
+    
+    Returns:
+        tuple: ((左偏移, 上偏移), (宽度, 高度))，偏移相对于未裁剪立绘的左上角
+    """
+    left = int(bounds.x() * scale)
+    top = int(bounds.y() * scale)
+    size = (
+        max(1, int((bounds.x() + bounds.width()) * scale) - left),
+        max(1, int((bounds.y() + bounds.height()) * scale) - top)
+    )
+    return (left, top), size
@@ -0,0 +1,195 @@
+"""离屏场景渲染器
+
+不依赖任何窗口控件，使用QImage和QPainter按与预览画布相同的规则合成场景
+"""
+import os
+from collections import OrderedDict
+from pathlib import Path
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImage, QPainter, QColor
+from services.file.file_service import FileService
+from services.media.media_service import MediaService
+from services.render.scene_compositor import (
+    CANVAS_WIDTH, CANVAS_HEIGHT, background_rect, resolve_portrait_position,
+    clamp_portrait_position, portrait_layout, portraits_in_draw_order
+)
+from utils.resource_utils import ResourceLoader
+from utils.helpers.logger import log_error, log_debug
+
+
+class SceneRenderer:
+    """离屏场景渲染器，将场景字典合成为画布尺寸的QImage
+    
+    只使用QImage，可以在无界面的进程（QT_QPA_PLATFORM=offscreen）或工作线程中运行。
+    解码后的背景和立绘保存在有限大小的LRU缓存中，连续渲染共用素材的场景时不重复解码。
+    """
+    
+    def __init__(self, config=None, media_service=None, base_dir=None,
+                 canvas_width=CANVAS_WIDTH, canvas_height=CANVAS_HEIGHT):
+        """初始化离屏场景渲染器
+        
+        Args:
+            config: 应用程序配置
+            media_service: 媒体服务，默认新建（共用立绘金字塔和资源分析缓存）
+            base_dir: 解析场景中相对路径的基准目录（通常为项目文件所在目录）
+            canvas_width: 输出宽度，与固定画布尺寸不同时按比例缩放立绘和坐标
+            canvas_height: 输出高度
+        """
+        self.config = config or {}
+        self.media_service = media_service or MediaService(self.config)
+        self.base_dir = Path(base_dir) if base_dir else None
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        # 场景中的立绘坐标和缩放基于固定画布尺寸，按输出尺寸换算后直接以输出分辨率合成
+        self.scale_x = canvas_width / CANVAS_WIDTH
+        self.scale_y = canvas_height / CANVAS_HEIGHT
+        
+        render_config = self.config.get("render", {})
+        self.background_color = QColor(render_config.get("background_color", "#000000"))
+        self.cache_size = max(1, render_config.get("cache_size", 64))
+        self._images = OrderedDict()  # 缓存键 -> 解码后的图片
+    
+    def _resolve_path(self, path):
+        """解析场景中的资源路径，相对路径先按当前目录、再按项目目录查找"""
+        if not path or os.path.isabs(path) or os.path.exists(path) or self.base_dir is None:
+            return path
+        return str(self.base_dir / path)
+    
+    def _cached(self, key, loader):
+        """从LRU缓存获取图片，缺失时调用loader加载"""
+        if key in self._images:
+            self._images.move_to_end(key)
+            return self._images[key]
+        value = loader()
+        if value is not None:
+            self._images[key] = value
+            while len(self._images) > self.cache_size:
+                self._images.popitem(last=False)
+        return value
+    
+    def clear_cache(self):
+        """清空解码图片缓存"""
+        self._images.clear()
+    
+    def load_background(self, path):
+        """按画布分辨率解码背景并缩放到画布上的绘制尺寸
+        
+        Args:
+            path: 背景图片路径
+        
+        Returns:
+            tuple: (QImage, QRect 绘制区域)，加载失败时返回None
+        """
+        def load():
+            image = ResourceLoader.read_image_scaled(path, QSize(self.canvas_width, self.canvas_height))
+            if image is None:
+                return None
+            rect = background_rect(image.size(), self.canvas_width, self.canvas_height)
+            return image.scaled(rect.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation), rect
+        
+        return self._cached(("background", path, self.canvas_width, self.canvas_height), load)
+    
+    def load_portrait(self, path, scale):
+        """加载缩放到目标尺寸的立绘
+        
+        Args:
+            path: 立绘图片路径
+            scale: 缩放比例
+        
+        Returns:
+            tuple: (QImage, (左偏移, 上偏移), (完整宽度, 完整高度))，加载失败时返回None
+        """
+        def load():
+            image, _, bounds = self.media_service.load_portrait_image(path, scale)
+            if image is None:
+                return None
+            offset, (width, height) = portrait_layout(bounds, scale)
+            full_size = self.media_service.get_portrait_size(path, scale)
+            if full_size is None:
+                full_size = (int(bounds.right() * scale), int(bounds.bottom() * scale))
+            if image.width() != width or image.height() != height:
+                image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            return image, offset, full_size
+        
+        return self._cached(("portrait", path, scale), load)
+    
+    def render_scene(self, scene):
+        """合成场景
+        
+        与预览画布一致：底色之上铺满居中的背景，再按叠放顺序（z，默认为槽位）从下到上绘制立绘，
+        立绘位置按加载场景时的规则解析并限制在画布边界内。
+        
+        Args:
+            scene: 场景字典
+        
+        Returns:
+            QImage: 输出尺寸的合成结果
+        """
+        canvas = QImage(self.canvas_width, self.canvas_height, QImage.Format_ARGB32_Premultiplied)
+        canvas.fill(self.background_color)
+        painter = QPainter(canvas)
+        try:
+            background_path = self._resolve_path(scene.get("background"))
+            if background_path:
+                background = self.load_background(background_path)
+                if background is not None:
+                    image, rect = background
+                    painter.drawImage(rect.topLeft(), image)
+                else:
+                    log_debug(f"渲染时加载背景失败: {background_path}")
+            
+            for portrait_info in portraits_in_draw_order(scene.get("portraits", [])):
+                path = self._resolve_path(portrait_info.get("path"))
+                if not path:
+                    continue
+                portrait = self.load_portrait(path, portrait_info.get("scale", 1.0) * self.scale_x)
+                if portrait is None:
+                    log_debug(f"渲染时加载立绘失败: {path}")
+                    continue
+                image, (left, top), (full_width, full_height) = portrait
+                x, y = resolve_portrait_position(portrait_info.get("position"))
+                x, y = int(x * self.scale_x), int(y * self.scale_y)
+                x, y = clamp_portrait_position(x, y, full_width, full_height, self.canvas_width, self.canvas_height)
+                painter.drawImage(x + left, y + top, image)
+        finally:
+            painter.end()
+        return canvas
+    
+    def render_thumbnail(self, scene, width, height):
+        """合成场景并平滑缩小为缩略图
+        
+        Args:
+            scene: 场景字典
+            width: 缩略图宽度
+            height: 缩略图高度
+        
+        Returns:
+            QImage: 不透明（RGB32）的缩略图
+        """
+        image = self.render_scene(scene).scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        return image.convertToFormat(QImage.Format_RGB32)
+    
+    def render_to_file(self, scene, output_path):
+        """合成场景并保存为图片文件
+        
+        先写入临时文件再替换，中断时不会留下不完整的输出。
+        
+        Args:
+            scene: 场景字典
+            output_path: 输出文件路径
+        
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            output_path = Path(output_path)
+            FileService.ensure_directory(str(output_path.parent))
+            temp_path = output_path.with_name(f"{output_path.stem}.{os.getpid()}.tmp{output_path.suffix}")
+            if not self.render_scene(scene).save(str(temp_path)):
+                log_error(f"保存渲染结果失败: {output_path}")
+                return False
+            os.replace(temp_path, output_path)
+            return True
+        except Exception as e:
+            log_error(f"渲染场景失败: {output_path}, 错误: {str(e)}")
+            return False
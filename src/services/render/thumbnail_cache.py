@@ -0,0 +1,330 @@
+"""场景缩略图缓存
+
+以场景画面哈希为键的磁盘缩略图缓存：所有缩略图追加写入一个打包文件，另有一个文本索引记录位置，
+空闲时在低优先级线程中补齐缺失的缩略图
+"""
+import copy
+import os
+from pathlib import Path
+from PyQt5.QtCore import QObject, QThread, QBuffer, QByteArray, QIODevice, pyqtSignal
+from PyQt5.QtGui import QImage
+from models.scene.scene_hash import scene_visual_hash
+from services.file.file_service import FileService
+from services.render.scene_compositor import CANVAS_WIDTH, CANVAS_HEIGHT
+from services.render.scene_renderer import SceneRenderer
+from utils.helpers.logger import log_error, log_debug, log_info
+
+
+class ThumbnailCache:
+    """打包的缩略图磁盘缓存
+    
+    缩略图数据依次追加到 <缓存目录>/thumbnails_<宽>x<高>.pack，
+    索引文件 thumbnails_<宽>x<高>.idx 每行记录 "<画面哈希> <偏移> <长度>"，后写入的记录覆盖先前的记录。
+    场景画面字段变化后哈希随之变化，旧条目不会再被命中，由compact统一清理。
+    """
+    
+    def __init__(self, cache_dir, width=256, height=None, image_format="JPG", quality=85):
+        """初始化缩略图缓存
+        
+        Args:
+            cache_dir: 缓存目录
+            width: 缩略图宽度
+            height: 缩略图高度，默认按画布比例计算
+            image_format: 缩略图编码格式
+            quality: 编码质量（0-100）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.width = width
+        self.height = height or max(1, round(width * CANVAS_HEIGHT / CANVAS_WIDTH))
+        self.image_format = image_format
+        self.quality = quality
+        name = f"thumbnails_{self.width}x{self.height}"
+        self.pack_path = self.cache_dir / f"{name}.pack"
+        self.index_path = self.cache_dir / f"{name}.idx"
+        self._entries = {}  # 画面哈希 -> (偏移, 长度)
+        self._load_index()
+    
+    def _load_index(self):
+        """加载索引，忽略超出打包文件范围的记录（写入中断时可能出现）"""
+        if not self.index_path.exists() or not self.pack_path.exists():
+            return
+        pack_size = self.pack_path.stat().st_size
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 3:
+                        continue
+                    offset, length = int(parts[1]), int(parts[2])
+                    if offset + length <= pack_size:
+                        self._entries[parts[0]] = (offset, length)
+        except Exception as e:
+            log_error(f"加载缩略图索引失败: {str(e)}")
+    
+    def __contains__(self, visual_hash):
+        return visual_hash in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def encode(self, image):
+        """将缩略图编码为字节
+        
+        Args:
+            image: QImage缩略图
+        
+        Returns:
+            bytes: 编码后的数据，失败时返回None
+        """
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        if not image.save(buffer, self.image_format, self.quality):
+            return None
+        return bytes(data)
+    
+    def get(self, visual_hash):
+        """读取缩略图
+        
+        Args:
+            visual_hash: 场景画面哈希
+        
+        Returns:
+            QImage: 缩略图，未缓存或读取失败时返回None
+        """
+        entry = self._entries.get(visual_hash)
+        if entry is None:
+            return None
+        try:
+            with open(self.pack_path, 'rb') as f:
+                f.seek(entry[0])
+                data = f.read(entry[1])
+            image = QImage.fromData(data)
+            return None if image.isNull() else image
+        except Exception as e:
+            log_error(f"读取缩略图失败: {str(e)}")
+            return None
+    
+    def put(self, visual_hash, data):
+        """追加一条缩略图记录
+        
+        先写入数据再写入索引，写入中断时索引不会指向不完整的数据。
+        
+        Args:
+            visual_hash: 场景画面哈希
+            data: 编码后的缩略图数据（encode的返回值）
+        
+        Returns:
+            bool: 是否成功
+        """
+        if not data:
+            return False
+        try:
+            FileService.ensure_directory(str(self.cache_dir))
+            with open(self.pack_path, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(f"{visual_hash} {offset} {len(data)}\n")
+            self._entries[visual_hash] = (offset, len(data))
+            return True
+        except Exception as e:
+            log_error(f"写入缩略图缓存失败: {str(e)}")
+            return False
+    
+    def garbage_ratio(self, keep=None):
+        """打包文件中无用数据所占的比例
+        
+        Args:
+            keep: 仍在使用的画面哈希集合，默认索引中的全部条目都视为有用
+        
+        Returns:
+            float: 0到1之间的比例
+        """
+        if not self.pack_path.exists():
+            return 0.0
+        pack_size = self.pack_path.stat().st_size
+        if pack_size == 0:
+            return 0.0
+        live_size = sum(length for visual_hash, (_, length) in self._entries.items()
+                        if keep is None or visual_hash in keep)
+        return 1.0 - live_size / pack_size
+    
+    def compact(self, keep=None):
+        """重写打包文件，只保留仍被使用的缩略图
+        
+        Args:
+            keep: 需要保留的画面哈希集合，默认保留索引中的全部条目
+        
+        Returns:
+            bool: 是否成功
+        """
+        if not self.pack_path.exists():
+            return True
+        keep_hashes = [h for h in self._entries if keep is None or h in keep]
+        temp_pack = self.pack_path.with_name(f"{self.pack_path.name}.tmp")
+        temp_index = self.index_path.with_name(f"{self.index_path.name}.tmp")
+        entries = {}
+        try:
+            with open(self.pack_path, 'rb') as source, open(temp_pack, 'wb') as pack, \
+                    open(temp_index, 'w', encoding='utf-8') as index:
+                for visual_hash in keep_hashes:
+                    offset, length = self._entries[visual_hash]
+                    source.seek(offset)
+                    data = source.read(length)
+                    entries[visual_hash] = (pack.tell(), length)
+                    pack.write(data)
+                    index.write(f"{visual_hash} {entries[visual_hash][0]} {length}\n")
+            os.replace(temp_pack, self.pack_path)
+            os.replace(temp_index, self.index_path)
+            log_info(f"缩略图缓存已整理: 保留 {len(entries)} 条, 移除 {len(self._entries) - len(entries)} 条")
+            self._entries = entries
+            return True
+        except Exception as e:
+            log_error(f"整理缩略图缓存失败: {str(e)}")
+            return False
+
+
+class _ThumbnailWorker(QThread):
+    """在低优先级线程中逐个渲染并编码缩略图"""
+    
+    rendered = pyqtSignal(int, str, bytes)  # 场景索引, 画面哈希, 编码后的数据
+    
+    def __init__(self, tasks, cache, config, base_dir):
+        super().__init__()
+        self.tasks = tasks
+        self.cache = cache
+        self.config = config
+        self.base_dir = base_dir
+    
+    def run(self):
+        """渲染任务列表中的缩略图，收到中断请求时立即停止"""
+        renderer = SceneRenderer(self.config, base_dir=self.base_dir)
+        for index, visual_hash, scene in self.tasks:
+            if self.isInterruptionRequested():
+                break
+            try:
+                image = renderer.render_thumbnail(scene, self.cache.width, self.cache.height)
+                data = self.cache.encode(image)
+            except Exception as e:
+                log_error(f"渲染缩略图失败: 场景 {index + 1}, 错误: {str(e)}")
+                continue
+            if data:
+                self.rendered.emit(index, visual_hash, data)
+
+
+class ThumbnailFiller(QObject):
+    """缩略图后台补齐器：在空闲优先级的线程中渲染缓存中缺失的缩略图
+    
+    渲染在工作线程中完成，打包文件只在主线程中写入。
+    每个项目使用独立的缓存，补齐完成后不属于当前场景列表的条目即为过期条目。
+    各场景的画面哈希按场景索引缓存，保存或批量修改后只重新计算变化的场景。
+    """
+    
+    thumbnail_ready = pyqtSignal(int, str)  # 场景索引, 画面哈希
+    finished = pyqtSignal()
+    
+    def __init__(self, cache, config=None, parent=None):
+        """初始化缩略图补齐器
+        
+        Args:
+            cache: 缩略图缓存
+            config: 应用程序配置
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.cache = cache
+        self.config = config or {}
+        self._worker = None
+        self._live_hashes = set()
+        self._hashes = []  # 场景索引 -> 画面哈希
+    
+    def scene_hash(self, index):
+        """获取场景的画面哈希（上一次补齐时计算的结果）
+        
+        Args:
+            index: 场景索引
+        
+        Returns:
+            str: 画面哈希，场景尚未补齐过时返回None
+        """
+        return self._hashes[index] if 0 <= index < len(self._hashes) else None
+    
+    def set_cache(self, cache):
+        """切换缩略图缓存（如打开了另一个项目），正在进行的补齐任务会被取消
+        
+        Args:
+            cache: 缩略图缓存
+        """
+        self.stop()
+        self.cache = cache
+        self._hashes = []
+    
+    def _update_hashes(self, scenes, changed):
+        """更新各场景的画面哈希，只重新计算变化和新增的场景"""
+        if changed is None or len(scenes) < len(self._hashes):
+            # 首次补齐或有场景被删除（索引可能整体移动）时全部重新计算
+            self._hashes = [scene_visual_hash(scene) for scene in scenes]
+            return
+        for index in changed:
+            if 0 <= index < len(self._hashes):
+                self._hashes[index] = scene_visual_hash(scenes[index])
+        self._hashes.extend(scene_visual_hash(scene) for scene in scenes[len(self._hashes):])
+    
+    def fill(self, scenes, base_dir=None, changed=None):
+        """开始为场景列表补齐缺失的缩略图，正在进行的补齐任务会被取消
+        
+        Args:
+            scenes: 场景列表
+            base_dir: 解析场景中相对路径的基准目录
+            changed: 画面可能变化的场景索引，None表示重新计算全部场景的画面哈希（新增的场景总会被计算）
+        
+        Returns:
+            int: 需要渲染的缩略图数量
+        """
+        self.stop()
+        self._update_hashes(scenes, changed)
+        tasks = []
+        queued = set()
+        self._live_hashes = set(self._hashes)
+        for index, visual_hash in enumerate(self._hashes):
+            # 画面相同的场景只渲染一次
+            if visual_hash in self.cache or visual_hash in queued:
+                continue
+            queued.add(visual_hash)
+            # 工作线程渲染的是提交时的画面字段副本，渲染期间场景被编辑也不会把新画面存到旧的哈希下
+            scene = scenes[index]
+            snapshot = {"background": scene.get("background"), "portraits": copy.deepcopy(scene.get("portraits") or [])}
+            tasks.append((index, visual_hash, snapshot))
+        
+        if not tasks:
+            self._on_worker_finished()
+            return 0
+        
+        log_debug(f"开始后台补齐缩略图: {len(tasks)} 个")
+        self._worker = _ThumbnailWorker(tasks, self.cache, self.config, str(base_dir) if base_dir else None)
+        self._worker.rendered.connect(self._on_rendered)
+        self._worker.finished.connect(self._on_worker_finished)
+        self._worker.start(QThread.IdlePriority)
+        return len(tasks)
+    
+    def stop(self):
+        """取消正在进行的补齐任务并等待工作线程退出"""
+        if self._worker is not None:
+            self._worker.rendered.disconnect(self._on_rendered)
+            self._worker.finished.disconnect(self._on_worker_finished)
+            self._worker.requestInterruption()
+            self._worker.wait()
+            self._worker = None
+    
+    def _on_rendered(self, index, visual_hash, data):
+        """工作线程完成一张缩略图后写入缓存"""
+        if self.cache.put(visual_hash, data):
+            self.thumbnail_ready.emit(index, visual_hash)
+    
+    def _on_worker_finished(self):
+        """补齐完成后，画面已变化的过期条目过多时整理打包文件"""
+        self._worker = None
+        if self._live_hashes and self.cache.garbage_ratio(self._live_hashes) > 0.5:
+            self.cache.compact(self._live_hashes)
+        self.finished.emit()
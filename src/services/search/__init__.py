@@ -0,0 +1,7 @@
+"""检索服务包
+
+包含项目内容检索相关服务
+"""
+from .scene_indexer import SceneIndexer
+
+__all__ = ['SceneIndexer']
@@ -0,0 +1,141 @@
+"""场景索引服务
+
+在后台加载或建立当前项目的场景全文索引，之后随场景的保存增量更新，并写回项目旁边的索引文件
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from models.scene.scene_search_index import SceneSearchIndex
+from utils.helpers.logger import log_error, log_debug, log_info
+
+
+class SceneIndexer(QObject):
+    """当前项目的场景索引管理器
+    
+    打开项目时在工作线程中加载索引文件并与场景列表核对（索引文件不存在时完整建立），
+    完成后回到界面线程接管索引，再补上这期间保存过的场景。索引就绪前search返回None。
+    索引有变化时由save写回文件，保存项目和退出程序时调用。
+    """
+    
+    # 工作线程完成后通知界面线程 (项目文件, 索引, 快照中的场景数)
+    _loaded = pyqtSignal(object, object, int)
+    # 索引就绪 (已索引的场景数量)
+    ready = pyqtSignal(int)
+    
+    def __init__(self, config=None, parent=None):
+        """初始化场景索引管理器
+        
+        Args:
+            config: 应用程序配置
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.config = config or {}
+        search_config = self.config.get("scene_search", {})
+        self.enabled = search_config.get("enabled", True)
+        self.name_weight = search_config.get("name_weight", 2.0)
+        
+        self.project_file = None
+        self.index = None
+        self.scenes = []
+        self.pending = set()  # 索引加载期间保存过的场景索引
+        self.executor = None
+        self.future = None  # 后台任务，打开另一个项目或退出时取消尚未开始的任务
+        self._loaded.connect(self._on_loaded, Qt.QueuedConnection)
+    
+    def open_project(self, project_file, scenes):
+        """切换到指定项目，在后台加载或建立索引
+        
+        Args:
+            project_file: 项目文件路径
+            scenes: 项目的场景列表（之后的修改通过update_scene通知）
+        """
+        if not self.enabled or not project_file:
+            return
+        self.save()
+        self.project_file = project_file
+        self.index = None
+        self.scenes = scenes
+        self.pending = set()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-index")
+        if self.future is not None:
+            self.future.cancel()
+        # 工作线程只读取场景列表的快照
+        self.future = self.executor.submit(self._load, project_file, list(scenes))
+    
+    def _load(self, project_file, scenes):
+        """在工作线程中加载索引文件并与场景列表核对"""
+        index = SceneSearchIndex(self.name_weight)
+        try:
+            start_time = time.perf_counter()
+            path = SceneSearchIndex.path_for(project_file)
+            loaded = index.load(path)
+            changed = index.sync(scenes)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            if loaded:
+                log_debug(f"场景索引已加载: {path}, 重新索引 {changed} 个场景, 耗时 {elapsed:.0f} 毫秒")
+            else:
+                log_info(f"已建立场景索引: {len(scenes)} 个场景, 耗时 {elapsed:.0f} 毫秒")
+        except Exception as e:
+            log_error(f"建立场景索引失败: {str(e)}")
+            index = None
+        self._loaded.emit(project_file, index, len(scenes))
+    
+    def _on_loaded(self, project_file, index, snapshot_count):
+        """界面线程中接管索引，补上加载期间保存和新增的场景"""
+        if index is None or project_file != self.project_file:
+            return
+        for scene_index in sorted(self.pending | set(range(snapshot_count, len(self.scenes)))):
+            if scene_index < len(self.scenes):
+                index.update_scene(scene_index, self.scenes[scene_index])
+        self.pending = set()
+        self.index = index
+        self.save()
+        self.ready.emit(len(index))
+    
+    def update_scene(self, scene_index, scene):
+        """场景保存后更新索引（索引未就绪时由就绪后的核对补上）
+        
+        Args:
+            scene_index: 场景索引
+            scene: 场景字典
+        """
+        if self.index is not None:
+            self.index.update_scene(scene_index, scene)
+        elif self.project_file:
+            self.pending.add(scene_index)
+    
+    def search(self, query, limit=None):
+        """在当前项目中查找场景
+        
+        Args:
+            query: 查询文本
+            limit: 最多返回的结果数量
+        
+        Returns:
+            list: (场景索引, 评分)列表，索引未就绪时返回None
+        """
+        if self.index is None:
+            return None
+        return self.index.search(query, limit)
+    
+    def save(self):
+        """索引有变化时写回索引文件
+        
+        Returns:
+            bool: 是否写入了文件
+        """
+        if self.index is None or not self.index.dirty or not self.project_file:
+            return False
+        return self.index.save(SceneSearchIndex.path_for(self.project_file))
+    
+    def shutdown(self):
+        """保存索引并关闭线程池"""
+        self.save()
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
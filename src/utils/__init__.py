@@ -5,14 +5,14 @@
 """
 from .helpers import (
     log_info, log_warning, log_error, log_debug, setup_logger,
-    slugify, truncate, camel_to_snake, snake_to_camel
+    slugify, truncate, camel_to_snake, snake_to_camel, tokenize, is_cjk, LatencyCounter, FrameStats, EventCounter
 )
 from .resource_utils import ResourceLoader
 
 __all__ = [
     # helpers 模块
     'log_info', 'log_warning', 'log_error', 'log_debug', 'setup_logger',
-    'slugify', 'truncate', 'camel_to_snake', 'snake_to_camel',
+    'slugify', 'truncate', 'camel_to_snake', 'snake_to_camel', 'tokenize', 'is_cjk', 'LatencyCounter', 'FrameStats', 'EventCounter',
     # resource_utils 模块
     'ResourceLoader'
     # services 模块不再在此导入以避免循环依赖
@@ -3,9 +3,11 @@
 包含各种辅助函数
 """
 from .logger import log_info, log_warning, log_error, log_debug, setup_logger
-from .string_utils import slugify, truncate, camel_to_snake, snake_to_camel
+from .string_utils import slugify, truncate, camel_to_snake, snake_to_camel, tokenize, is_cjk
+from .perf_stats import LatencyCounter, FrameStats, EventCounter
 
 __all__ = [
     'log_info', 'log_warning', 'log_error', 'log_debug', 'setup_logger',
-    'slugify', 'truncate', 'camel_to_snake', 'snake_to_camel'
+    'slugify', 'truncate', 'camel_to_snake', 'snake_to_camel', 'tokenize', 'is_cjk',
+    'LatencyCounter', 'FrameStats', 'EventCounter'
 ]
\ No newline at end of file
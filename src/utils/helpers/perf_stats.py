@@ -0,0 +1,167 @@
+"""性能统计工具
+
+提供延迟、帧时间等性能指标的统计功能
+"""
+import time
+
+
+class LatencyCounter:
+    """延迟计数器，统计一组耗时样本的次数、平均值、最大值和超出预算的次数"""
+    
+    def __init__(self, budget_ms=None):
+        """初始化延迟计数器
+        
+        Args:
+            budget_ms: 单个样本的时间预算（毫秒），超出预算的样本计为超时
+        """
+        self.budget_ms = budget_ms
+        self.reset()
+    
+    def reset(self):
+        """清空所有样本"""
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.over_budget = 0
+    
+    def record(self, elapsed_ms):
+        """记录一个样本
+        
+        Args:
+            elapsed_ms: 耗时（毫秒）
+        """
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if self.budget_ms is not None and elapsed_ms > self.budget_ms:
+            self.over_budget += 1
+    
+    def record_since(self, start_time):
+        """记录从start_time（time.perf_counter()）到现在的耗时
+        
+        Args:
+            start_time: 起始时间
+        """
+        self.record((time.perf_counter() - start_time) * 1000.0)
+    
+    @property
+    def average_ms(self):
+        """平均耗时（毫秒）"""
+        return self.total_ms / self.count if self.count else 0.0
+    
+    def summary(self):
+        """生成统计摘要
+        
+        Returns:
+            str: 统计摘要文本
+        """
+        text = f"样本数 {self.count}, 平均 {self.average_ms:.2f} ms, 最大 {self.max_ms:.2f} ms"
+        if self.budget_ms is not None:
+            text += f", 超出预算({self.budget_ms:.1f} ms) {self.over_budget} 次"
+        return text
+
+
+class FrameStats:
+    """帧时间统计，根据相邻两帧的间隔统计帧时间和掉帧数"""
+    
+    def __init__(self, frame_ms=1000.0 / 60):
+        """初始化帧时间统计
+        
+        Args:
+            frame_ms: 一帧的理想时长（毫秒）
+        """
+        self.frame_ms = frame_ms
+        self.reset()
+    
+    def reset(self):
+        """清空所有统计"""
+        # 帧间隔超过1.5帧即视为超出预算
+        self.frame_times = LatencyCounter(budget_ms=self.frame_ms * 1.5)
+        self.dropped_frames = 0
+        self.last_frame = None
+    
+    def mark(self, now=None):
+        """记录一帧的呈现时间
+        
+        Args:
+            now: 当前时间（time.perf_counter()），默认取当前时间
+        """
+        now = time.perf_counter() if now is None else now
+        if self.last_frame is not None:
+            interval_ms = (now - self.last_frame) * 1000.0
+            self.frame_times.record(interval_ms)
+            # 间隔内本应呈现却未呈现的帧数
+            self.dropped_frames += max(0, round(interval_ms / self.frame_ms) - 1)
+        self.last_frame = now
+    
+    def pause(self):
+        """动画暂停，下一帧不与之前的帧计算间隔"""
+        self.last_frame = None
+    
+    def summary(self):
+        """生成统计摘要
+        
+        Returns:
+            str: 统计摘要文本
+        """
+        return f"帧时间: {self.frame_times.summary()}, 掉帧 {self.dropped_frames} 帧"
+
+
+class EventCounter:
+    """事件计数器，按名称统计事件发生的次数（如素材加载、画布重绘）"""
+    
+    def __init__(self):
+        """初始化事件计数器"""
+        self.counts = {}
+    
+    def reset(self):
+        """清空所有计数"""
+        self.counts = {}
+    
+    def increment(self, name, count=1):
+        """增加事件计数
+        
+        Args:
+            name: 事件名称
+            count: 增加的次数
+        """
+        self.counts[name] = self.counts.get(name, 0) + count
+    
+    def get(self, name):
+        """获取事件计数
+        
+        Args:
+            name: 事件名称
+        
+        Returns:
+            int: 事件发生的次数
+        """
+        return self.counts.get(name, 0)
+    
+    def snapshot(self):
+        """获取当前计数的副本，可与之后的计数相减得到一段时间内的增量
+        
+        Returns:
+            dict: 事件名称 -> 次数
+        """
+        return dict(self.counts)
+    
+    def since(self, snapshot):
+        """计算自快照以来的计数增量
+        
+        Args:
+            snapshot: snapshot返回的计数副本
+        
+        Returns:
+            dict: 事件名称 -> 增量（只包含有变化的事件）
+        """
+        return {name: count - snapshot.get(name, 0) for name, count in self.counts.items()
+                if count != snapshot.get(name, 0)}
+    
+    def summary(self):
+        """生成统计摘要
+        
+        Returns:
+            str: 统计摘要文本
+        """
+        return ", ".join(f"{name} {count}" for name, count in sorted(self.counts.items())) or "无"
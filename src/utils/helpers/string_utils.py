@@ -71,4 +71,48 @@ def snake_to_camel(value):
         str: 转换后的字符串
     """
     components = value.split('_')
-    return components[0] + ''.join(x.title() for x in components[1:])
\ No newline at end of file
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+
+# 中日韩文字（汉字、假名、谚文及全角长音符），这些文字之间没有空格分词
+_CJK_CHARS = (
+    '\u3005\u3007\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff'
+    '\uac00-\ud7af\uf900-\ufaff\uff66-\uff9f'
+)
+_TOKEN_PATTERN = re.compile(f'([{_CJK_CHARS}]+)|([^\\W_{_CJK_CHARS}]+)')
+_CJK_PATTERN = re.compile(f'[{_CJK_CHARS}]')
+
+
+def is_cjk(char):
+    """判断字符是否为中日韩文字（汉字、假名或谚文）
+    
+    Args:
+        char: 单个字符
+    
+    Returns:
+        bool: 是否为中日韩文字
+    """
+    return bool(_CJK_PATTERN.fullmatch(char))
+
+
+def tokenize(value):
+    """将文本切分为检索用的词元
+    
+    文本先做NFKC规范化并转为小写；中日韩文字按相邻两个字切分（二元组），
+    只有一个字的片段保留单字，其他文字按单词切分，标点和空白被忽略。
+    
+    Args:
+        value: 要切分的文本
+    
+    Returns:
+        list: 按出现顺序排列的词元（可能重复）
+    """
+    tokens = []
+    for cjk, word in _TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', value).lower()):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
@@ -5,15 +5,34 @@
 """
 from typing import Optional, Dict, Any
 from pathlib import Path
-from PyQt5.QtGui import QPixmap, QFont, QFontDatabase
-from PyQt5.QtCore import QUrl, Qt
-from PyQt5.QtMultimedia import QMediaContent
+from PyQt5.QtGui import QPixmap, QImage, QFont, QFontDatabase, QImageReader
+from PyQt5.QtCore import QUrl, Qt, QSize
 from utils.helpers.logger import log_error, log_debug
 
 
 class ResourceLoader:
     """资源加载器，提供通用的资源加载功能"""
     
+    @staticmethod
+    def normalize_image(image: QImage) -> QImage:
+        """将图片转换为光栅绘制引擎最快的像素格式
+        
+        带透明通道的图片转换为Format_ARGB32_Premultiplied，不透明图片转换为Format_RGB32，
+        避免每次绘制时都走非预乘或索引色的慢速转换路径。
+        
+        Args:
+            image: 解码后的图片
+        
+        Returns:
+            QImage: 转换后的图片，格式已符合要求时直接返回原图
+        """
+        if image.isNull():
+            return image
+        target_format = QImage.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format_RGB32
+        if image.format() == target_format:
+            return image
+        return image.convertToFormat(target_format)
+    
     @staticmethod
     def load_image(image_path: str) -> Optional[QPixmap]:
         """加载图片资源
@@ -28,16 +47,72 @@ class ResourceLoader:
             if not image_path:
                 return None
             
-            pixmap = QPixmap(image_path)
-            if pixmap.isNull():
+            image = QImage(image_path)
+            if image.isNull():
                 log_debug(f"加载图片失败: {image_path}")
                 return None
             
-            return pixmap
+            # 加载时统一转换一次像素格式，之后每帧绘制都走快速路径
+            return QPixmap.fromImage(ResourceLoader.normalize_image(image))
         except Exception as e:
             log_error(f"加载图片时发生错误: {e}")
             return None
     
+    @staticmethod
+    def read_image_scaled(image_path: str, target_size: QSize,
+                          aspect_mode=Qt.KeepAspectRatioByExpanding) -> Optional[QImage]:
+        """按目标分辨率解码图片
+        
+        通过QImageReader.setScaledSize在解码阶段直接缩小图片，
+        避免先解码原图再缩放带来的耗时和内存占用。图片本身小于目标尺寸时按原图解码。
+        只使用QImage，可以在工作线程或无界面的进程中调用。
+        
+        Args:
+            image_path: 图片文件路径
+            target_size: 目标尺寸
+            aspect_mode: 宽高比模式，默认填满目标尺寸
+        
+        Returns:
+            Optional[QImage]: 加载的图片，如果加载失败则返回None
+        """
+        try:
+            if not image_path:
+                return None
+            
+            reader = QImageReader(image_path)
+            source_size = reader.size()
+            if source_size.isValid() and target_size.isValid():
+                scaled_size = source_size.scaled(target_size, aspect_mode)
+                # 只缩小不放大
+                if scaled_size.width() < source_size.width() and scaled_size.height() < source_size.height():
+                    reader.setScaledSize(scaled_size)
+            
+            image = reader.read()
+            if image.isNull():
+                log_debug(f"加载图片失败: {image_path}, {reader.errorString()}")
+                return None
+            
+            return ResourceLoader.normalize_image(image)
+        except Exception as e:
+            log_error(f"加载图片时发生错误: {e}")
+            return None
+    
+    @staticmethod
+    def load_image_scaled(image_path: str, target_size: QSize,
+                          aspect_mode=Qt.KeepAspectRatioByExpanding) -> Optional[QPixmap]:
+        """按目标分辨率解码图片并转换为QPixmap
+        
+        Args:
+            image_path: 图片文件路径
+            target_size: 目标尺寸
+            aspect_mode: 宽高比模式，默认填满目标尺寸
+        
+        Returns:
+            Optional[QPixmap]: 加载的图片，如果加载失败则返回None
+        """
+        image = ResourceLoader.read_image_scaled(image_path, target_size, aspect_mode)
+        return QPixmap.fromImage(image) if image is not None else None
+    
     @staticmethod
     def load_font(font_path: str, font_size: Optional[int] = None) -> Optional[QFont]:
         """加载字体资源
@@ -86,7 +161,7 @@ class ResourceLoader:
             return None
     
     @staticmethod
-    def create_media_content(file_path: str) -> Optional[QMediaContent]:
+    def create_media_content(file_path: str) -> Optional['QMediaContent']:
         """创建媒体内容
         
         Args:
@@ -105,6 +180,8 @@ class ResourceLoader:
                 log_debug(f"媒体文件不存在: {file_path}")
                 return None
             
+            # 多媒体模块需要系统音频库，只在创建音频时导入，图片相关的功能（如无界面渲染）不依赖它
+            from PyQt5.QtMultimedia import QMediaContent
             url = QUrl.fromLocalFile(file_path)
             return QMediaContent(url)
         except Exception as e:
@@ -2,6 +2,12 @@
 
 包含所有UI组件
 """
+from .canvas_layer import CanvasLayer, LayerGridIndex
 from .draggable_image_label import DraggableImageLabel
+from .resource_picker import ResourcePicker
+from .scene_navigator import SceneNavigator
+from .asset_report_dialog import AssetReportDialog
+from .batch_edit_dialog import BatchEditDialog
+from .validation_dialog import ValidationDialog
 
-__all__ = ['DraggableImageLabel']
\ No newline at end of file
+__all__ = ['CanvasLayer', 'LayerGridIndex', 'DraggableImageLabel', 'ResourcePicker', 'SceneNavigator', 'AssetReportDialog', 'BatchEditDialog', 'ValidationDialog']
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""素材引用报告
+
+查询素材被哪些场景使用，列出未使用的素材和缺失的文件
+"""
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QWidget, QLineEdit, QTreeView,
+    QLabel, QPushButton, QSplitter, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from utils.helpers.string_utils import truncate
+
+
+class ReportTableModel(QAbstractTableModel):
+    """报告表格模型，行数据为元组，显示文本在data()中按需生成"""
+    
+    def __init__(self, headers, parent=None):
+        """初始化报告表格模型
+        
+        Args:
+            headers: 列标题列表
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.headers = headers
+        self.rows = []
+    
+    def set_rows(self, rows):
+        """替换全部行
+        
+        Args:
+            rows: 行数据列表，每行为与列标题对应的元组
+        """
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """行数"""
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """列数"""
+        return 0 if parent.isValid() else len(self.headers)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """单元格的显示文本"""
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        return str(self.rows[index.row()][index.column()])
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """列标题"""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+
+def create_report_view(model):
+    """创建只读的报告表格视图（统一行高，结果很多时也只绘制可见的行）
+    
+    Args:
+        model: 报告表格模型
+    
+    Returns:
+        QTreeView: 表格视图
+    """
+    view = QTreeView()
+    view.setModel(model)
+    view.setRootIsDecorated(False)
+    view.setUniformRowHeights(True)
+    view.setAlternatingRowColors(True)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.header().setStretchLastSection(True)
+    return view
+
+
+class AssetReportDialog(QDialog):
+    """素材引用报告对话框（非模态）
+    
+    报告直接读取AssetReferenceIndex维护的结果集合，耗时只与结果数量有关；
+    表格使用统一行高的视图，结果很多时也只绘制可见的行。双击场景可跳转到该场景。
+    """
+    
+    # 用户要求跳转到某个场景（场景索引）
+    scene_requested = pyqtSignal(int)
+    # 用户要求重命名或移动素材（素材路径，空字符串表示选择一个目录移动）
+    move_requested = pyqtSignal(str)
+    # 用户要求撤销最近一次重命名或移动
+    rollback_requested = pyqtSignal()
+    
+    # 资源类型的显示名称
+    TYPE_NAMES = {
+        "background": "背景",
+        "portrait": "立绘",
+        "background_music": "BGM",
+        "sound": "音效",
+        "voice": "语音",
+        "font": "字体"
+    }
+    
+    def __init__(self, reference_index, scenes, parent=None):
+        """初始化素材引用报告对话框
+        
+        Args:
+            reference_index: 素材引用索引（AssetReferenceIndex）
+            scenes: 当前项目的场景列表
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.setWindowTitle("素材引用")
+        self.resize(760, 520)
+        self.reference_index = reference_index
+        self.scenes = scenes
+        
+        layout = QVBoxLayout(self)
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+        
+        # 引用查询：上方为被引用的素材，下方为选中素材的使用场景
+        usage_tab = QWidget()
+        usage_layout = QVBoxLayout(usage_tab)
+        self.asset_filter = QLineEdit()
+        self.asset_filter.setPlaceholderText("按路径筛选被引用的素材")
+        self.asset_filter.setClearButtonEnabled(True)
+        self.asset_filter.textChanged.connect(self.refresh_assets)
+        usage_layout.addWidget(self.asset_filter)
+        splitter = QSplitter(Qt.Vertical)
+        self.asset_model = ReportTableModel(["素材", "类型", "场景数"], self)
+        self.asset_view = create_report_view(self.asset_model)
+        self.asset_view.selectionModel().currentRowChanged.connect(self._on_asset_selected)
+        splitter.addWidget(self.asset_view)
+        self.usage_model = ReportTableModel(["场景", "说话人", "台词"], self)
+        self.usage_view = create_report_view(self.usage_model)
+        self.usage_view.doubleClicked.connect(self._on_usage_activated)
+        splitter.addWidget(self.usage_view)
+        usage_layout.addWidget(splitter)
+        usage_buttons = QHBoxLayout()
+        usage_buttons.addStretch(1)
+        self.btn_move_asset = QPushButton("重命名/移动…")
+        self.btn_move_asset.setToolTip("移动选中的素材文件，并改写所有引用它的场景")
+        self.btn_move_asset.clicked.connect(self._on_move_clicked)
+        usage_buttons.addWidget(self.btn_move_asset)
+        self.btn_move_directory = QPushButton("移动目录…")
+        self.btn_move_directory.setToolTip("移动或重命名整个素材目录，并改写所有引用其中文件的场景")
+        self.btn_move_directory.clicked.connect(lambda: self.move_requested.emit(""))
+        usage_buttons.addWidget(self.btn_move_directory)
+        self.btn_rollback = QPushButton("撤销上次移动")
+        self.btn_rollback.clicked.connect(self.rollback_requested.emit)
+        usage_buttons.addWidget(self.btn_rollback)
+        usage_layout.addLayout(usage_buttons)
+        self.tabs.addTab(usage_tab, "引用查询")
+        
+        # 未使用的素材
+        unused_tab = QWidget()
+        unused_layout = QVBoxLayout(unused_tab)
+        self.unused_label = QLabel()
+        unused_layout.addWidget(self.unused_label)
+        self.unused_model = ReportTableModel(["类型", "素材"], self)
+        unused_layout.addWidget(create_report_view(self.unused_model))
+        self.tabs.addTab(unused_tab, "未使用素材")
+        
+        # 缺失的文件
+        missing_tab = QWidget()
+        missing_layout = QVBoxLayout(missing_tab)
+        missing_header = QHBoxLayout()
+        self.missing_label = QLabel()
+        missing_header.addWidget(self.missing_label, 1)
+        self.btn_recheck = QPushButton("重新检查")
+        self.btn_recheck.setToolTip("重新检查所有被引用的文件是否存在（文件可能在程序外被删除）")
+        self.btn_recheck.clicked.connect(self.recheck_missing)
+        missing_header.addWidget(self.btn_recheck)
+        missing_layout.addLayout(missing_header)
+        self.missing_model = ReportTableModel(["类型", "文件", "场景数", "场景"], self)
+        self.missing_view = create_report_view(self.missing_model)
+        self.missing_view.doubleClicked.connect(self._on_missing_activated)
+        missing_layout.addWidget(self.missing_view)
+        self.tabs.addTab(missing_tab, "缺失文件")
+        
+        self.tabs.currentChanged.connect(self.refresh)
+        self.refresh()
+    
+    def type_name(self, resource_type):
+        """资源类型的显示名称"""
+        return self.TYPE_NAMES.get(resource_type, resource_type)
+    
+    def refresh(self, *args):
+        """刷新当前标签页的报告"""
+        tab = self.tabs.currentIndex()
+        if tab == 0:
+            self.refresh_assets()
+        elif tab == 1:
+            unused = self.reference_index.unused_assets()
+            self.unused_model.set_rows([(self.type_name(kind), path) for kind, path in unused])
+            self.unused_label.setText(f"资源目录中有 {len(unused)} 个素材没有被任何场景使用")
+        else:
+            missing = self.reference_index.missing_files()
+            self.missing_model.set_rows([
+                (self.type_name(kind), path, len(scene_indexes), self._scene_list_text(scene_indexes))
+                for kind, path, scene_indexes in missing
+            ])
+            self.missing_label.setText(f"有 {len(missing)} 个被引用的文件不存在，双击跳转到第一个引用它的场景")
+    
+    def refresh_assets(self, *args):
+        """按筛选文本列出被引用的素材"""
+        query = self.asset_filter.text().strip().lower()
+        self.asset_model.set_rows([
+            (path, self.type_name(kind), count)
+            for kind, path, count in self.reference_index.referenced_assets()
+            if not query or query in path.lower()
+        ])
+        self.usage_model.set_rows([])
+    
+    def show_where_used(self, path):
+        """切换到引用查询并列出使用指定素材的场景
+        
+        Args:
+            path: 素材路径
+        """
+        self.tabs.setCurrentIndex(0)
+        self.asset_filter.setText(path)
+        if self.asset_model.rowCount():
+            self.asset_view.setCurrentIndex(self.asset_model.index(0, 0))
+    
+    def _on_asset_selected(self, current, previous):
+        """列出使用选中素材的场景"""
+        if not current.isValid():
+            self.usage_model.set_rows([])
+            return
+        path = self.asset_model.rows[current.row()][0]
+        rows = []
+        for scene_index in self.reference_index.where_used(path):
+            scene = self.scenes[scene_index] if scene_index < len(self.scenes) else {}
+            text = " ".join(str(scene.get("text", "")).split())
+            rows.append((scene_index + 1, scene.get("character_name", ""), truncate(text, 60)))
+        self.usage_model.set_rows(rows)
+    
+    def _on_move_clicked(self):
+        """重命名或移动选中的素材"""
+        current = self.asset_view.currentIndex()
+        if current.isValid():
+            self.move_requested.emit(self.asset_model.rows[current.row()][0])
+    
+    def set_rollback_enabled(self, enabled):
+        """设置撤销按钮是否可用
+        
+        Args:
+            enabled: 是否有可撤销的操作
+        """
+        self.btn_rollback.setEnabled(enabled)
+    
+    def _on_usage_activated(self, index):
+        """双击使用场景时跳转"""
+        if index.isValid():
+            self.scene_requested.emit(self.usage_model.rows[index.row()][0] - 1)
+    
+    def _on_missing_activated(self, index):
+        """双击缺失文件时跳转到第一个引用它的场景"""
+        if index.isValid():
+            scene_indexes = self.reference_index.where_used(self.missing_model.rows[index.row()][1])
+            if scene_indexes:
+                self.scene_requested.emit(scene_indexes[0])
+    
+    def recheck_missing(self):
+        """重新检查所有被引用的文件"""
+        self.reference_index.recheck_missing()
+        self.refresh()
+    
+    @staticmethod
+    def _scene_list_text(scene_indexes, limit=5):
+        """场景编号列表的简短文本（编号从1开始）"""
+        text = ", ".join(str(scene_index + 1) for scene_index in scene_indexes[:limit])
+        if len(scene_indexes) > limit:
+            text += ", ..."
+        return text
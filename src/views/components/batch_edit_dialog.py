@@ -0,0 +1,204 @@
+"""批量编辑对话框
+
+按角色、素材、场景范围或关键字选择场景，批量修改字段或替换素材；先预览受影响的场景数量再执行
+"""
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QLineEdit, QComboBox,
+    QSpinBox, QCheckBox, QLabel, QPushButton
+)
+from PyQt5.QtCore import pyqtSignal
+from services.project.batch_edit import SceneSelector, SceneUpdate
+
+
+class BatchEditDialog(QDialog):
+    """批量编辑对话框（非模态）
+    
+    修改条件或内容后需要重新预览，预览显示选中和将被修改的场景数量，之后才能执行。
+    """
+    
+    # 用户要求预览（场景选择条件, 修改操作）
+    preview_requested = pyqtSignal(object, object)
+    # 用户确认执行（场景选择条件, 修改操作）
+    apply_requested = pyqtSignal(object, object)
+    
+    # 可以批量设置的字段：(显示名称, 字段位置)
+    FIELDS = [
+        ("背景", ("background",)),
+        ("BGM", ("audio", "bgm")),
+        ("音效", ("audio", "sound")),
+        ("语音", ("audio", "voice")),
+        ("字体", ("font", "path")),
+        ("字号", ("font", "size")),
+        ("角色名", ("character_name",))
+    ]
+    # 值为整数的字段
+    INTEGER_FIELDS = {("font", "size")}
+    
+    def __init__(self, scene_count, parent=None):
+        """初始化批量编辑对话框
+        
+        Args:
+            scene_count: 当前项目的场景数量（用于限定场景范围）
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.setWindowTitle("批量编辑")
+        self.resize(520, 0)
+        
+        layout = QVBoxLayout(self)
+        
+        # 选择条件
+        selector_group = QGroupBox("选择场景（同时满足所有填写的条件）")
+        selector_form = QFormLayout(selector_group)
+        self.character_input = QLineEdit()
+        self.character_input.setPlaceholderText("角色名完全一致")
+        selector_form.addRow("角色", self.character_input)
+        self.asset_input = QLineEdit()
+        self.asset_input.setPlaceholderText("引用该素材的场景")
+        selector_form.addRow("素材", self.asset_input)
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("台词或角色名包含的关键字")
+        selector_form.addRow("关键字", self.text_input)
+        range_layout = QHBoxLayout()
+        self.range_check = QCheckBox("第")
+        range_layout.addWidget(self.range_check)
+        self.range_start = QSpinBox()
+        range_layout.addWidget(self.range_start)
+        range_layout.addWidget(QLabel("至"))
+        self.range_end = QSpinBox()
+        range_layout.addWidget(self.range_end)
+        range_layout.addWidget(QLabel("个场景"))
+        range_layout.addStretch(1)
+        selector_form.addRow("范围", range_layout)
+        layout.addWidget(selector_group)
+        
+        # 修改内容
+        update_group = QGroupBox("修改")
+        update_form = QFormLayout(update_group)
+        field_layout = QHBoxLayout()
+        self.field_check = QCheckBox()
+        field_layout.addWidget(self.field_check)
+        self.field_combo = QComboBox()
+        self.field_combo.addItems([name for name, _ in self.FIELDS])
+        field_layout.addWidget(self.field_combo)
+        self.value_input = QLineEdit()
+        self.value_input.setPlaceholderText("新的值（素材字段留空表示清除）")
+        field_layout.addWidget(self.value_input, 1)
+        update_form.addRow("设置", field_layout)
+        replace_layout = QHBoxLayout()
+        self.replace_old_input = QLineEdit()
+        self.replace_old_input.setPlaceholderText("原素材路径")
+        replace_layout.addWidget(self.replace_old_input)
+        replace_layout.addWidget(QLabel("→"))
+        self.replace_new_input = QLineEdit()
+        self.replace_new_input.setPlaceholderText("新素材路径")
+        replace_layout.addWidget(self.replace_new_input)
+        update_form.addRow("替换素材", replace_layout)
+        layout.addWidget(update_group)
+        
+        self.preview_label = QLabel("填写条件和修改内容后点击预览")
+        self.preview_label.setWordWrap(True)
+        layout.addWidget(self.preview_label)
+        
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self.btn_preview = QPushButton("预览")
+        self.btn_preview.clicked.connect(lambda: self._emit(self.preview_requested))
+        buttons.addWidget(self.btn_preview)
+        self.btn_apply = QPushButton("执行")
+        self.btn_apply.setEnabled(False)
+        self.btn_apply.clicked.connect(lambda: self._emit(self.apply_requested))
+        buttons.addWidget(self.btn_apply)
+        layout.addLayout(buttons)
+        
+        # 条件或内容变化后需要重新预览
+        for line_edit in (self.character_input, self.asset_input, self.text_input, self.value_input,
+                          self.replace_old_input, self.replace_new_input):
+            line_edit.textChanged.connect(self._invalidate_preview)
+        for spin_box in (self.range_start, self.range_end):
+            spin_box.valueChanged.connect(self._invalidate_preview)
+        for check_box in (self.range_check, self.field_check):
+            check_box.toggled.connect(self._invalidate_preview)
+        self.field_combo.currentIndexChanged.connect(self._invalidate_preview)
+        self.set_scene_count(scene_count)
+    
+    def set_scene_count(self, scene_count):
+        """更新场景范围的上限
+        
+        Args:
+            scene_count: 当前项目的场景数量
+        """
+        for spin_box in (self.range_start, self.range_end):
+            spin_box.setRange(1, max(scene_count, 1))
+        if not self.range_check.isChecked():
+            self.range_end.setValue(max(scene_count, 1))
+    
+    def scene_selector(self):
+        """当前填写的场景选择条件
+        
+        Returns:
+            SceneSelector: 场景选择条件
+        """
+        scene_range = None
+        if self.range_check.isChecked():
+            scene_range = (self.range_start.value() - 1, self.range_end.value())
+        return SceneSelector(
+            character=self.character_input.text().strip(),
+            asset=self.asset_input.text().strip(),
+            scene_range=scene_range,
+            text=self.text_input.text().strip()
+        )
+    
+    def scene_update(self):
+        """当前填写的修改操作
+        
+        Returns:
+            SceneUpdate: 修改操作，值无法转换（如字号不是整数）时返回None
+        """
+        values = {}
+        if self.field_check.isChecked():
+            field = self.FIELDS[self.field_combo.currentIndex()][1]
+            value = self.value_input.text().strip()
+            if field in self.INTEGER_FIELDS:
+                try:
+                    value = int(value)
+                except ValueError:
+                    return None
+            values[field] = value
+        replace_assets = {}
+        old_path = self.replace_old_input.text().strip()
+        new_path = self.replace_new_input.text().strip()
+        if old_path and new_path:
+            replace_assets[old_path] = new_path
+        return SceneUpdate(values, replace_assets)
+    
+    def show_preview(self, plan):
+        """显示预览结果
+        
+        Args:
+            plan: 批量编辑计划（BatchEditPlan）
+        """
+        self.preview_label.setText(plan.summary())
+        self.btn_apply.setEnabled(plan.ok)
+    
+    def show_applied(self, plan):
+        """显示执行结果，再次执行前需要重新预览
+        
+        Args:
+            plan: 已执行的批量编辑计划（BatchEditPlan）
+        """
+        self.preview_label.setText(f"已完成: {plan.summary()}")
+        self.btn_apply.setEnabled(False)
+    
+    def _emit(self, signal):
+        """发出预览或执行请求"""
+        update = self.scene_update()
+        if update is None:
+            self.preview_label.setText(f"{self.field_combo.currentText()}必须是整数")
+            self.btn_apply.setEnabled(False)
+            return
+        signal.emit(self.scene_selector(), update)
+    
+    def _invalidate_preview(self, *args):
+        """条件或内容变化后禁用执行，直到重新预览"""
+        self.btn_apply.setEnabled(False)
@@ -0,0 +1,177 @@
+"""画布图层
+
+预览画布的保留式图层结构和用于命中测试的空间网格索引
+"""
+from PyQt5.QtCore import Qt, QPoint, QRect, QSize
+from PyQt5.QtGui import QImage
+
+
+# 透明度遮罩的降采样步长（画布像素）
+MASK_STEP = 4
+
+# 命中测试的透明度阈值，低于该值视为透明
+ALPHA_THRESHOLD = 16
+
+
+class CanvasLayer:
+    """画布图层，保存一个立绘在画布坐标系下的状态和显示缓存"""
+    
+    def __init__(self, index, z=None):
+        """初始化画布图层
+        
+        Args:
+            index: 图层索引（与立绘索引一致）
+            z: 叠放顺序，数值越大越靠上，默认与索引相同
+        """
+        self.index = index
+        self.z = index if z is None else z
+        self.pixmap = None  # 画布坐标系下缩放后的图片
+        self.source = None  # (原始图片, 目标宽度, 目标高度)
+        self.position = QPoint(0, 0)  # 未裁剪图片左上角的位置
+        self.offset = QPoint(0, 0)  # 裁剪后图片相对于未裁剪图片左上角的偏移
+        self.full_size = QSize()  # 未裁剪图片缩放后的尺寸
+        self.scale_factor = 1.0
+        self.display_cache = None  # (显示缩放比例, 是否平滑, 图片)
+        self.alpha_mask = None  # 降采样透明度遮罩 (数据, 每行字节数, 宽度, 高度)
+    
+    @property
+    def visible(self):
+        """图层是否有可显示的图片"""
+        return self.pixmap is not None
+    
+    def rect(self):
+        """图层（裁剪后图片）在画布坐标系下的区域
+        
+        Returns:
+            QRect: 图层区域，无图片时返回空矩形
+        """
+        if self.pixmap is None:
+            return QRect()
+        return QRect(self.position + self.offset, self.pixmap.size())
+    
+    def set_pixmap(self, pixmap):
+        """更新图层图片并使显示缓存失效
+        
+        Args:
+            pixmap: 画布坐标系下的图片
+        """
+        self.pixmap = pixmap
+        self.display_cache = None
+        self.alpha_mask = None
+    
+    def clear(self):
+        """清空图层图片"""
+        self.pixmap = None
+        self.source = None
+        self.display_cache = None
+        self.alpha_mask = None
+    
+    def build_alpha_mask(self):
+        """预先计算降采样的透明度遮罩，与图片一起缓存
+        
+        遮罩按MASK_STEP降采样并使用平滑缩放，细小的不透明区域也能保留下来。
+        """
+        if self.pixmap is None or self.alpha_mask is not None:
+            return
+        width = max(1, self.pixmap.width() // MASK_STEP)
+        height = max(1, self.pixmap.height() // MASK_STEP)
+        image = self.pixmap.toImage()
+        if not image.hasAlphaChannel():
+            # 不透明图片不需要遮罩
+            self.alpha_mask = ()
+            return
+        image = image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        image = image.convertToFormat(QImage.Format_Alpha8)
+        bits = image.constBits()
+        bits.setsize(image.byteCount())
+        self.alpha_mask = (bytes(bits), image.bytesPerLine(), image.width(), image.height())
+    
+    def hit_test(self, x, y):
+        """判断画布坐标处是否命中图层的不透明区域
+        
+        Args:
+            x: 画布x坐标
+            y: 画布y坐标
+        
+        Returns:
+            bool: 是否命中
+        """
+        rect = self.rect()
+        if self.pixmap is None or not rect.contains(x, y):
+            return False
+        self.build_alpha_mask()
+        if not self.alpha_mask:
+            return True
+        data, bytes_per_line, width, height = self.alpha_mask
+        column = min(width - 1, (x - rect.x()) // MASK_STEP)
+        row = min(height - 1, (y - rect.y()) // MASK_STEP)
+        return data[row * bytes_per_line + column] >= ALPHA_THRESHOLD
+
+
+class LayerGridIndex:
+    """均匀网格空间索引，将画布划分为固定大小的单元格，记录每个单元格覆盖的图层
+    
+    点查询只需访问一个单元格，代价与图层总数无关。
+    """
+    
+    def __init__(self, cell_size=128):
+        """初始化网格索引
+        
+        Args:
+            cell_size: 单元格边长（画布像素）
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (列, 行) -> 图层键集合
+        self.layer_cells = {}  # 图层键 -> 占用的单元格列表
+    
+    def _cell_range(self, rect):
+        """计算矩形覆盖的单元格范围"""
+        size = self.cell_size
+        return (
+            range(rect.left() // size, rect.right() // size + 1),
+            range(rect.top() // size, rect.bottom() // size + 1)
+        )
+    
+    def update(self, key, rect):
+        """更新图层在索引中的区域
+        
+        Args:
+            key: 图层键
+            rect: 图层在画布坐标系下的区域，空矩形表示移除
+        """
+        self.remove(key)
+        if rect.isEmpty():
+            return
+        
+        columns, rows = self._cell_range(rect)
+        occupied = []
+        for column in columns:
+            for row in rows:
+                self.cells.setdefault((column, row), set()).add(key)
+                occupied.append((column, row))
+        self.layer_cells[key] = occupied
+    
+    def remove(self, key):
+        """从索引中移除图层
+        
+        Args:
+            key: 图层键
+        """
+        for cell in self.layer_cells.pop(key, ()):
+            keys = self.cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+    
+    def query(self, x, y):
+        """查询可能包含指定点的图层
+        
+        Args:
+            x: 画布x坐标
+            y: 画布y坐标
+        
+        Returns:
+            set: 候选图层键集合
+        """
+        return self.cells.get((x // self.cell_size, y // self.cell_size), set())
@@ -2,10 +2,24 @@
 
 用于显示和拖动背景和立绘
 """
+import time
+from collections import OrderedDict
 from PyQt5.QtWidgets import QLabel
-from PyQt5.QtCore import Qt, QPoint, pyqtSignal
+from PyQt5.QtCore import Qt, QPoint, QRect, QSize, QTimer, pyqtSignal
 from PyQt5.QtGui import QPixmap, QPainter
 
+from utils.helpers.logger import log_debug
+from utils.helpers.perf_stats import LatencyCounter, EventCounter
+from services.render.scene_compositor import CANVAS_WIDTH, CANVAS_HEIGHT, background_rect, clamp_portrait_position
+from views.components.canvas_layer import CanvasLayer, LayerGridIndex
+
+
+# 缓存的画布背景数量（按背景和画布尺寸区分）
+BACKGROUND_CACHE_SIZE = 4
+
+# 缓存的显示缩放背景数量（按背景、画布尺寸和显示缩放比例区分）
+BACKGROUND_DISPLAY_CACHE_SIZE = 4
+
 
 class DraggableImageLabel(QLabel):
     """可拖动图像标签组件，用于显示和拖动背景和立绘"""
@@ -13,24 +27,220 @@ class DraggableImageLabel(QLabel):
     # 添加信号：立绘位置变化信号
     portrait_position_changed = pyqtSignal(int, int, int, int, int)  # 索引, old_x, old_y, new_x, new_y
     
-    def __init__(self, max_portraits=4):
+    def __init__(self, max_portraits=4, refine_delay=150):
         """初始化可拖动图像标签
         
         Args:
-            max_portraits: 最大立绘数量
+            max_portraits: 最大立绘（图层）数量
+            refine_delay: 交互停止后执行平滑重绘的延迟（毫秒）
         """
         super().__init__()
         self.background = None
-        self.portraits = [None] * max_portraits  # 立绘列表
-        self.portrait_positions = [QPoint(0, 0)] * max_portraits
-        self.scale_factors = [1.0] * max_portraits  # 默认缩放比例的列表
-        self.current_drag_index = 0
+        self.background_key = None  # 当前背景的缓存键 (背景键, 画布宽度, 画布高度)
+        self.max_layers = max_portraits
+        # 保留式图层结构：按需创建图层，按叠放顺序绘制
+        self.layers = {}  # 立绘索引 -> CanvasLayer
+        self.draw_order = []  # 按叠放顺序从下到上排列的图层
+        self.hit_index = LayerGridIndex()  # 用于命中测试的空间网格索引
+        self.drag_layer = None
         self.drag_start_pos = None
+        self.drag_origin = None
         self.setAcceptDrops(True)
         # 默认画布尺寸为1280×720
-        self.canvas_width = 1280
-        self.canvas_height = 720
+        self.canvas_width = CANVAS_WIDTH
+        self.canvas_height = CANVAS_HEIGHT
         self.display_scale = 1.0
+        
+        # 渐进式渲染：交互过程中使用快速缩放，停止交互后再平滑重绘
+        self.pending_refine = set()  # 等待平滑重绘的立绘索引
+        self.smooth_display = True  # 当前显示是否为平滑质量
+        self.refine_timer = QTimer(self)
+        self.refine_timer.setSingleShot(True)
+        self.refine_timer.setInterval(refine_delay)
+        self.refine_timer.timeout.connect(self.refine)
+        
+        # 保留式合成：按背景和画布尺寸缓存合成好的画布背景，
+        # 再按显示缩放比例缓存缩放后的背景 (显示缩放比例, 是否平滑, 图片)，
+        # 调整窗口大小和切换全屏时只需拷贝缓存
+        self.background_cache = OrderedDict()  # 背景缓存键 -> 画布背景
+        self.background_display_cache = OrderedDict()  # (背景缓存键, 显示缩放比例) -> 显示缓存
+        
+        # 帧节奏的拖动：合并同一帧内的鼠标移动事件，每帧最多应用一次
+        self.pending_drag_pos = None  # 尚未应用的最新鼠标位置
+        self.pending_drag_time = None  # 第一个未应用移动事件的时间
+        self.latency_start = None  # 已应用但尚未绘制的移动事件时间
+        self.coalesced_moves = 0  # 本次拖动被合并掉的移动事件数
+        self.last_drag_frame = 0.0  # 上一次应用拖动的时间
+        self.frame_interval = 16  # 一帧的时长（毫秒）
+        self.drag_latency = LatencyCounter()  # 事件到像素的延迟统计
+        self.drag_frame_timer = QTimer(self)
+        self.drag_frame_timer.setSingleShot(True)
+        self.drag_frame_timer.setTimerType(Qt.PreciseTimer)
+        self.drag_frame_timer.timeout.connect(self.apply_pending_drag)
+        
+        # 绘制统计：重绘次数、背景合成次数和立绘缩放次数
+        self.paint_stats = EventCounter()
+    
+    def _frame_interval(self):
+        """根据屏幕刷新率计算一帧的时长（毫秒）"""
+        window = self.window().windowHandle()
+        screen = window.screen() if window is not None else None
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        if refresh_rate <= 0:
+            refresh_rate = 60
+        return max(1, int(1000 / refresh_rate))
+    
+    def _layer(self, index, create=False):
+        """获取指定索引的图层
+        
+        Args:
+            index: 立绘索引
+            create: 图层不存在时是否创建
+        
+        Returns:
+            CanvasLayer: 图层，不存在且不创建时返回None
+        """
+        layer = self.layers.get(index)
+        if layer is None and create:
+            layer = CanvasLayer(index)
+            self.layers[index] = layer
+            self._update_draw_order()
+        return layer
+    
+    def _update_draw_order(self):
+        """按叠放顺序重新排列图层（z相同时按索引排列）"""
+        self.draw_order = sorted(self.layers.values(), key=lambda layer: (layer.z, layer.index))
+    
+    def set_layer_z(self, index, z):
+        """设置图层的叠放顺序
+        
+        Args:
+            index: 立绘索引
+            z: 叠放顺序，数值越大越靠上
+        """
+        if not 0 <= index < self.max_layers:
+            return
+        layer = self._layer(index)
+        if layer is None:
+            if z == index:
+                return
+            layer = self._layer(index, create=True)
+        elif layer.z == z:
+            return
+        layer.z = z
+        self._update_draw_order()
+        self.update(self.layer_display_rect(layer))
+    
+    def get_layer_z(self, index):
+        """获取图层的叠放顺序
+        
+        Args:
+            index: 立绘索引
+        
+        Returns:
+            叠放顺序，图层不存在时与索引相同
+        """
+        layer = self.layers.get(index)
+        return index if layer is None else layer.z
+    
+    def schedule_refine(self):
+        """标记当前显示为快速质量，并在交互停止后执行平滑重绘"""
+        self.smooth_display = False
+        self.refine_timer.start()
+    
+    def refine(self):
+        """交互停止后的平滑重绘：平滑重新缩放快速缩放过的立绘并刷新显示"""
+        for index in self.pending_refine:
+            layer = self.layers.get(index)
+            if layer is not None and layer.source is not None:
+                layer.set_pixmap(self._scale_portrait(*layer.source, Qt.SmoothTransformation))
+                # 空闲时预先计算命中测试用的透明度遮罩
+                layer.build_alpha_mask()
+        self.pending_refine.clear()
+        self.smooth_display = True
+        self.update_display()
+    
+    @staticmethod
+    def _scale_portrait(pixmap, width, height, transform_mode):
+        """将立绘缩放到目标尺寸，尺寸一致时直接复用原图"""
+        if pixmap.width() == width and pixmap.height() == height:
+            return pixmap
+        return pixmap.scaled(width, height, Qt.KeepAspectRatio, transform_mode)
+    
+    def _canvas_offset(self):
+        """计算画布在控件中居中显示的偏移
+        
+        Returns:
+            tuple: (offset_x, offset_y)
+        """
+        offset_x = (self.width() - int(self.canvas_width * self.display_scale)) // 2
+        offset_y = (self.height() - int(self.canvas_height * self.display_scale)) // 2
+        return offset_x, offset_y
+    
+    def _to_canvas(self, pos):
+        """将控件坐标转换为画布坐标
+        
+        Args:
+            pos: 控件坐标
+        
+        Returns:
+            tuple: (canvas_x, canvas_y)
+        """
+        offset_x, offset_y = self._canvas_offset()
+        canvas_x = int((pos.x() - offset_x) / self.display_scale)
+        canvas_y = int((pos.y() - offset_y) / self.display_scale)
+        return canvas_x, canvas_y
+    
+    def _display_layer(self, cache, pixmap):
+        """获取缩放到显示尺寸的图层，缓存有效时直接复用
+        
+        平滑缓存在任何时候都可复用；快速缓存只在交互过程中复用，
+        平滑重绘时会重新生成。
+        
+        Args:
+            cache: 现有缓存 (显示缩放比例, 是否平滑, 图片)
+            pixmap: 画布坐标系下的图层图片
+        
+        Returns:
+            tuple: 新的缓存
+        """
+        if cache and cache[0] == self.display_scale and (cache[1] or not self.smooth_display):
+            return cache
+        width = max(1, round(pixmap.width() * self.display_scale))
+        height = max(1, round(pixmap.height() * self.display_scale))
+        transform_mode = Qt.SmoothTransformation if self.smooth_display else Qt.FastTransformation
+        return self.display_scale, self.smooth_display, pixmap.scaled(width, height, Qt.IgnoreAspectRatio, transform_mode)
+    
+    def layer_display_rect(self, layer):
+        """计算图层在控件坐标系下的显示区域
+        
+        Args:
+            layer: 图层
+        
+        Returns:
+            QRect: 显示区域，无图片时返回空矩形
+        """
+        if layer is None or not layer.visible:
+            return QRect()
+        offset_x, offset_y = self._canvas_offset()
+        top_left = layer.position + layer.offset
+        return QRect(
+            offset_x + round(top_left.x() * self.display_scale),
+            offset_y + round(top_left.y() * self.display_scale),
+            max(1, round(layer.pixmap.width() * self.display_scale)),
+            max(1, round(layer.pixmap.height() * self.display_scale))
+        )
+    
+    def portrait_display_rect(self, index):
+        """计算立绘在控件坐标系下的显示区域
+        
+        Args:
+            index: 立绘索引
+        
+        Returns:
+            QRect: 显示区域，无立绘时返回空矩形
+        """
+        return self.layer_display_rect(self.layers.get(index))
     
     def set_canvas_size(self, width, height):
         """设置内部画布尺寸
@@ -46,7 +256,7 @@ class DraggableImageLabel(QLabel):
             self.display_scale = min(self.width() / width, self.height() / height)
         # 重新绘制显示
         self.update_display()
-
+    
     def resizeEvent(self, event):
         """处理控件大小变化事件"""
         # 调用父类方法
@@ -60,106 +270,239 @@ class DraggableImageLabel(QLabel):
         else:
             self.display_scale = 1.0
         
-        # 刷新显示
+        # 调整大小过程中快速刷新显示，停止调整后再平滑重绘；
+        # 尚未显示时（如窗口首次显示前的布局）直接平滑绘制，避免首次切换场景时多一次重绘
+        if self.isVisible():
+            self.schedule_refine()
         self.update_display()
     
-    def set_background(self, pixmap):
+    @staticmethod
+    def _cache_put(cache, key, value, limit):
+        """写入LRU缓存并淘汰最久未使用的条目"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+    
+    def show_cached_background(self, key):
+        """使用已缓存的画布背景，命中时无需重新加载和合成
+        
+        Args:
+            key: 背景键（通常为背景图片路径）
+        
+        Returns:
+            bool: 是否命中缓存
+        """
+        cache_key = (key, self.canvas_width, self.canvas_height)
+        background = self.background_cache.get(cache_key)
+        if background is None:
+            return False
+        self.background_cache.move_to_end(cache_key)
+        if cache_key != self.background_key:
+            self.background = background
+            self.background_key = cache_key
+            self.update_display()
+        return True
+    
+    def set_background(self, pixmap, key=None):
         """设置背景图片
         
         Args:
             pixmap: 背景图片
+            key: 背景键（通常为背景图片路径），提供时按背景和画布尺寸缓存合成结果
         """
         # 处理"无背景"：清空背景图片，恢复默认背景色
         if pixmap is None:
             self.background = None
+            self.background_key = None
             self.update_display()
             return
+        
+        if key is not None and self.show_cached_background(key):
+            return
 
-        # 背景缩放逻辑：基于固定的画布尺寸进行缩放
+        # 背景缩放逻辑：基于固定的画布尺寸填满画布并居中（与离屏渲染共用同一规则）
+        target_rect = background_rect(pixmap.size(), self.canvas_width, self.canvas_height)
         scaled_pixmap = pixmap.scaled(
-            self.canvas_width, self.canvas_height,  # 按画布尺寸缩放
-            Qt.KeepAspectRatioByExpanding,  # 填满画布
+            target_rect.size(),
+            Qt.IgnoreAspectRatio,
             Qt.SmoothTransformation  # 平滑缩放，避免锯齿
         )
-
+        
         # 创建与画布匹配的QPixmap
         self.background = QPixmap(self.canvas_width, self.canvas_height)
-        self.background.fill(Qt.transparent)  # 透明底色，避免干扰
-
+        if pixmap.hasAlphaChannel():
+            self.background.fill(Qt.transparent)  # 透明底色，避免干扰
+        else:
+            # 不透明背景会填满画布，使用不透明底色让画布保持RGB32格式，绘制时无需混合
+            self.background.fill(Qt.black)
+        
         # 居中绘制（超出部分自动裁剪，确保视觉居中）
+        self.paint_stats.increment("background_composite")
         painter = QPainter(self.background)
-        offset_x = (self.canvas_width - scaled_pixmap.width()) // 2
-        offset_y = (self.canvas_height - scaled_pixmap.height()) // 2
-        painter.drawPixmap(offset_x, offset_y, scaled_pixmap)
+        painter.drawPixmap(target_rect.topLeft(), scaled_pixmap)
         painter.end()
-
+        
+        if key is None:
+            # 未提供背景键时不缓存合成结果，使用唯一的键区分显示缓存
+            self.background_key = (object(), self.canvas_width, self.canvas_height)
+        else:
+            self.background_key = (key, self.canvas_width, self.canvas_height)
+            self._cache_put(self.background_cache, self.background_key, self.background, BACKGROUND_CACHE_SIZE)
         self.update_display()
     
-    def set_portrait(self, pixmap, index=0, scale_factor=1.0):
+    def set_portrait(self, pixmap, index=0, scale_factor=1.0, target_size=None, interactive=False,
+                     offset=None, full_size=None):
         """设置立绘图片
         
         Args:
-            pixmap: 立绘图片
+            pixmap: 立绘图片（可以是裁掉透明边距后的图片）
             index: 立绘索引
-            scale_factor: 缩放比例
+            scale_factor: 缩放比例（相对于传入的图片）
+            target_size: 缩放后的目标尺寸(宽, 高)，指定时优先于scale_factor
+            interactive: 是否为交互过程中的更新（如拖动滑块），
+                为True时使用快速缩放，并在交互停止后平滑重绘
+            offset: 裁剪后图片相对于未裁剪图片左上角的偏移(x, y)，默认不偏移
+            full_size: 未裁剪图片缩放后的尺寸(宽, 高)，用于位置边界限制，默认等于target_size
         """
-        if index >= len(self.portraits):
+        if not 0 <= index < self.max_layers:
             return
-
+        
         # 添加None值检查
-        if pixmap is None:
-            self.portraits[index] = None
-            self.update_display()
+        if pixmap is None or pixmap.isNull():
+            layer = self.layers.get(index)
+            if layer is not None:
+                dirty_rect = self.layer_display_rect(layer)
+                layer.clear()
+                self.hit_index.remove(index)
+                self.pending_refine.discard(index)
+                self.update(dirty_rect)
             return
-
-        if pixmap.isNull():
-            self.portraits[index] = None
-            self.update_display()
-            return
-
-        self.scale_factors[index] = scale_factor
-        scaled_pixmap = pixmap.scaled(
-            int(pixmap.width() * scale_factor),
-            int(pixmap.height() * scale_factor),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        self.portraits[index] = scaled_pixmap
-        self.update_display()
+        
+        layer = self._layer(index, create=True)
+        old_rect = self.layer_display_rect(layer)
+        self.paint_stats.increment("portrait_scale")
+        layer.scale_factor = scale_factor
+        if target_size is None:
+            target_size = (int(pixmap.width() * scale_factor), int(pixmap.height() * scale_factor))
+        layer.source = (pixmap, target_size[0], target_size[1])
+        layer.offset = QPoint(*(offset or (0, 0)))
+        layer.full_size = QSize(*(full_size or target_size))
+        
+        if interactive:
+            # 交互过程中快速缩放，保证每帧的响应时间
+            layer.set_pixmap(self._scale_portrait(pixmap, *target_size, Qt.FastTransformation))
+            self.pending_refine.add(index)
+            self.schedule_refine()
+        else:
+            layer.set_pixmap(self._scale_portrait(pixmap, *target_size, Qt.SmoothTransformation))
+            layer.build_alpha_mask()
+            self.pending_refine.discard(index)
+        
+        self.hit_index.update(index, layer.rect())
+        self.update(old_rect.united(self.layer_display_rect(layer)))
     
     def update_display(self):
-        """刷新显示"""
-        pixmap = QPixmap(self.size())
-        pixmap.fill(Qt.transparent)
-
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)  # 启用抗锯齿
+        """刷新显示（整个控件重绘）"""
+        self.update()
+    
+    def paintEvent(self, event):
+        """绘制事件：只重绘脏区域内的背景和图层
         
-        # 计算居中偏移，使画布在控件中居中显示
-        offset_x = (self.width() - int(self.canvas_width * self.display_scale)) // 2
-        offset_y = (self.height() - int(self.canvas_height * self.display_scale)) // 2
+        Args:
+            event: 绘制事件
+        """
+        # 绘制边框
+        super().paintEvent(event)
+        self.paint_stats.increment("paint")
+        
+        dirty_rect = event.rect()
+        offset_x, offset_y = self._canvas_offset()
+        
+        painter = QPainter(self)
+        painter.setClipRect(dirty_rect)
         
-        # 绘制背景（如果有）
+        # 绘制背景（如果有）：只从缓存中拷贝脏区域对应的部分
         if self.background:
-            # 缩放背景到显示尺寸并居中绘制
-            painter.save()
-            painter.translate(offset_x, offset_y)
-            painter.scale(self.display_scale, self.display_scale)
-            painter.drawPixmap(0, 0, self.background)
-            painter.restore()
-
-        # 绘制所有立绘
-        for i, portrait in enumerate(self.portraits):
-            if portrait:
-                # 缩放立绘到显示尺寸并在正确位置绘制
-                painter.save()
-                painter.translate(offset_x, offset_y)
-                painter.scale(self.display_scale, self.display_scale)
-                painter.drawPixmap(self.portrait_positions[i], portrait)
-                painter.restore()
-
+            cache_key = (self.background_key, self.display_scale)
+            cache = self.background_display_cache.get(cache_key)
+            display_cache = self._display_layer(cache, self.background)
+            if display_cache is cache:
+                self.background_display_cache.move_to_end(cache_key)
+            else:
+                self._cache_put(self.background_display_cache, cache_key, display_cache, BACKGROUND_DISPLAY_CACHE_SIZE)
+            background = display_cache[2]
+            background_rect = QRect(offset_x, offset_y, background.width(), background.height())
+            target_rect = background_rect.intersected(dirty_rect)
+            if not target_rect.isEmpty():
+                painter.drawPixmap(target_rect, background, target_rect.translated(-offset_x, -offset_y))
+        
+        # 按叠放顺序从下到上绘制与脏区域相交的图层
+        for layer in self.draw_order:
+            if not layer.visible:
+                continue
+            layer_rect = self.layer_display_rect(layer)
+            if not layer_rect.intersects(dirty_rect):
+                continue
+            layer.display_cache = self._display_layer(layer.display_cache, layer.pixmap)
+            painter.drawPixmap(layer_rect.topLeft(), layer.display_cache[2])
+        
         painter.end()
-        self.setPixmap(pixmap)
+        
+        # 记录拖动事件到像素的延迟
+        if self.latency_start is not None:
+            self.drag_latency.record_since(self.latency_start)
+            self.latency_start = None
+    
+    def layer_at(self, canvas_x, canvas_y):
+        """查找画布坐标处最上层的不透明图层
+        
+        通过空间网格只检查覆盖该点的图层，并按叠放顺序从上到下使用透明度遮罩判断，
+        点击前景立绘的透明区域时会命中其后方的立绘。
+        
+        Args:
+            canvas_x: 画布x坐标
+            canvas_y: 画布y坐标
+        
+        Returns:
+            CanvasLayer: 命中的图层，没有命中时返回None
+        """
+        candidates = [self.layers[index] for index in self.hit_index.query(canvas_x, canvas_y)]
+        # 从上到下检查候选图层
+        for layer in sorted(candidates, key=lambda layer: (layer.z, layer.index), reverse=True):
+            if layer.hit_test(canvas_x, canvas_y):
+                return layer
+        return None
+    
+    def _clamp_position(self, layer, x, y):
+        """限制图层位置：允许图层超出画布边界一半的宽度和高度
+        
+        Args:
+            layer: 图层
+            x: x坐标 - 基于画布坐标系统
+            y: y坐标 - 基于画布坐标系统
+        
+        Returns:
+            tuple: 修正后的(x, y)
+        """
+        # 使用未裁剪的完整尺寸，保持位置语义不变（与离屏渲染共用同一规则）
+        return clamp_portrait_position(
+            x, y, layer.full_size.width(), layer.full_size.height(), self.canvas_width, self.canvas_height
+        )
+    
+    def _move_layer(self, layer, x, y):
+        """移动图层，并只重绘移动前后区域的并集
+        
+        Args:
+            layer: 图层
+            x: x坐标 - 基于画布坐标系统
+            y: y坐标 - 基于画布坐标系统
+        """
+        old_rect = self.layer_display_rect(layer)
+        layer.position = QPoint(x, y)
+        if layer.visible:
+            self.hit_index.update(layer.index, layer.rect())
+        self.update(old_rect.united(self.layer_display_rect(layer)))
     
     def mousePressEvent(self, event):
         """鼠标按下事件
@@ -168,22 +511,18 @@ class DraggableImageLabel(QLabel):
             event: 鼠标事件
         """
         if event.button() == Qt.LeftButton:
-            # 计算居中偏移
-            offset_x = (self.width() - int(self.canvas_width * self.display_scale)) // 2
-            offset_y = (self.height() - int(self.canvas_height * self.display_scale)) // 2
-            
             # 转换为画布坐标
-            canvas_x = (event.pos().x() - offset_x) / self.display_scale
-            canvas_y = (event.pos().y() - offset_y) / self.display_scale
+            canvas_x, canvas_y = self._to_canvas(event.pos())
             
-            # 检查点击位置是否在立绘上
-            for i, portrait in enumerate(self.portraits):
-                if portrait:
-                    portrait_rect = portrait.rect().translated(self.portrait_positions[i])
-                    if portrait_rect.contains(canvas_x, canvas_y):
-                        self.current_drag_index = i
-                        self.drag_start_pos = QPoint(canvas_x, canvas_y) - self.portrait_positions[i]
-                        break
+            # 检查点击位置是否在立绘上（从最上层开始）
+            layer = self.layer_at(canvas_x, canvas_y)
+            if layer is not None:
+                self.drag_layer = layer
+                self.drag_origin = QPoint(layer.position)
+                self.drag_start_pos = QPoint(canvas_x, canvas_y) - layer.position
+                self.frame_interval = self._frame_interval()
+                self.drag_latency.reset()
+                self.coalesced_moves = 0
     
     def mouseMoveEvent(self, event):
         """鼠标移动事件
@@ -191,36 +530,35 @@ class DraggableImageLabel(QLabel):
         Args:
             event: 鼠标事件
         """
-        if self.drag_start_pos is not None and self.portraits[self.current_drag_index]:
-            # 计算居中偏移
-            offset_x = (self.width() - int(self.canvas_width * self.display_scale)) // 2
-            offset_y = (self.height() - int(self.canvas_height * self.display_scale)) // 2
-            
-            # 转换为画布坐标
-            canvas_x = (event.pos().x() - offset_x) / self.display_scale
-            canvas_y = (event.pos().y() - offset_y) / self.display_scale
-            
-            # 计算新位置
-            new_pos = QPoint(canvas_x, canvas_y) - self.drag_start_pos
-            
-            # 获取当前立绘
-            current_portrait = self.portraits[self.current_drag_index]
-            
-            # 添加边界限制：允许立绘适当超出边界
-            # 限制x：允许立绘超出边界一半宽度
-            min_x = - current_portrait.width() // 2
-            max_x = self.canvas_width - current_portrait.width() // 2
-            # 限制y：允许立绘超出边界一半高度
-            min_y = - current_portrait.height() // 2
-            max_y = self.canvas_height - current_portrait.height() // 2
-            
-            # 修正位置（确保在边界内）
-            new_pos_x = max(min_x, min(new_pos.x(), max_x))
-            new_pos_y = max(min_y, min(new_pos.y(), max_y))
-            new_pos = QPoint(new_pos_x, new_pos_y)
-            
-            self.portrait_positions[self.current_drag_index] = new_pos
-            self.update_display()
+        if self.drag_start_pos is not None and self.drag_layer is not None:
+            # 只记录最新位置，由帧定时器每帧最多应用一次
+            if self.pending_drag_pos is None:
+                self.pending_drag_time = time.perf_counter()
+            else:
+                self.coalesced_moves += 1
+            self.pending_drag_pos = event.pos()
+            if not self.drag_frame_timer.isActive():
+                # 距上一帧已超过一帧时长时在下一轮事件循环立即应用，否则等到下一帧
+                elapsed_ms = (self.pending_drag_time - self.last_drag_frame) * 1000.0
+                self.drag_frame_timer.start(max(0, int(self.frame_interval - elapsed_ms)))
+    
+    def apply_pending_drag(self):
+        """应用本帧累积的拖动位置，只重绘移动前后区域的并集"""
+        pos = self.pending_drag_pos
+        layer = self.drag_layer
+        self.pending_drag_pos = None
+        if pos is None or self.drag_start_pos is None or layer is None or not layer.visible:
+            return
+        
+        # 转换为画布坐标
+        canvas_x, canvas_y = self._to_canvas(pos)
+        
+        # 计算新位置，并添加边界限制
+        new_pos = QPoint(canvas_x, canvas_y) - self.drag_start_pos
+        new_x, new_y = self._clamp_position(layer, new_pos.x(), new_pos.y())
+        self.latency_start = self.pending_drag_time
+        self.last_drag_frame = time.perf_counter()
+        self._move_layer(layer, new_x, new_y)
     
     def mouseReleaseEvent(self, event):
         """鼠标释放事件
@@ -229,27 +567,23 @@ class DraggableImageLabel(QLabel):
             event: 鼠标事件
         """
         if event.button() == Qt.LeftButton:
-            # 保存拖动后的位置
-            pos = self.portrait_positions[self.current_drag_index]
-            
-            # 计算居中偏移
-            offset_x = (self.width() - int(self.canvas_width * self.display_scale)) // 2
-            offset_y = (self.height() - int(self.canvas_height * self.display_scale)) // 2
-            
-            # 转换为画布坐标
-            canvas_x = (event.pos().x() - offset_x) / self.display_scale
-            canvas_y = (event.pos().y() - offset_y) / self.display_scale
+            # 立即应用尚未处理的移动，确保最终位置与鼠标一致
+            self.drag_frame_timer.stop()
+            self.apply_pending_drag()
             
+            layer = self.drag_layer
             # 发射立绘位置变化信号（传递拖动前和拖动后的位置）
-            if 0 <= self.current_drag_index < len(self.portraits) and self.drag_start_pos is not None:
-                # 计算拖动前的位置
-                old_x = pos.x() - (canvas_x - (self.drag_start_pos.x() + self.portrait_positions[self.current_drag_index].x()))
-                old_y = pos.y() - (canvas_y - (self.drag_start_pos.y() + self.portrait_positions[self.current_drag_index].y()))
-                # 发射信号，包含旧位置和新位置
-                self.portrait_position_changed.emit(self.current_drag_index, old_x, old_y, pos.x(), pos.y())
-                
-            self.drag_start_pos = None
+            if layer is not None and self.drag_start_pos is not None:
+                pos = layer.position
+                self.portrait_position_changed.emit(
+                    layer.index, self.drag_origin.x(), self.drag_origin.y(), pos.x(), pos.y()
+                )
+                log_debug(f"拖动延迟: {self.drag_latency.summary()}, 合并移动事件 {self.coalesced_moves} 次")
             
+            self.drag_layer = None
+            self.drag_start_pos = None
+            self.drag_origin = None
+    
     def set_portrait_position(self, index, x, y):
         """设置立绘位置
         
@@ -258,24 +592,27 @@ class DraggableImageLabel(QLabel):
             x: x坐标 - 基于画布坐标系统
             y: y坐标 - 基于画布坐标系统
         """
-        if index >= len(self.portraits):
+        if not 0 <= index < self.max_layers:
             return
-            
-        # 获取当前立绘（如果存在）
-        current_portrait = self.portraits[index]
-        if current_portrait:
-            # 添加边界限制：允许立绘适当超出边界
-            # 限制x：允许立绘超出边界一半宽度
-            min_x = - current_portrait.width() // 2
-            max_x = self.canvas_width - current_portrait.width() // 2
-            # 限制y：允许立绘超出边界一半高度
-            min_y = - current_portrait.height() // 2
-            max_y = self.canvas_height - current_portrait.height() // 2
-            
-            # 修正位置（确保在边界内）
-            x = max(min_x, min(x, max_x))
-            y = max(min_y, min(y, max_y))
+        
+        # 获取当前立绘（如果存在），添加边界限制
+        layer = self._layer(index, create=True)
+        if layer.visible:
+            x, y = self._clamp_position(layer, x, y)
         
         # 设置位置
-        self.portrait_positions[index] = QPoint(x, y)
-        self.update_display()
\ No newline at end of file
+        self._move_layer(layer, x, y)
+    
+    def get_portrait_position(self, index):
+        """获取立绘位置
+        
+        Args:
+            index: 立绘索引
+        
+        Returns:
+            QPoint: 基于画布坐标系统的位置
+        """
+        layer = self.layers.get(index)
+        if layer is None:
+            return QPoint(0, 0)
+        return QPoint(layer.position)
@@ -0,0 +1,111 @@
+"""资源搜索选择器
+
+在大量资源中按名称逐字搜索并选择资源的对话框
+"""
+import time
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListView, QLabel, QAbstractItemView
+from PyQt5.QtCore import Qt, QEvent
+
+from models.resource.resource_filter_model import ResourceFilterModel
+from utils.helpers.logger import log_debug
+from utils.helpers.perf_stats import LatencyCounter
+
+
+class ResourcePicker(QDialog):
+    """资源搜索选择器
+    
+    输入框中每输入一个字符即更新过滤结果；列表使用统一行高，只绘制可见的行。
+    上下方向键和翻页键在输入框中也可以移动列表中的选择，回车或双击确认。
+    """
+    
+    def __init__(self, resource_model, title="选择资源", current_path="", parent=None):
+        """初始化资源搜索选择器
+        
+        Args:
+            resource_model: 资源列表模型（ResourceListModel）
+            title: 对话框标题
+            current_path: 当前选中的资源路径
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(420, 520)
+        self.resource_model = resource_model
+        self.selected_path = None
+        # 每次按键的过滤耗时，预算为一帧（16毫秒）
+        self.filter_latency = LatencyCounter(budget_ms=16)
+        
+        layout = QVBoxLayout(self)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("输入名称搜索（支持名称中的任意片段）")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.installEventFilter(self)
+        layout.addWidget(self.search_input)
+        
+        self.filter_model = ResourceFilterModel(resource_model, self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.filter_model)
+        self.list_view.setUniformItemSizes(True)
+        # 分批布局：大量结果的布局在事件循环中分批完成，不阻塞输入
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(256)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        layout.addWidget(self.list_view)
+        
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        
+        self.search_input.textChanged.connect(self.on_query_changed)
+        self.list_view.activated.connect(self.accept_row)
+        self.list_view.doubleClicked.connect(self.accept_row)
+        
+        self._update_status()
+        # 定位到当前选中的资源
+        current_index = self.filter_model.index(max(0, self.filter_model.row_of(current_path)))
+        self.list_view.setCurrentIndex(current_index)
+        self.list_view.scrollTo(current_index, QAbstractItemView.PositionAtCenter)
+        self.search_input.setFocus()
+    
+    def on_query_changed(self, text):
+        """查询文本变化时更新过滤结果，并选中第一个匹配项"""
+        start_time = time.perf_counter()
+        self.filter_model.set_query(text)
+        self.filter_latency.record_since(start_time)
+        self.list_view.setCurrentIndex(self.filter_model.index(0))
+        self.list_view.scrollToTop()
+        self._update_status()
+    
+    def _update_status(self):
+        """显示匹配数量"""
+        self.status_label.setText(f"共 {self.filter_model.match_count} 项")
+    
+    def eventFilter(self, obj, event):
+        """在输入框中用方向键和翻页键移动列表中的选择"""
+        if obj is self.search_input and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+                self.list_view.setFocus()
+                self.list_view.keyPressEvent(event)
+                self.search_input.setFocus()
+                return True
+            if event.key() in (Qt.Key_Return, Qt.Key_Enter):
+                self.accept_row(self.list_view.currentIndex())
+                return True
+        return super().eventFilter(obj, event)
+    
+    def accept_row(self, index):
+        """确认选择"""
+        if not index.isValid():
+            return
+        source_row = self.filter_model.source_row(index.row())
+        if source_row < 0:
+            return
+        self.selected_path = self.resource_model.path_at(source_row)
+        self.accept()
+    
+    def done(self, result):
+        """关闭时输出过滤耗时统计，并断开过滤模型与共享资源模型的连接"""
+        if self.filter_latency.count:
+            log_debug(f"资源搜索过滤耗时: {self.filter_latency.summary()}")
+        self.filter_model.detach()
+        super().done(result)
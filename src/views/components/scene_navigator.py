@@ -0,0 +1,106 @@
+"""场景导航面板
+
+列出项目中的所有场景，点击即可跳转到对应场景；可按台词和角色名搜索场景
+"""
+from PyQt5.QtWidgets import QDockWidget, QListView, QAbstractItemView, QWidget, QVBoxLayout, QLineEdit, QLabel
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
+
+
+class SceneNavigator(QDockWidget):
+    """场景导航面板（可停靠窗口）
+    
+    列表视图使用统一行高并分批布局，滚动时只向模型请求可见行的数据，
+    十万级别的场景数量下也能流畅滚动。
+    """
+    
+    # 用户选择了某个场景（场景索引）
+    scene_activated = pyqtSignal(int)
+    # 搜索文本变化（停止输入一段时间后发出，空文本表示清除搜索）
+    search_requested = pyqtSignal(str)
+    
+    def __init__(self, parent=None):
+        """初始化场景导航面板
+        
+        Args:
+            parent: 父窗口
+        """
+        super().__init__("场景", parent)
+        self.setObjectName("scene_navigator")
+        self.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索台词或角色名")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+        
+        # 延迟搜索，连续输入时只搜索最后的文本
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(lambda: self.search_requested.emit(self.search_input.text()))
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self._search_now)
+        
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(512)
+        self.list_view.setIconSize(QSize(16, 16))
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setTextElideMode(Qt.ElideRight)
+        self.list_view.activated.connect(self._on_activated)
+        self.list_view.clicked.connect(self._on_activated)
+        layout.addWidget(self.list_view)
+        
+        self.status_label = QLabel()
+        self.status_label.hide()
+        layout.addWidget(self.status_label)
+        self.setWidget(container)
+    
+    def set_model(self, model):
+        """设置场景列表模型
+        
+        Args:
+            model: 场景列表模型（SceneListModel）
+        """
+        self.list_view.setModel(model)
+    
+    def set_current(self, scene_index):
+        """选中并滚动到指定场景（不触发scene_activated）
+        
+        Args:
+            scene_index: 场景索引
+        """
+        model = self.list_view.model()
+        if model is None:
+            return
+        index = model.index(model.row_of(scene_index), 0)
+        if not index.isValid():
+            return
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index, QAbstractItemView.EnsureVisible)
+    
+    def set_status(self, text):
+        """显示搜索状态（如匹配数量），空文本时隐藏
+        
+        Args:
+            text: 状态文本
+        """
+        self.status_label.setText(text)
+        self.status_label.setVisible(bool(text))
+    
+    def _search_now(self):
+        """回车时立即搜索"""
+        self.search_timer.stop()
+        self.search_requested.emit(self.search_input.text())
+    
+    def _on_activated(self, index):
+        """点击或回车选择场景"""
+        if index.isValid():
+            self.scene_activated.emit(index.model().scene_index(index.row()))
@@ -0,0 +1,82 @@
+"""项目检查结果
+
+列出项目中存在问题的场景：缺失的文件、超出范围的缩放和字号、超出画布的立绘、有语音但没有台词
+"""
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton
+from PyQt5.QtCore import pyqtSignal
+from models.scene.scene_validator import ISSUE_TYPES
+from views.components.asset_report_dialog import ReportTableModel, create_report_view
+
+
+class ValidationDialog(QDialog):
+    """项目检查结果对话框（非模态）
+    
+    检查结果由ProjectValidator增量维护，对话框只在结果变化时重新列出问题，耗时只与问题数量有关。
+    双击问题可跳转到对应场景。
+    """
+    
+    # 用户要求跳转到某个场景（场景索引）
+    scene_requested = pyqtSignal(int)
+    # 用户要求重新读取所有被引用的文件
+    recheck_requested = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        """初始化项目检查结果对话框
+        
+        Args:
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.setWindowTitle("项目检查")
+        self.resize(720, 480)
+        self.validator = None
+        
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        self.type_combo = QComboBox()
+        self.type_combo.addItem("全部问题", None)
+        for issue_type, name in ISSUE_TYPES.items():
+            self.type_combo.addItem(name, issue_type)
+        self.type_combo.currentIndexChanged.connect(self.refresh)
+        header.addWidget(self.type_combo)
+        self.status_label = QLabel()
+        header.addWidget(self.status_label, 1)
+        self.btn_recheck = QPushButton("重新检查文件")
+        self.btn_recheck.setToolTip("重新读取所有被引用的文件（文件可能在程序外被修改或删除）")
+        self.btn_recheck.clicked.connect(self.recheck_requested.emit)
+        header.addWidget(self.btn_recheck)
+        layout.addLayout(header)
+        
+        self.issue_model = ReportTableModel(["场景", "类型", "说明"], self)
+        self.issue_view = create_report_view(self.issue_model)
+        self.issue_view.doubleClicked.connect(self._on_issue_activated)
+        layout.addWidget(self.issue_view)
+        self.refresh()
+    
+    def set_validator(self, validator):
+        """设置检查结果并刷新
+        
+        Args:
+            validator: 场景检查结果（SceneValidator），尚未就绪时为None
+        """
+        self.validator = validator
+        self.refresh()
+    
+    def refresh(self, *args):
+        """按选中的问题类型列出问题"""
+        if self.validator is None:
+            self.issue_model.set_rows([])
+            self.status_label.setText("正在检查项目…")
+            return
+        issue_type = self.type_combo.currentData()
+        self.issue_model.set_rows([
+            (scene_index + 1, ISSUE_TYPES.get(kind, kind), message)
+            for scene_index, kind, message in self.validator.issues(issue_type)
+        ])
+        self.status_label.setText(
+            f"{self.validator.scene_count} 个场景存在 {self.validator.issue_count} 个问题，双击跳转到场景")
+    
+    def _on_issue_activated(self, index):
+        """双击问题时跳转到对应场景"""
+        if index.isValid():
+            self.scene_requested.emit(self.issue_model.rows[index.row()][0] - 1)
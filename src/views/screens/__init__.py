@@ -3,5 +3,6 @@
 包含所有屏幕视图
 """
 from .main_view import MainView
+from .playback_window import PlaybackWindow
 
-__all__ = ['MainView']
\ No newline at end of file
+__all__ = ['MainView', 'PlaybackWindow']
\ No newline at end of file
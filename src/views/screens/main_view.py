@@ -6,13 +6,15 @@ from PyQt5.QtWidgets import (
     QGridLayout, QComboBox, QTextEdit,
     QPushButton, QHBoxLayout, QVBoxLayout, QLabel,
     QWidget, QMainWindow, QFrame, QGroupBox, QTabWidget,
-    QSlider, QLineEdit, QCheckBox, QSizePolicy
+    QSlider, QLineEdit, QCheckBox, QSizePolicy, QToolButton
 )
 from PyQt5.QtCore import Qt, QUrl
 from PyQt5.QtGui import QPixmap, QFont
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 
 from views.components.draggable_image_label import DraggableImageLabel
+from views.components.scene_navigator import SceneNavigator
+from services.render.scene_compositor import CANVAS_WIDTH, CANVAS_HEIGHT
 
 
 class MainView(QMainWindow):
@@ -28,6 +30,7 @@ class MainView(QMainWindow):
         self.config = config or {}
         self.controller = None
         self.portrait_count = self.config.get("editor", {}).get("portrait_count", 4)
+        self.resource_search_buttons = []  # (搜索按钮, 下拉框, 选择器标题)
         
         # 初始化UI
         self.init_ui()
@@ -68,6 +71,37 @@ class MainView(QMainWindow):
         self.btn_save = QPushButton("保存项目")
         toolbar_layout.addWidget(self.btn_save)
         
+        # 创建场景切换按钮
+        self.btn_prev_scene = QPushButton("上一场景")
+        self.btn_prev_scene.setToolTip("Ctrl+PgUp")
+        toolbar_layout.addWidget(self.btn_prev_scene)
+        self.btn_next_scene = QPushButton("下一场景")
+        self.btn_next_scene.setToolTip("Ctrl+PgDown")
+        toolbar_layout.addWidget(self.btn_next_scene)
+        
+        # 创建导出分镜表按钮
+        self.btn_export_contact_sheet = QPushButton("导出分镜表")
+        toolbar_layout.addWidget(self.btn_export_contact_sheet)
+        
+        # 创建播放按钮
+        self.btn_playback = QPushButton("播放 (F5)")
+        toolbar_layout.addWidget(self.btn_playback)
+        
+        # 创建素材引用报告按钮
+        self.btn_asset_report = QPushButton("素材引用")
+        self.btn_asset_report.setToolTip("查询素材的使用位置，列出未使用的素材和缺失的文件")
+        toolbar_layout.addWidget(self.btn_asset_report)
+        
+        # 创建批量编辑按钮
+        self.btn_batch_edit = QPushButton("批量编辑")
+        self.btn_batch_edit.setToolTip("按角色、素材、范围或关键字选择场景，批量修改字段或替换素材")
+        toolbar_layout.addWidget(self.btn_batch_edit)
+        
+        # 创建项目检查按钮（按钮文字显示问题数量）
+        self.btn_validate = QPushButton("检查")
+        self.btn_validate.setToolTip("列出缺失的文件、超出范围的缩放和字号、超出画布的立绘、有语音无台词的场景")
+        toolbar_layout.addWidget(self.btn_validate)
+        
         # 创建内容区域
         content_layout = QHBoxLayout()
         main_layout.addLayout(content_layout)
@@ -81,7 +115,10 @@ class MainView(QMainWindow):
         bg_group = QGroupBox("背景")
         bg_layout = QVBoxLayout(bg_group)
         self.combo_bg = QComboBox()
-        bg_layout.addWidget(self.combo_bg)
+        bg_row = QHBoxLayout()
+        bg_row.addWidget(self.combo_bg)
+        bg_row.addWidget(self._create_search_button(self.combo_bg, "搜索背景"))
+        bg_layout.addLayout(bg_row)
         left_layout.addWidget(bg_group)
         
         # 创建立绘选择组
@@ -95,6 +132,7 @@ class MainView(QMainWindow):
             combo = QComboBox()
             combo.setObjectName(f"combo_portrait_{i}")
             portrait_row.addWidget(combo, 3)
+            portrait_row.addWidget(self._create_search_button(combo, f"搜索立绘 {i + 1}"))
             
             scale_slider = QSlider(Qt.Horizontal)
             scale_slider.setObjectName(f"slider_portrait_{i}")
@@ -117,6 +155,7 @@ class MainView(QMainWindow):
         bgm_layout.addWidget(QLabel("BGM:"))
         self.combo_bgm = QComboBox()
         bgm_layout.addWidget(self.combo_bgm)
+        bgm_layout.addWidget(self._create_search_button(self.combo_bgm, "搜索BGM"))
         audio_layout.addLayout(bgm_layout)
         
         # 音效选择
@@ -124,6 +163,7 @@ class MainView(QMainWindow):
         sound_layout.addWidget(QLabel("音效:"))
         self.combo_sound = QComboBox()
         sound_layout.addWidget(self.combo_sound)
+        sound_layout.addWidget(self._create_search_button(self.combo_sound, "搜索音效"))
         audio_layout.addLayout(sound_layout)
         
         # 语音选择
@@ -131,6 +171,7 @@ class MainView(QMainWindow):
         voice_layout.addWidget(QLabel("语音:"))
         self.combo_voice = QComboBox()
         voice_layout.addWidget(self.combo_voice)
+        voice_layout.addWidget(self._create_search_button(self.combo_voice, "搜索语音"))
         self.btn_import_voice = QPushButton("导入")
         voice_layout.addWidget(self.btn_import_voice)
         audio_layout.addLayout(voice_layout)
@@ -156,6 +197,7 @@ class MainView(QMainWindow):
         font_layout.addWidget(QLabel("字体:"))
         self.combo_font = QComboBox()
         font_layout.addWidget(self.combo_font, 3)
+        font_layout.addWidget(self._create_search_button(self.combo_font, "搜索字体"))
         
         # 字体大小调整
         font_layout.addWidget(QLabel("字号:"))
@@ -194,7 +236,9 @@ class MainView(QMainWindow):
         self.preview_layout.setContentsMargins(10, 10, 10, 10)
         
         # 创建预览标签
-        self.image_label = DraggableImageLabel(self.portrait_count)
+        refine_delay = self.config.get("performance", {}).get("progressive_refine_delay", 150)
+        max_layers = max(self.portrait_count, self.config.get("editor", {}).get("max_layers", 32))
+        self.image_label = DraggableImageLabel(max_layers, refine_delay)
         # 设置最小尺寸为16:9比例
         self.image_label.setMinimumSize(800, 450)  # 16:9比例的最小尺寸
         self.image_label.setFrameShape(QFrame.Box)
@@ -204,6 +248,10 @@ class MainView(QMainWindow):
         
         content_layout.addWidget(self.preview_group, 2)
         
+        # 创建场景导航面板（停靠在窗口右侧）
+        self.scene_navigator = SceneNavigator(self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.scene_navigator)
+        
         # 初始化定时器用于延迟刷新
         from PyQt5.QtCore import QTimer
         self.resize_timer = QTimer(self)
@@ -221,10 +269,6 @@ class MainView(QMainWindow):
         # 调用父类方法
         super().resizeEvent(event)
         
-        # 固定使用1280×720作为内部画布尺寸
-        CANVAS_WIDTH = 1280
-        CANVAS_HEIGHT = 720
-        
         # 获取可用空间大小（减去布局边距）
         margins = self.preview_layout.contentsMargins()
         left = margins.left()
@@ -267,6 +311,52 @@ class MainView(QMainWindow):
         if self.current_background and self.controller:
             self.controller.refresh_background(self.current_background)
     
+    def _create_search_button(self, combo, title):
+        """创建打开资源搜索选择器的按钮
+        
+        Args:
+            combo: 选择结果写回的下拉框
+            title: 选择器标题
+        
+        Returns:
+            QToolButton: 搜索按钮
+        """
+        button = QToolButton()
+        button.setText("搜索")
+        button.setToolTip(title)
+        self.resource_search_buttons.append((button, combo, title))
+        return button
+    
+    @staticmethod
+    def bind_resource_model(combo, model):
+        """让下拉框显示共享的资源列表模型
+        
+        资源数量很多时，统一行高可以避免弹出列表逐行计算尺寸，
+        按最小内容长度确定宽度可以避免在首次显示时测量所有条目的文本。
+        
+        Args:
+            combo: 下拉框
+            model: 资源列表模型
+        """
+        if combo.model() is model:
+            return
+        combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        combo.setMinimumContentsLength(12)
+        combo.setModel(model)
+        combo.view().setUniformItemSizes(True)
+    
+    def scene_editor_widgets(self):
+        """获取编辑场景的控件（批量应用场景时需要阻塞这些控件的信号）
+        
+        Returns:
+            list: 控件列表
+        """
+        return [
+            self.combo_bg, *self.portrait_combos, *self.portrait_scale_sliders,
+            self.combo_bgm, self.combo_sound, self.combo_voice,
+            self.combo_font, self.slider_font_size
+        ]
+    
     def update_background(self, image_path):
         """更新背景图片并保存路径"""
         # 保存当前背景图片路径
@@ -335,12 +425,27 @@ class MainView(QMainWindow):
         self.btn_new.clicked.connect(self.controller.on_new_project)
         self.btn_open.clicked.connect(self.controller.on_open_project)
         self.btn_save.clicked.connect(self.controller.on_save_project)
-        
-        # 仅添加全屏快捷键 (Alt+Enter)
+        self.btn_prev_scene.clicked.connect(self.controller.on_previous_scene)
+        self.btn_next_scene.clicked.connect(self.controller.on_next_scene)
+        self.btn_export_contact_sheet.clicked.connect(self.controller.on_export_contact_sheet)
+        self.btn_playback.clicked.connect(self.controller.on_start_playback)
+        self.btn_asset_report.clicked.connect(self.controller.on_show_asset_report)
+        self.btn_batch_edit.clicked.connect(self.controller.on_show_batch_edit)
+        self.btn_validate.clicked.connect(self.controller.on_show_validation)
+        self.scene_navigator.scene_activated.connect(self.controller.show_scene)
+        self.scene_navigator.search_requested.connect(self.controller.on_search_scenes)
+        
+        # 添加全屏快捷键 (Alt+Enter)、播放快捷键 (F5) 和场景切换快捷键 (Ctrl+PgUp/PgDown)
         from PyQt5.QtWidgets import QShortcut
         from PyQt5.QtGui import QKeySequence
         self.fullscreen_shortcut = QShortcut(QKeySequence("Alt+Return"), self)
         self.fullscreen_shortcut.activated.connect(self.toggle_fullscreen)
+        self.playback_shortcut = QShortcut(QKeySequence("F5"), self)
+        self.playback_shortcut.activated.connect(self.controller.on_start_playback)
+        self.prev_scene_shortcut = QShortcut(QKeySequence("Ctrl+PgUp"), self)
+        self.prev_scene_shortcut.activated.connect(self.controller.on_previous_scene)
+        self.next_scene_shortcut = QShortcut(QKeySequence("Ctrl+PgDown"), self)
+        self.next_scene_shortcut.activated.connect(self.controller.on_next_scene)
         
         # 连接下拉框信号
         self.combo_bg.currentIndexChanged.connect(self.controller.on_background_changed)
@@ -368,6 +473,10 @@ class MainView(QMainWindow):
         # 连接导入语音按钮信号
         self.btn_import_voice.clicked.connect(self.controller.import_voice_file)
         
+        # 连接资源搜索按钮信号
+        for button, combo, title in self.resource_search_buttons:
+            button.clicked.connect(lambda _, combo=combo, title=title: self.controller.on_search_resource(combo, title))
+        
         # 连接文本框内容变化信号
         self.text_edit.textChanged.connect(self._on_text_changed)
     
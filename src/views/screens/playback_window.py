@@ -0,0 +1,193 @@
+"""播放窗口
+
+全屏逐场景播放项目，场景切换时交叉淡入淡出
+"""
+import time
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRect, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QFont
+
+from services.render.scene_compositor import CANVAS_WIDTH, CANVAS_HEIGHT
+from utils.helpers.perf_stats import FrameStats
+
+
+class PlaybackWindow(QWidget):
+    """播放窗口，显示预先合成好的场景画面和对白
+    
+    画面切换时按帧节奏绘制交叉淡化动画，并统计动画期间的帧时间和掉帧数。
+    """
+    
+    # 用户操作信号
+    advance_requested = pyqtSignal()
+    back_requested = pyqtSignal()
+    exit_requested = pyqtSignal()
+    # 画面显示尺寸确定或变化（如进入全屏）时发出 (QSize)
+    frame_size_changed = pyqtSignal(QSize)
+    
+    def __init__(self, crossfade_ms=400, parent=None):
+        """初始化播放窗口
+        
+        Args:
+            crossfade_ms: 交叉淡化的时长（毫秒），0表示直接切换
+            parent: 父窗口
+        """
+        super().__init__(parent, Qt.Window)
+        self.setWindowTitle("播放")
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setFocusPolicy(Qt.StrongFocus)
+        
+        self.crossfade_ms = crossfade_ms
+        self.current_frame = None  # 当前场景画面（QImage）
+        self.previous_frame = None  # 淡出中的上一场景画面
+        self.fade_start = None
+        self.fade_progress = 1.0
+        self.character_name = ""
+        self.text = ""
+        self.text_font = QFont()
+        
+        # 按屏幕刷新率驱动淡化动画
+        self.frame_stats = FrameStats()
+        self.animation_timer = QTimer(self)
+        self.animation_timer.setTimerType(Qt.PreciseTimer)
+        self.animation_timer.timeout.connect(self._on_animation_tick)
+    
+    def showEvent(self, event):
+        """显示时根据屏幕刷新率确定帧时长，并通知画面的显示尺寸"""
+        super().showEvent(event)
+        window = self.windowHandle()
+        screen = window.screen() if window is not None else None
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        if refresh_rate <= 0:
+            refresh_rate = 60
+        self.frame_stats.frame_ms = 1000.0 / refresh_rate
+        self.frame_stats.reset()
+        self.animation_timer.setInterval(max(1, int(self.frame_stats.frame_ms)))
+        
+        # 进入全屏时窗口要稍后才会调整为屏幕尺寸，直接按屏幕尺寸通知，避免先按显示前的尺寸合成画面
+        window_size = screen.geometry().size() if screen is not None and self.isFullScreen() else self.size()
+        self.frame_size_changed.emit(self.frame_rect(window_size).size())
+    
+    def resizeEvent(self, event):
+        """显示后窗口尺寸变化时通知新的画面显示尺寸（显示前的尺寸变化由showEvent统一通知）"""
+        super().resizeEvent(event)
+        if self.isVisible():
+            self.frame_size_changed.emit(self.frame_rect().size())
+    
+    def frame_rect(self, window_size=None):
+        """画面在窗口中的显示区域（保持画布宽高比居中）
+        
+        Args:
+            window_size: 窗口尺寸，None表示当前尺寸
+        
+        Returns:
+            QRect: 显示区域
+        """
+        window_size = window_size or self.size()
+        size = QSize(CANVAS_WIDTH, CANVAS_HEIGHT).scaled(window_size, Qt.KeepAspectRatio)
+        return QRect(
+            (window_size.width() - size.width()) // 2,
+            (window_size.height() - size.height()) // 2,
+            size.width(),
+            size.height()
+        )
+    
+    def show_frame(self, image, character_name="", text="", font=None):
+        """切换到新的场景画面
+        
+        Args:
+            image: 合成好的场景画面，建议与frame_rect尺寸一致以避免绘制时缩放
+            character_name: 角色名
+            text: 对白文本
+            font: 对白字体
+        """
+        if self.current_frame is not None and self.crossfade_ms > 0:
+            self.previous_frame = self.current_frame
+            self.fade_start = time.perf_counter()
+            self.fade_progress = 0.0
+            self.frame_stats.pause()
+            self.animation_timer.start()
+        else:
+            self.previous_frame = None
+            self.fade_progress = 1.0
+        self.current_frame = image
+        self.character_name = character_name
+        self.text = text
+        if font is not None:
+            self.text_font = QFont(font)
+        self.update()
+    
+    def _on_animation_tick(self):
+        """推进淡化动画"""
+        elapsed_ms = (time.perf_counter() - self.fade_start) * 1000.0
+        self.fade_progress = min(1.0, elapsed_ms / self.crossfade_ms)
+        if self.fade_progress >= 1.0:
+            self.animation_timer.stop()
+            self.previous_frame = None
+        self.update()
+    
+    def paintEvent(self, event):
+        """绘制画面、淡化过渡和对白框"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.black)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        target = self.frame_rect()
+        
+        if self.previous_frame is not None:
+            painter.drawImage(target, self.previous_frame)
+            painter.setOpacity(self.fade_progress)
+        if self.current_frame is not None:
+            painter.drawImage(target, self.current_frame)
+        painter.setOpacity(1.0)
+        
+        if self.character_name or self.text:
+            self._draw_text_box(painter, target)
+        painter.end()
+        
+        # 只统计淡化动画期间的帧
+        if self.previous_frame is not None:
+            self.frame_stats.mark()
+    
+    def _draw_text_box(self, painter, target):
+        """在画面底部绘制半透明对白框"""
+        box_height = target.height() // 4
+        box = QRect(target.left(), target.bottom() - box_height, target.width(), box_height)
+        painter.fillRect(box, QColor(0, 0, 0, 160))
+        margin = max(8, target.width() // 60)
+        text_rect = box.adjusted(margin, margin, -margin, -margin)
+        
+        font = QFont(self.text_font)
+        font.setPixelSize(max(12, target.height() // 30))
+        painter.setPen(Qt.white)
+        if self.character_name:
+            name_font = QFont(font)
+            name_font.setBold(True)
+            painter.setFont(name_font)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop, self.character_name)
+            text_rect.setTop(text_rect.top() + painter.fontMetrics().height() + margin // 2)
+        painter.setFont(font)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, self.text)
+    
+    def keyPressEvent(self, event):
+        """键盘控制：Esc退出，空格/回车/右方向键前进，左方向键后退"""
+        key = event.key()
+        if key == Qt.Key_Escape:
+            self.exit_requested.emit()
+        elif key in (Qt.Key_Space, Qt.Key_Return, Qt.Key_Enter, Qt.Key_Right, Qt.Key_PageDown):
+            self.advance_requested.emit()
+        elif key in (Qt.Key_Left, Qt.Key_PageUp):
+            self.back_requested.emit()
+        else:
+            super().keyPressEvent(event)
+    
+    def mousePressEvent(self, event):
+        """鼠标控制：左键前进，右键后退"""
+        if event.button() == Qt.LeftButton:
+            self.advance_requested.emit()
+        elif event.button() == Qt.RightButton:
+            self.back_requested.emit()
+    
+    def closeEvent(self, event):
+        """关闭窗口时结束播放"""
+        self.animation_timer.stop()
+        self.exit_requested.emit()
+        super().closeEvent(event)
@@ -0,0 +1,6 @@
+"""测试配置：使用离屏平台运行Qt，并将src目录加入模块搜索路径"""
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
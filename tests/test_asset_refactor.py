@@ -0,0 +1,183 @@
+"""素材重构测试
+
+在临时目录中建立项目和素材文件，检查计划、试运行、执行、失败时的撤销以及按日志撤销。
+"""
+import copy
+import json
+
+from models.scene.asset_reference_index import AssetReferenceIndex
+from services.project.asset_refactor import AssetRefactor
+
+
+class StubSceneModel:
+    """替身场景模型：保存时把场景写入项目文件，可以指定保存失败"""
+    
+    def __init__(self, scenes, current_file):
+        self.scene_data = {"scenes": scenes}
+        self.current_file = current_file
+        self.save_result = True
+        self.saves = 0
+    
+    def save_to_file(self):
+        self.saves += 1
+        if not self.save_result:
+            return False
+        with open(self.current_file, 'w', encoding='utf-8') as f:
+            json.dump(self.scene_data, f, ensure_ascii=False)
+        return True
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"data")
+
+
+def _make_refactor(tmp_path):
+    """项目引用三个立绘：a.png用相对路径和绝对路径各引用一次，sub/b.png用相对路径引用"""
+    portrait_dir = tmp_path / "resources" / "portrait"
+    for name in ("a.png", "sub/b.png", "unused.png"):
+        _touch(portrait_dir / name)
+    scenes = [
+        {"background": "", "portraits": [{"path": "resources/portrait/a.png"}], "text": "1"},
+        {"background": "", "portraits": [{"path": str(portrait_dir / "a.png")},
+                                         {"path": "resources/portrait/sub/b.png"}], "text": "2"},
+        {"background": "", "portraits": [{"path": "resources/portrait/sub/b.png"}], "text": "3"},
+    ]
+    project_file = tmp_path / "story.json"
+    model = StubSceneModel(scenes, str(project_file))
+    model.save_to_file()
+    model.saves = 0
+    reference_index = AssetReferenceIndex()
+    reference_index.build(scenes, tmp_path)
+    return model, AssetRefactor(model, reference_index), portrait_dir
+
+
+def _portrait_paths(model):
+    return [[portrait["path"] for portrait in scene["portraits"]] for scene in model.scene_data["scenes"]]
+
+
+def test_plan_keeps_relative_paths_relative(tmp_path):
+    model, refactor, portrait_dir = _make_refactor(tmp_path)
+    plan = refactor.plan(portrait_dir / "a.png", portrait_dir / "hero.png")
+    assert plan.ok
+    assert plan.moves == [(str(portrait_dir / "a.png"), str(portrait_dir / "hero.png"))]
+    assert plan.rewrites == [
+        (0, ("portraits", 0, "path"), "resources/portrait/a.png", "resources/portrait/hero.png"),
+        (1, ("portraits", 0, "path"), str(portrait_dir / "a.png"), str(portrait_dir / "hero.png")),
+    ]
+
+    # 试运行不移动文件也不修改场景
+    original = copy.deepcopy(model.scene_data)
+    assert refactor.apply(plan, dry_run=True)
+    assert (portrait_dir / "a.png").exists()
+    assert not (portrait_dir / "hero.png").exists()
+    assert model.scene_data == original
+    assert model.saves == 0
+    assert not refactor.can_rollback()
+
+
+def test_plan_rejects_invalid_paths(tmp_path):
+    _, refactor, portrait_dir = _make_refactor(tmp_path)
+    assert refactor.plan(portrait_dir / "missing.png", portrait_dir / "x.png").errors
+    assert refactor.plan(portrait_dir / "a.png", portrait_dir / "unused.png").errors
+    # 目录不能移动到其自身或其内部
+    assert refactor.plan(portrait_dir, portrait_dir / "nested").errors
+    assert refactor.plan(portrait_dir / "sub", portrait_dir / "sub" / "deeper" / "sub").errors
+    plan = refactor.plan(portrait_dir, tmp_path / "resources" / "portrait_old")
+    assert plan.ok
+
+
+def test_apply_moves_file_and_rewrites_scenes(tmp_path):
+    model, refactor, portrait_dir = _make_refactor(tmp_path)
+    plan = refactor.plan(portrait_dir / "a.png", portrait_dir / "chars" / "hero.png")
+    assert refactor.apply(plan)
+    assert model.saves == 1
+    assert not (portrait_dir / "a.png").exists()
+    assert (portrait_dir / "chars" / "hero.png").exists()
+    assert _portrait_paths(model) == [
+        ["resources/portrait/chars/hero.png"],
+        [str(portrait_dir / "chars" / "hero.png"), "resources/portrait/sub/b.png"],
+        ["resources/portrait/sub/b.png"],
+    ]
+    assert refactor.reference_index.where_used("resources/portrait/chars/hero.png") == [0, 1]
+    assert refactor.reference_index.where_used("resources/portrait/a.png") == []
+    assert refactor.can_rollback()
+
+
+def test_apply_moves_directory(tmp_path):
+    model, refactor, portrait_dir = _make_refactor(tmp_path)
+    destination = tmp_path / "resources" / "characters"
+    plan = refactor.plan(portrait_dir, destination)
+    assert plan.directory == (str(portrait_dir), str(destination))
+    assert len(plan.moves) == 3
+    assert refactor.apply(plan)
+    # 移动后源目录（包括空的子目录）被删除
+    assert not portrait_dir.exists()
+    assert sorted(path.relative_to(destination).as_posix() for path in destination.rglob("*.png")) == [
+        "a.png", "sub/b.png", "unused.png"
+    ]
+    assert _portrait_paths(model)[2] == ["resources/characters/sub/b.png"]
+
+    undo = refactor.rollback()
+    assert undo is not None
+    assert len(undo.moves) == 3
+    assert not destination.exists()
+    assert (portrait_dir / "sub" / "b.png").exists()
+    assert _portrait_paths(model)[2] == ["resources/portrait/sub/b.png"]
+
+
+def test_failed_save_moves_files_back(tmp_path):
+    model, refactor, portrait_dir = _make_refactor(tmp_path)
+    original = copy.deepcopy(model.scene_data)
+    destination = tmp_path / "resources" / "characters"
+    plan = refactor.plan(portrait_dir, destination)
+    model.save_result = False
+    assert not refactor.apply(plan)
+    assert model.scene_data == original
+    assert (portrait_dir / "a.png").exists()
+    assert (portrait_dir / "sub" / "b.png").exists()
+    assert not destination.exists()
+    assert refactor.reference_index.where_used("resources/portrait/a.png") == [0, 1]
+    journal = json.loads(AssetRefactor.journal_path_for(model.current_file).read_text(encoding="utf-8"))
+    assert journal["state"] == "failed"
+    assert not refactor.can_rollback()
+
+
+def test_failed_move_moves_files_back(tmp_path):
+    model, refactor, portrait_dir = _make_refactor(tmp_path)
+    original = copy.deepcopy(model.scene_data)
+    destination = tmp_path / "resources" / "characters"
+    plan = refactor.plan(portrait_dir, destination)
+    # 计划生成后目标位置出现了同名文件，移动到这一个文件时失败
+    _touch(destination / "unused.png")
+    assert not refactor.apply(plan)
+    assert model.saves == 0
+    assert model.scene_data == original
+    assert (portrait_dir / "a.png").exists()
+    assert (portrait_dir / "sub" / "b.png").exists()
+    assert (portrait_dir / "unused.png").exists()
+    assert sorted(path.name for path in destination.rglob("*")) == ["unused.png"]
+
+
+def test_rollback_restores_only_unchanged_fields(tmp_path):
+    model, refactor, portrait_dir = _make_refactor(tmp_path)
+    plan = refactor.plan(portrait_dir / "a.png", portrait_dir / "hero.png")
+    assert refactor.apply(plan)
+    # 重构之后场景0又被编辑过，撤销时保留编辑后的值
+    model.scene_data["scenes"][0]["portraits"][0]["path"] = "resources/portrait/sub/b.png"
+    refactor.reference_index.update_scene(0, model.scene_data["scenes"][0])
+
+    undo = refactor.rollback()
+    assert undo is not None
+    assert undo.moves == [(str(portrait_dir / "hero.png"), str(portrait_dir / "a.png"))]
+    assert [rewrite[0] for rewrite in undo.rewrites] == [1]
+    assert (portrait_dir / "a.png").exists()
+    assert _portrait_paths(model)[:2] == [
+        ["resources/portrait/sub/b.png"],
+        [str(portrait_dir / "a.png"), "resources/portrait/sub/b.png"],
+    ]
+    # 撤销结果已保存到项目文件
+    saved = json.loads(tmp_path.joinpath("story.json").read_text(encoding="utf-8"))
+    assert saved["scenes"][1]["portraits"][0]["path"] == str(portrait_dir / "a.png")
+    assert not refactor.can_rollback()
+    assert refactor.rollback() is None
@@ -0,0 +1,140 @@
+"""素材引用索引测试
+
+检查路径规范化、引用查询，以及场景和资源清单变化时未使用素材和缺失文件集合的增量更新。
+"""
+import os
+
+from models.scene.asset_reference_index import AssetReferenceIndex, scene_asset_fields
+
+
+def _scene(background="", portraits=(), bgm="", voice="", font=""):
+    return {
+        "background": background,
+        "portraits": [{"path": path} for path in portraits],
+        "audio": {"bgm": bgm, "sound": "", "voice": voice},
+        "font": {"path": font, "size": 24}
+    }
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"data")
+    return str(path)
+
+
+def test_scene_asset_fields():
+    scene = _scene("bg.png", ["", "b.png"], voice="v.ogg", font="f.ttf")
+    assert scene_asset_fields(scene) == [
+        ("background", ("background",), "bg.png"),
+        ("portrait", ("portraits", 1, "path"), "b.png"),
+        ("voice", ("audio", "voice"), "v.ogg"),
+        ("font", ("font", "path"), "f.ttf"),
+    ]
+    assert scene_asset_fields({"audio": None, "font": 12, "portraits": None}) == []
+
+
+def test_where_used_normalizes_paths(tmp_path):
+    index = AssetReferenceIndex()
+    index.build([
+        _scene("bg/day.png"),
+        _scene(str(tmp_path / "bg" / "day.png")),
+        _scene("bg/./sub/../day.png", ["bg/day.png"]),
+        _scene("bg/night.png"),
+    ], tmp_path)
+    assert index.where_used("bg/day.png") == [0, 1, 2]
+    assert index.where_used(str(tmp_path / "bg" / "day.png")) == [0, 1, 2]
+    assert index.use_count("bg//day.png") == 3
+    assert index.where_used("bg/none.png") == []
+    assert len(index) == 2
+    assert index.referenced_assets("background") == [("background", "bg/day.png", 3),
+                                                     ("background", "bg/night.png", 1)]
+    # 同一素材在场景中出现两次只算一次引用，记录第一次出现的类型
+    assert index.referenced_assets("portrait") == []
+
+
+def test_unused_and_missing_follow_scene_updates(tmp_path):
+    day = _touch(tmp_path / "bg" / "day.png")
+    night = _touch(tmp_path / "bg" / "night.png")
+    rin = _touch(tmp_path / "portrait" / "rin.png")
+    index = AssetReferenceIndex()
+    index.set_catalog("background", [day, night])
+    index.set_catalog("portrait", [rin])
+    scenes = [_scene("bg/day.png", ["portrait/rin.png"]), _scene("bg/day.png", bgm="bgm/gone.ogg")]
+    index.build(scenes, tmp_path)
+    assert index.unused_assets() == [("background", night)]
+    assert index.missing_files() == [("background_music", "bgm/gone.ogg", [1])]
+
+    # 最后一个引用被移除时素材变为未使用，缺失的文件不再被报告
+    scenes[0]["portraits"] = []
+    index.update_scene(0, scenes[0])
+    assert index.unused_assets() == [("background", night), ("portrait", rin)]
+    scenes[1]["audio"]["bgm"] = ""
+    index.update_scene(1, scenes[1])
+    assert index.missing_files() == []
+
+    scenes.append(_scene("bg/night.png", voice="voice/v1.ogg"))
+    index.update_scene(2, scenes[2])
+    assert index.unused_assets("background") == []
+    assert index.missing_files() == [("voice", "voice/v1.ogg", [2])]
+
+    # 删除场景
+    index.truncate(2)
+    assert index.unused_assets("background") == [("background", night)]
+    assert index.missing_files() == []
+    assert index.where_used("bg/day.png") == [0, 1]
+
+
+def test_catalog_changes(tmp_path):
+    day = _touch(tmp_path / "bg" / "day.png")
+    index = AssetReferenceIndex(tmp_path)
+    index.update_scene(0, _scene("bg/day.png", ["portrait/new.png"]))
+    assert index.missing_files() == [("portrait", "portrait/new.png", [0])]
+
+    # 添加到资源清单的文件视为存在
+    new = str(tmp_path / "portrait" / "new.png")
+    index.add_resource("portrait", new)
+    assert index.missing_files() == []
+    index.add_resource("background", day)
+    extra = _touch(tmp_path / "bg" / "extra.png")
+    index.add_resource("background", extra)
+    assert index.unused_assets() == [("background", extra)]
+
+    # 移出资源清单且文件不存在的素材重新变为缺失
+    index.remove_resource(new)
+    assert index.missing_files() == [("portrait", "portrait/new.png", [0])]
+    index.remove_resource(extra)
+    assert index.unused_assets() == []
+    index.remove_resource(day)
+    assert index.missing_files() == [("portrait", "portrait/new.png", [0])]
+
+    # set_catalog替换同类型的全部资源
+    index.set_catalog("background", [extra])
+    assert index.unused_assets() == [("background", extra)]
+
+
+def test_files_changed_outside(tmp_path):
+    index = AssetReferenceIndex(tmp_path)
+    index.build([_scene("bg/a.png"), _scene("bg/b.png")], tmp_path)
+    assert len(index.missing_files()) == 2
+    # 文件被补回后不再报告
+    _touch(tmp_path / "bg" / "a.png")
+    assert index.missing_files() == [("background", "bg/b.png", [1])]
+    # 在程序外删除的文件需要重新检查
+    b = _touch(tmp_path / "bg" / "b.png")
+    assert index.missing_files() == []
+    os.remove(b)
+    assert index.missing_files() == []
+    assert index.recheck_missing() == 1
+    assert index.missing_files() == [("background", "bg/b.png", [1])]
+
+
+def test_clear_scenes_keeps_catalog_and_rebases(tmp_path):
+    day = _touch(tmp_path / "a" / "bg" / "day.png")
+    index = AssetReferenceIndex()
+    index.set_catalog("background", [day])
+    index.build([_scene("bg/day.png")], tmp_path / "a")
+    assert index.unused_assets() == []
+    # 切换到另一个目录下的项目，相对路径按新的基准目录解析
+    index.build([_scene("bg/day.png")], tmp_path / "b")
+    assert index.unused_assets() == [("background", day)]
+    assert index.where_used(str(tmp_path / "b" / "bg" / "day.png")) == [0]
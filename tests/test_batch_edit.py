@@ -0,0 +1,173 @@
+"""批量编辑测试
+
+使用只提供场景列表和保存的替身模型，检查场景选择、编辑计划、执行以及失败时的撤销。
+"""
+import copy
+
+from models.scene.asset_reference_index import AssetReferenceIndex
+from models.scene.scene_search_index import SceneSearchIndex
+from services.project.batch_edit import (
+    MISSING, BatchEditPlan, BatchEditor, SceneSelector, SceneUpdate, _can_set, format_field, parse_field
+)
+
+
+class StubSceneModel:
+    """替身场景模型：记录保存次数，可以指定保存失败"""
+    
+    def __init__(self, scenes, current_file):
+        self.scene_data = {"scenes": scenes}
+        self.current_file = current_file
+        self.save_result = True
+        self.saves = 0
+    
+    def save_to_file(self):
+        self.saves += 1
+        return self.save_result
+
+
+def _scene(character, text, bgm="", background="bg/day.png"):
+    return {
+        "background": background,
+        "portraits": [{"path": "portrait/a.png", "scale": 1.0}],
+        "audio": {"bgm": bgm, "sound": "", "voice": ""},
+        "character_name": character,
+        "text": text,
+        "font": {"path": "", "size": 24}
+    }
+
+
+def _make_editor(tmp_path, scenes, with_indexes=False):
+    model = StubSceneModel(scenes, str(tmp_path / "story.json"))
+    reference_index = search_index = None
+    if with_indexes:
+        reference_index = AssetReferenceIndex()
+        reference_index.build(scenes, tmp_path)
+        search_index = SceneSearchIndex()
+        search_index.build(scenes)
+    return model, BatchEditor(model, reference_index, search_index)
+
+
+def _story():
+    return [
+        _scene("凛", "今天天气很好", bgm="bgm/ch1.ogg"),
+        _scene("葵", "今天要去学校", bgm="bgm/ch1.ogg"),
+        _scene("凛", "明天见", bgm="bgm/ch2.ogg", background="bg/night.png"),
+        _scene("凛", "今天的晚饭", bgm="bgm/ch2.ogg"),
+        _scene("凛凛", "今天", bgm="bgm/ch2.ogg"),
+    ]
+
+
+def test_parse_field_and_format_field():
+    assert parse_field("audio.bgm") == ("audio", "bgm")
+    assert parse_field("portraits.0.scale") == ("portraits", 0, "scale")
+    assert format_field(parse_field("portraits.0.scale")) == "portraits.0.scale"
+
+
+def test_can_set():
+    scene = {"audio": None, "portraits": [{"path": ""}], "font": "sans"}
+    assert _can_set(scene, ("audio", "bgm"))
+    assert _can_set(scene, ("effects", "shake", "power"))
+    assert _can_set(scene, ("portraits", 0, "scale"))
+    assert not _can_set(scene, ("portraits", 1, "scale"))
+    assert not _can_set(scene, ("effects", 0, "power"))
+    assert not _can_set(scene, ("font", "size"))
+
+
+def test_select_intersects_conditions(tmp_path):
+    for with_indexes in (False, True):
+        _, editor = _make_editor(tmp_path, _story(), with_indexes)
+        assert editor.select(SceneSelector()) == [0, 1, 2, 3, 4]
+        assert editor.select(SceneSelector(scene_range=(1, 4))) == [1, 2, 3]
+        assert editor.select(SceneSelector(scene_range=(3, 3))) == []
+        # 角色名完全一致，“凛凛”不算
+        assert editor.select(SceneSelector(character="凛")) == [0, 2, 3]
+        assert editor.select(SceneSelector(asset="bgm/ch2.ogg")) == [2, 3, 4]
+        assert editor.select(SceneSelector(asset=str(tmp_path / "bg" / "night.png"))) == [2]
+        assert editor.select(SceneSelector(text="今天")) == [0, 1, 3, 4]
+        assert editor.select(SceneSelector(character="凛", asset="bgm/ch2.ogg", text="今天")) == [3]
+        assert editor.select(SceneSelector(character="凛", text="今天", scene_range=(1, 5))) == [3]
+        assert editor.select(SceneSelector(character="葵", asset="bgm/ch2.ogg")) == []
+
+
+def test_plan_skips_missing_list_items_and_unchanged_values(tmp_path):
+    scenes = _story()
+    scenes[1]["font"]["size"] = 28
+    _, editor = _make_editor(tmp_path, scenes)
+    update = SceneUpdate({parse_field("font.size"): 28, parse_field("portraits.1.scale"): 0.5})
+    plan = editor.plan(SceneSelector(scene_range=(0, 3)), update)
+    assert plan.ok
+    assert plan.scene_indexes == [0, 2]
+    assert plan.skipped == {("portraits", 1, "scale"): 3}
+    assert plan.changes == [(0, ("font", "size"), 24, 28), (2, ("font", "size"), 24, 28)]
+    # 预览不修改场景
+    assert scenes[0]["font"]["size"] == 24
+
+    assert not editor.plan(SceneSelector(), SceneUpdate()).ok
+
+
+def test_plan_replace_assets(tmp_path):
+    scenes = _story()
+    _, editor = _make_editor(tmp_path, scenes)
+    plan = editor.plan(SceneSelector(scene_range=(0, 3)), SceneUpdate(replace_assets={"bgm/ch2.ogg": "bgm/ch3.ogg"}))
+    assert plan.changes == [(2, ("audio", "bgm"), "bgm/ch2.ogg", "bgm/ch3.ogg")]
+
+
+def test_apply_creates_missing_and_none_dicts(tmp_path):
+    scenes = _story()
+    scenes[0]["audio"] = None
+    del scenes[1]["audio"]
+    model, editor = _make_editor(tmp_path, scenes, with_indexes=True)
+    plan = editor.plan(SceneSelector(scene_range=(0, 3)), SceneUpdate({parse_field("audio.bgm"): "bgm/ch9.ogg"}))
+    assert plan.changes[0] == (0, ("audio", "bgm"), MISSING, "bgm/ch9.ogg")
+    assert plan.changes[1] == (1, ("audio", "bgm"), MISSING, "bgm/ch9.ogg")
+
+    assert editor.apply(plan)
+    assert model.saves == 1
+    assert [scene["audio"]["bgm"] for scene in scenes[:3]] == ["bgm/ch9.ogg"] * 3
+    assert scenes[0]["audio"] == {"bgm": "bgm/ch9.ogg"}
+    # 素材引用索引随之更新
+    assert editor.reference_index.where_used("bgm/ch9.ogg") == [0, 1, 2]
+    assert editor.reference_index.where_used("bgm/ch2.ogg") == [3, 4]
+
+
+def test_failed_save_restores_scenes(tmp_path):
+    scenes = _story()
+    scenes[0]["audio"] = None
+    del scenes[1]["audio"]
+    scenes[2]["effects"] = {"shake": None}
+    original = copy.deepcopy(scenes)
+    model, editor = _make_editor(tmp_path, scenes, with_indexes=True)
+    model.save_result = False
+    update = SceneUpdate({
+        parse_field("audio.bgm"): "bgm/ch9.ogg",
+        parse_field("effects.shake.power"): 3,
+        parse_field("font.size"): 30
+    }, replace_assets={"bg/day.png": "bg/dusk.png"})
+    plan = editor.plan(SceneSelector(), update)
+    assert plan.ok
+
+    assert not editor.apply(plan)
+    assert model.saves == 1
+    assert scenes == original
+    assert "audio" not in scenes[1]
+    assert scenes[0]["audio"] is None
+    assert editor.reference_index.where_used("bgm/ch9.ogg") == []
+    assert editor.reference_index.where_used("bg/day.png") == [0, 1, 3, 4]
+
+
+def test_write_error_restores_scenes_without_saving(tmp_path):
+    scenes = _story()
+    scenes[0]["audio"] = None
+    scenes[3]["font"] = "sans"
+    original = copy.deepcopy(scenes)
+    model, editor = _make_editor(tmp_path, scenes)
+    plan = BatchEditPlan([0, 1, 3])
+    plan.changes = [
+        (0, ("audio", "bgm"), MISSING, "bgm/ch9.ogg"),
+        (1, ("font", "size"), 24, 30),
+        (3, ("font", "size"), MISSING, 30),  # 字段所在的不是字典，改写失败
+    ]
+
+    assert not editor.apply(plan)
+    assert model.saves == 0
+    assert scenes == original
@@ -0,0 +1,63 @@
+"""图片缓存预算测试
+
+检查所有写入图片缓存的途径共用同一个字节预算，超出时按最近使用顺序丢弃。
+"""
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+
+from services.media.media_service import MediaService
+
+MB = 1024 * 1024
+
+# QPixmap需要QApplication，保持引用避免被回收
+_app = QApplication.instance() or QApplication([])
+
+
+def _image(width, height):
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(0xff336699)
+    return image
+
+
+def _service(budget_mb):
+    return MediaService({"performance": {"image_cache_mb": budget_mb}})
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    service = _service(1)
+    # 每张图片 256x256x4 = 256KB，预算可容纳4张
+    for name in "abcd":
+        service.cache_background_image(name, _image(256, 256))
+    assert service.image_cache_bytes == MB
+    # 命中的条目移到最近使用的位置
+    assert service._cached_image("a") is not None
+    service.cache_portrait_image("e", _image(256, 256), None)
+    assert list(service.image_cache) == ["c", "d", "a", "e"]
+    assert service.image_cache_bytes == MB
+
+    # 同步加载的图片同样计入预算
+    path = tmp_path / "big.png"
+    assert _image(512, 256).save(str(path))
+    assert service.load_image(str(path)) is not None
+    assert list(service.image_cache) == ["a", "e", str(path)]
+    assert service.image_cache_bytes == MB
+
+
+def test_oversized_entry_is_kept_and_discard_checks_identity():
+    service = _service(1)
+    service.cache_background_image("small", _image(16, 16))
+    big = service.cache_background_image("big", _image(1024, 1024))
+    assert list(service.image_cache) == ["big"]
+    assert service.image_cache_bytes == 4 * MB
+
+    # 条目已被替换时不移除
+    service.discard_image("big", object())
+    assert "big" in service.image_cache
+    service.discard_image("big", big)
+    assert not service.image_cache and service.image_cache_bytes == 0
+
+    service.cache_background_image("x", _image(16, 16))
+    service.cache_background_image("x", _image(32, 32))
+    assert service.image_cache_bytes == 32 * 32 * 4
+    service.clear_cache("image")
+    assert service.image_cache_bytes == 0
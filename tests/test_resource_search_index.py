@@ -0,0 +1,75 @@
+"""资源搜索索引测试
+
+与逐个比较名称的朴素查找对照，覆盖前缀和子串匹配、逐字输入以及增删资源。
+"""
+import random
+
+from models.resource.resource_search_index import ResourceSearchIndex
+
+
+def _expected(resources, query):
+    """朴素查找：前缀匹配的名称在前，其余包含query的名称在后，各自按名称排序"""
+    query = query.strip().lower()
+    names = sorted(name.lower() for name in resources.values())
+    return ([name for name in names if name.startswith(query)] +
+            [name for name in names if query in name and not name.startswith(query)])
+
+
+def _found(index, resources, query):
+    names = {path: name.lower() for path, name in resources.items()}
+    return [names[path] for path in index.search(query)]
+
+
+def test_prefix_matches_come_first():
+    index = ResourceSearchIndex([
+        ("Sakura_Smile", "p/1.png"), ("school_day", "bg/1.png"), ("Rin_School", "p/2.png"), ("sky", "bg/2.png")
+    ])
+    assert index.search("sch") == ["bg/1.png", "p/2.png"]
+    assert index.search("SCHOOL") == ["bg/1.png", "p/2.png"]
+    assert index.search("s") == ["p/1.png", "bg/1.png", "bg/2.png", "p/2.png"]
+    assert index.search("  ") == ["p/2.png", "p/1.png", "bg/1.png", "bg/2.png"]
+    assert index.search("night") == []
+
+
+def test_add_remove_and_ids():
+    index = ResourceSearchIndex([("alpha", "a"), ("beta", "b")])
+    assert index.search("alp") == ["a"]
+    index.add("alphabet", "c")
+    assert index.search("alp") == ["a", "c"]
+    assert index.search("pha") == ["a", "c"]
+    # 同一路径再次添加时替换原来的名称
+    index.add("gamma", "a")
+    assert index.search("alp") == ["c"]
+    assert index.search("amm") == ["a"]
+    assert index.remove("c")
+    assert not index.remove("c")
+    assert index.search("alp") == []
+    assert len(index) == 2
+    assert index.path_of(index.id_of("b")) == "b"
+    assert index.id_of("c") is None
+
+
+def test_matches_naive_search():
+    rng = random.Random(0)
+    alphabet = "abcdé凛_"
+    resources = {}
+    index = ResourceSearchIndex()
+    for step in range(800):
+        if resources and rng.random() < 0.3:
+            path = rng.choice(sorted(resources))
+            del resources[path]
+            assert index.remove(path)
+        else:
+            path = f"res/{step}.png"
+            name = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+            if rng.random() < 0.5:
+                name = name.upper()
+            resources[path] = name
+            index.add(name, path)
+        if step % 50 == 0:
+            index.build((name, path) for path, name in resources.items())
+        # 逐字输入一个查询，每一步都要与朴素查找一致
+        query = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+        for length in range(1, len(query) + 1):
+            assert _found(index, resources, query[:length]) == _expected(resources, query[:length])
+        assert sorted(index.search("")) == sorted(resources)
@@ -0,0 +1,157 @@
+"""场景全文索引测试
+
+检查分词、"与"查询、BM25排序、单字查询、增量更新以及索引文件的保存和加载。
+"""
+import json
+
+from models.scene.scene_search_index import SceneSearchIndex
+from utils.helpers.string_utils import tokenize
+
+
+def _scene(text, character=""):
+    return {"character_name": character, "text": text}
+
+
+def _scene_indexes(results):
+    return [scene_index for scene_index, _ in results]
+
+
+def test_tokenize():
+    assert tokenize("今天天气") == ["今天", "天天", "天气"]
+    assert tokenize("好！Hello, World") == ["好", "hello", "world"]
+    # NFKC规范化：全角字母和半角片假名
+    assert tokenize("ＡＢＣ ｶﾞ") == ["abc", "ガ"]
+    assert tokenize("Rin_2 和 凛") == ["rin", "2", "和", "凛"]
+
+
+def test_search_requires_all_tokens():
+    index = SceneSearchIndex()
+    index.build([_scene("今天天气很好"), _scene("今天下雨"), _scene("天气预报 today"), _scene("Today 天气")])
+    assert sorted(_scene_indexes(index.search("今天"))) == [0, 1]
+    assert sorted(_scene_indexes(index.search("天气 today"))) == [2, 3]
+    assert index.search("今天 today") == []
+    assert index.search("  ") == []
+    assert index.search("明天") == []
+
+
+def test_bm25_ranking():
+    index = SceneSearchIndex()
+    index.build([
+        _scene("学校 学校 学校 的 路上 很 远 远 远 远"),  # 词频高
+        _scene("学校 的 路上 很 远 远 远 远 远 远"),  # 词频低、长度相同
+        _scene("学校"),  # 词频低但很短
+        _scene("食堂", "学校"),  # 只有角色名命中
+        _scene("没有"),
+    ])
+    scores = dict(index.search("学校"))
+    assert scores[0] > scores[1]
+    assert scores[2] > scores[1]
+    assert 3 in scores and 4 not in scores
+    # 评分相同时按场景顺序
+    index.build([_scene("同样"), _scene("同样"), _scene("同样")])
+    assert _scene_indexes(index.search("同样")) == [0, 1, 2]
+    assert _scene_indexes(index.search("同样", limit=2)) == [0, 1]
+
+
+def test_name_hits_add_weight():
+    index = SceneSearchIndex(name_weight=2.0)
+    index.build([_scene("凛来了"), _scene("来了", "凛"), _scene("你好", "葵")])
+    scores = dict(index.search("凛"))
+    assert set(scores) == {0, 1}
+    assert scores[1] > scores[0]
+    assert index.name_candidates("凛") == {1}
+    assert index.name_candidates("角色") == set()
+    assert index.name_candidates("！") is None
+
+
+def test_single_character_query_matches_any_position():
+    scenes = [
+        _scene("天空"),  # 片段开头
+        _scene("今天"),  # 片段末尾
+        _scene("明天见"),  # 片段中间
+        _scene("天"),  # 只有一个字的片段
+        _scene("天天天"),  # 多次出现
+        _scene("晴空", "天音"),  # 角色名
+        _scene("空气"),
+    ]
+    index = SceneSearchIndex()
+    index.build(scenes)
+    results = index.search("天")
+    assert sorted(_scene_indexes(results)) == [0, 1, 2, 3, 4, 5]
+    # 出现多次的场景在只有台词命中的场景中排在最前
+    scores = dict(results)
+    assert all(scores[4] > scores[scene_index] for scene_index in (0, 1, 2, 3))
+    # 单字可以与其他词元组合查询
+    assert sorted(_scene_indexes(index.search("天 明天"))) == [2]
+    assert index.search("雨") == []
+
+
+def test_update_and_sync():
+    scenes = [_scene("今天"), _scene("明天"), _scene("后天")]
+    index = SceneSearchIndex()
+    index.build(scenes)
+    assert not index.update_scene(0, scenes[0])
+    scenes[0]["text"] = "昨天"
+    assert index.update_scene(0, scenes[0])
+    assert index.search("今天") == []
+    assert _scene_indexes(index.search("昨天")) == [0]
+    assert len(index) == 3
+
+    scenes[1]["character_name"] = "凛"
+    assert index.sync(scenes[:2]) == 2
+    assert len(index) == 2
+    assert sorted(_scene_indexes(index.search("天"))) == [0, 1]
+    assert _scene_indexes(index.search("凛")) == [1]
+
+    # 作废的文档过多时整体重建，结果不变
+    for round_index in range(1100):
+        scenes[0]["text"] = f"昨天 {round_index}"
+        index.sync(scenes[:2])
+    assert len(index._doc_scene) < 1100
+    assert _scene_indexes(index.search("昨天 1099")) == [0]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    scenes = [_scene("今天天气很好", "凛"), _scene("明天见", "葵"), _scene("Hello 天", "Alice")]
+    index = SceneSearchIndex()
+    index.build(scenes)
+    index.update_scene(1, _scene("明天再见", "葵"))
+    path = SceneSearchIndex.path_for(tmp_path / "story.json")
+    assert path.name == "story.json.search"
+    assert index.dirty
+    assert index.save(path)
+    assert not index.dirty
+
+    loaded = SceneSearchIndex()
+    assert loaded.load(path)
+    assert not loaded.dirty
+    assert len(loaded) == 3
+    for query in ("天", "天气", "再见", "凛", "hello", "明天 葵"):
+        assert loaded.search(query) == index.search(query)
+    # 加载后只重新索引变化的场景
+    scenes[1] = _scene("明天再见", "葵")
+    assert loaded.sync(scenes) == 0
+    scenes[2]["text"] = "Bye"
+    assert loaded.sync(scenes) == 1
+    assert loaded.search("hello") == []
+
+
+def test_load_rejects_missing_old_or_corrupt_files(tmp_path):
+    index = SceneSearchIndex()
+    index.build([_scene("今天")])
+    path = tmp_path / "story.json.search"
+    assert not SceneSearchIndex().load(path)
+
+    assert index.save(path)
+    data = path.read_bytes()
+    header, body = data.split(b"\n", 1)
+    old_header = json.loads(header)
+    old_header["version"] = SceneSearchIndex.FORMAT_VERSION + 1
+    path.write_bytes(json.dumps(old_header).encode("utf-8") + b"\n" + body)
+    assert not SceneSearchIndex().load(path)
+
+    path.write_bytes(data[:-3])
+    loaded = SceneSearchIndex()
+    assert not loaded.load(path)
+    assert len(loaded) == 0
+    assert loaded.search("今天") == []
@@ -0,0 +1,105 @@
+"""场景切换的加载和重绘计数测试
+
+在两个场景之间来回切换，检查每次切换中每个素材最多加载一次、画布只重绘一次。
+"""
+import json
+
+import pytest
+
+try:
+    import PyQt5.QtMultimedia  # noqa: F401  控制器依赖多媒体模块（需要系统音频库）
+except ImportError as e:
+    pytest.skip(f"无法加载QtMultimedia: {e}", allow_module_level=True)
+
+from PyQt5.QtGui import QImage
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from config.settings import load_settings
+from controllers.app_controller import AppController
+
+
+# 等待延迟的绘制和平滑重绘（画布的平滑重绘延迟为150毫秒）
+SETTLE_MS = 400
+
+
+def _write_image(path, width, height, color):
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(color)
+    assert image.save(str(path))
+
+
+def _scene(resources, background, portrait):
+    return {
+        "background": str(resources / "background" / background),
+        "portraits": [{
+            "path": str(resources / "portrait" / portrait),
+            "scale": 1.0,
+            "position": {"rel_x": 0.3, "rel_y": 0.1},
+            "index": 0
+        }],
+        "audio": {"bgm": "", "sound": "", "voice": ""},
+        "character_name": "凛",
+        "text": "台词",
+        "font": {"path": "", "size": 24}
+    }
+
+
+@pytest.fixture
+def controller(tmp_path):
+    """打开包含两个场景（背景和立绘各不相同）的项目，主窗口已显示"""
+    app = QApplication.instance() or QApplication([])
+    resources = tmp_path / "resources"
+    for resource_type in ("background", "portrait", "background_music", "sound", "voice", "font"):
+        (resources / resource_type).mkdir(parents=True)
+    _write_image(resources / "background" / "bg1.png", 1600, 900, 0xff202060)
+    _write_image(resources / "background" / "bg2.png", 1600, 900, 0xff602020)
+    _write_image(resources / "portrait" / "a.png", 300, 600, 0xffff0000)
+    _write_image(resources / "portrait" / "b.png", 300, 600, 0xff00ff00)
+    project_file = tmp_path / "story.json"
+    project_file.write_text(json.dumps({
+        "metadata": {"version": "1.0"},
+        "scenes": [_scene(resources, "bg1.png", "a.png"), _scene(resources, "bg2.png", "b.png")]
+    }, ensure_ascii=False), encoding="utf-8")
+
+    settings = load_settings()
+    settings["app_root"] = str(tmp_path)
+    controller = AppController(settings)
+    assert controller.scene_model.load_project(str(project_file))
+    controller.view.show()
+    app.processEvents()
+    yield controller
+    controller.asset_prefetcher.shutdown()
+    controller.view.close()
+
+
+def _switch(controller, index):
+    """切换场景并等待所有延迟的绘制完成，返回本次切换的(加载计数, 重绘计数)"""
+    image_label = controller.view.image_label
+    load_snapshot = controller.media_service.load_stats.snapshot()
+    paint_snapshot = image_label.paint_stats.snapshot()
+    assert controller.show_scene(index)
+    QTest.qWait(SETTLE_MS)
+    return controller.media_service.load_stats.since(load_snapshot), image_label.paint_stats.since(paint_snapshot)
+
+
+def test_first_switch_loads_each_asset_once_and_repaints_once(controller):
+    # 窗口刚显示后立即切换：首次布局的尺寸变化不应再触发额外的平滑重绘
+    loads, paints = _switch(controller, 0)
+    assert loads.get("background") == 1
+    assert loads.get("portrait") == 1
+    assert paints.get("paint") == 1
+    assert paints.get("background_composite") == 1
+    assert paints.get("portrait_scale") == 1
+
+
+def test_switching_back_and_forth_repaints_once_per_switch(controller):
+    _switch(controller, 0)
+    for index in (1, 0, 1, 0):
+        loads, paints = _switch(controller, index)
+        # 每个素材最多加载一次（已合成的背景直接从画布缓存复用，不再加载）
+        assert all(count <= 1 for count in loads.values()), loads
+        assert loads.get("portrait") == 1
+        assert paints.get("paint") == 1, paints
+        assert paints.get("background_composite", 0) <= 1
+        assert paints.get("portrait_scale") == 1
@@ -0,0 +1,161 @@
+"""场景检查测试
+
+检查各类问题的判断，以及场景或文件变化时只重新检查受影响的场景。
+"""
+import pytest
+from PyQt5.QtGui import QImage
+
+from models.scene.scene_validator import SceneValidator
+
+
+def _scene(**overrides):
+    scene = {
+        "background": "background/bg.png",
+        "portraits": [{"path": "portrait/a.png", "scale": 1.0, "position": {"x": 100, "y": 50}}],
+        "audio": {"bgm": "", "sound": "", "voice": ""},
+        "character_name": "凛",
+        "text": "台词",
+        "font": {"path": "", "size": 24}
+    }
+    scene.update(overrides)
+    return scene
+
+
+@pytest.fixture
+def root(tmp_path):
+    """素材目录：200x400的立绘、背景和一个语音文件"""
+    for folder in ("background", "portrait", "voice"):
+        (tmp_path / folder).mkdir()
+    for name, width, height in (("portrait/a.png", 200, 400), ("background/bg.png", 64, 36)):
+        image = QImage(width, height, QImage.Format_ARGB32)
+        image.fill(0xff808080)
+        assert image.save(str(tmp_path / name))
+    (tmp_path / "voice" / "v.ogg").write_bytes(b"ogg")
+    return tmp_path
+
+
+def _kinds(validator, scene_index):
+    return [kind for kind, _ in validator.scene_issues(scene_index)]
+
+
+def test_valid_scene_has_no_issues(root):
+    validator = SceneValidator(root)
+    validator.build([_scene(audio={"voice": "voice/v.ogg"})])
+    assert validator.issues() == []
+    assert validator.scene_count == 0
+
+
+@pytest.mark.parametrize("scene, kind", [
+    (_scene(portraits=[{"path": "portrait/a.png", "scale": 1.6}]), "scale"),
+    (_scene(portraits=[{"path": "portrait/a.png", "scale": "big"}]), "scale"),
+    (_scene(font={"path": "", "size": 7}), "font_size"),
+    (_scene(font={"path": "", "size": 37}), "font_size"),
+    (_scene(font={"path": "", "size": "large"}), "font_size"),
+    (_scene(audio={"voice": "voice/v.ogg"}, text="  "), "voice_without_text"),
+    (_scene(portraits=[{"path": "portrait/a.png", "scale": 1.0, "position": {"x": 1200, "y": 50}}]), "off_canvas"),
+    (_scene(portraits=[{"path": "portrait/a.png", "scale": 1.0, "position": {"x": 100, "y": -250}}]), "off_canvas"),
+    (_scene(background="background/missing.png"), "missing_file"),
+    (_scene(audio={"voice": "voice/missing.ogg"}), "missing_file"),
+])
+def test_issue_types(root, scene, kind):
+    validator = SceneValidator(root)
+    validator.build([scene])
+    assert _kinds(validator, 0) == [kind]
+    assert validator.issues(kind) == [(0, kind, validator.scene_issues(0)[0][1])]
+
+
+def test_ranges_are_inclusive(root):
+    validator = SceneValidator(root)
+    validator.build([
+        _scene(font={"path": "", "size": 8}, portraits=[{"path": "portrait/a.png", "scale": 0.5}]),
+        _scene(font={"path": "", "size": 36}, portraits=[{"path": "portrait/a.png", "scale": 1.5}]),
+        # 立绘允许超出画布一半的宽度：200宽的立绘在x=-100处仍在范围内
+        _scene(portraits=[{"path": "portrait/a.png", "scale": 1.0, "position": {"x": -100, "y": 0}}]),
+    ])
+    assert validator.issues() == []
+
+
+def test_update_scene_skips_unchanged_input(root):
+    scenes = [_scene(), _scene(font={"path": "", "size": 50})]
+    validator = SceneValidator(root)
+    validator.build(scenes)
+    assert validator.scene_count == 1
+    assert not validator.update_scene(0, scenes[0])
+    assert not validator.update_scene(1, scenes[1])
+    # 与检查无关的字段变化不需要重新检查
+    scenes[0]["character_name"] = "葵"
+    assert not validator.update_scene(0, scenes[0])
+
+    # 场景字典被原地修改后重新检查
+    scenes[1]["font"]["size"] = 24
+    assert validator.update_scene(1, scenes[1])
+    assert validator.issues() == []
+    scenes[0]["portraits"][0]["position"] = {"x": 2000, "y": 0}
+    assert validator.update_scene(0, scenes[0])
+    assert _kinds(validator, 0) == ["off_canvas"]
+
+
+def test_content_checks_are_cached(root, monkeypatch):
+    scenes = [_scene() for _ in range(50)] + [_scene(font={"path": "", "size": 50}) for _ in range(50)]
+    validator = SceneValidator(root)
+    reads = []
+    read_file_info = SceneValidator._read_file_info
+    monkeypatch.setattr(SceneValidator, "_read_file_info",
+                        staticmethod(lambda key: reads.append(key) or read_file_info(key)))
+    validator.build(scenes)
+    # 内容相同的场景共用一份检查结果，每个文件只读取一次
+    assert len(validator._content_cache) == 2
+    assert len(reads) == 2
+    assert validator.scene_count == 50
+
+    # 内容被改回原样的场景直接复用结果
+    scenes[0]["font"]["size"] = 50
+    validator.update_scene(0, scenes[0])
+    scenes[0]["font"]["size"] = 24
+    validator.update_scene(0, scenes[0])
+    assert len(validator._content_cache) == 2
+    assert validator.scene_issues(0) is validator.scene_issues(1)
+    assert len(reads) == 2
+
+
+def test_file_changed_rechecks_only_scenes_using_the_file(root, monkeypatch):
+    scenes = [_scene(), _scene(background="background/other.png"), _scene(),
+              _scene(background="background/other.png", font={"path": "", "size": 50})]
+    validator = SceneValidator(root)
+    validator.build(scenes)
+    assert _kinds(validator, 1) == ["missing_file"]
+    assert _kinds(validator, 3) == ["font_size", "missing_file"]
+
+    rechecked = []
+    recheck_files = validator._recheck_files
+    monkeypatch.setattr(validator, "_recheck_files",
+                        lambda scene_index: rechecked.append(scene_index) or recheck_files(scene_index))
+    other = root / "background" / "other.png"
+    other.write_bytes(b"")
+    assert validator.file_changed(str(other)) == 2
+    assert rechecked == [1, 3]
+    assert _kinds(validator, 1) == []
+    assert _kinds(validator, 3) == ["font_size"]
+
+    # 文件信息未变化或文件未被引用时不重新检查
+    assert validator.file_changed(str(other)) == 0
+    assert validator.file_changed(str(root / "background" / "unused.png")) == 0
+    assert rechecked == [1, 3]
+
+    other.unlink()
+    (root / "portrait" / "a.png").unlink()
+    assert validator.recheck_files() == 4
+    assert _kinds(validator, 0) == ["missing_file"]
+    assert _kinds(validator, 1) == ["missing_file", "missing_file"]
+
+
+def test_sync_and_truncate(root):
+    scenes = [_scene(font={"path": "", "size": 50}) for _ in range(3)]
+    validator = SceneValidator(root)
+    validator.build(scenes)
+    assert validator.scene_count == 3
+    scenes[1]["font"]["size"] = 24
+    assert validator.sync(scenes[:2]) == 1
+    assert len(validator) == 2
+    assert [scene_index for scene_index, _, _ in validator.issues()] == [0]
+    assert validator.scene_issues(2) == ()